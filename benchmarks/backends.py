@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Any, Dict
+from uuid import uuid4
+
+from edgy.exceptions import ObjectNotFound
+from esmerald.exceptions import NotAuthorized
+from esmerald.utils.module_loading import import_string
+
+from esmerald_simple_jwt.backends import BackendEmailAuthentication
+from esmerald_simple_jwt.schemas import TokenAccess
+from esmerald_simple_jwt.token import Token
+
+User = import_string("benchmarks.models.User")
+
+
+class BenchmarkAuthentication(BackendEmailAuthentication):
+    """
+    The backend of the documentation, authenticating against the SQLite users.
+    """
+
+    async def authenticate(self) -> Dict[str, str] | Any:
+        try:
+            user = await User.query.get(email=self.email)
+        except ObjectNotFound:
+            await self.check_dummy_password(self.password)
+            raise NotAuthorized(detail="Invalid credentials.") from None
+
+        if not await self.check_password(self.password, user.password, setter=user.set_password):
+            raise NotAuthorized(detail="Invalid credentials.")
+
+        runtime = self.runtime
+        now = datetime.now()
+        access_token = Token(sub=str(user.id), exp=now + runtime.access_token_lifetime)
+        refresh_token = Token(
+            sub=str(user.id), exp=now + runtime.refresh_token_lifetime, jti=uuid4().hex
+        )
+        return TokenAccess(
+            access_token=await access_token.aencode_with(
+                runtime.services.encoder, claims_extra={"token_type": runtime.access_token_name}
+            ),
+            refresh_token=await refresh_token.aencode_with(
+                runtime.services.encoder, claims_extra={"token_type": runtime.refresh_token_name}
+            ),
+        ).model_dump()
@@ -0,0 +1,60 @@
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Iterator
+
+import pytest
+
+os.environ.setdefault("ESMERALD_SETTINGS_MODULE", "benchmarks.settings.BenchmarkSettings")
+
+from benchmarks.models import User, models  # noqa: E402
+from esmerald import Esmerald, Include  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+
+EMAIL = "bench@example.com"
+PASSWORD = "a-benchmark-password"
+
+
+@pytest.fixture(scope="session")
+def loop() -> Iterator[asyncio.AbstractEventLoop]:
+    # pytest-benchmark times sync callables, the coroutines run to completion in this loop.
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def run(loop: asyncio.AbstractEventLoop) -> Callable[..., Any]:
+    def run(func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        return loop.run_until_complete(func(*args))
+
+    return run
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database(run: Callable[..., Any]) -> Iterator[None]:
+    async def setup() -> None:
+        await models.__aenter__()
+        await models.create_all()
+        await User.query.create_user(
+            first_name="Bench",
+            last_name="Mark",
+            email=EMAIL,
+            password=PASSWORD,
+            username="bench",
+        )
+
+    async def teardown() -> None:
+        await models.drop_all()
+        await models.__aexit__()
+
+    run(setup)
+    yield
+    run(teardown)
+
+
+@pytest.fixture(scope="session")
+def client(run: Callable[..., Any]) -> Iterator[AsyncClient]:
+    app = Esmerald(routes=[Include(path="/simple-jwt", namespace="esmerald_simple_jwt.urls")])
+    client = AsyncClient(transport=ASGITransport(app), base_url="http://bench")
+    yield client
+    run(client.aclose)
@@ -0,0 +1,13 @@
+from esmerald.conf import settings
+from esmerald.contrib.auth.edgy.base_user import AbstractUser
+
+database, models = settings.edgy_registry
+
+
+class User(AbstractUser):
+    """
+    The user of the benchmarks, stored in SQLite.
+    """
+
+    class Meta:
+        registry = models
@@ -0,0 +1,45 @@
+import os
+import tempfile
+from functools import cached_property
+from typing import Optional, Tuple
+
+from edgy import Database
+from edgy import Registry as EdgyRegistry
+from esmerald import EsmeraldAPISettings
+
+from esmerald_simple_jwt.config import SimpleJWT
+
+# A file instead of `:memory:`, shared by all the connections of the pool.
+BENCHMARK_DATABASE_URL = os.environ.get(
+    "BENCHMARK_DATABASE_URI",
+    f"sqlite+aiosqlite:///{os.path.join(tempfile.gettempdir(), 'esmerald_simple_jwt_bench.db')}",
+)
+
+
+class BenchmarkSettings(EsmeraldAPISettings):
+    app_name: str = "benchmarks"
+    secret_key: str = "a-benchmark-signing-key-long-enough-for-hs256"
+    debug: bool = False
+    enable_openapi: bool = False
+    environment: Optional[str] = "benchmarks"
+    include_in_schema: bool = False
+
+    @cached_property
+    def edgy_registry(self) -> Tuple[Database, EdgyRegistry]:
+        database = Database(BENCHMARK_DATABASE_URL)
+        return database, EdgyRegistry(database=database)
+
+    @property
+    def simple_jwt(self) -> SimpleJWT:
+        if getattr(self, "_simple_jwt", None) is None:
+            # Imported here, the backend needs the registry of these settings.
+            from benchmarks.backends import BenchmarkAuthentication
+
+            from esmerald_simple_jwt.backends import RefreshAuthentication
+
+            self._simple_jwt = SimpleJWT(
+                signing_key=self.secret_key,
+                backend_authentication=BenchmarkAuthentication,
+                backend_refresh=RefreshAuthentication,
+            )
+        return self._simple_jwt
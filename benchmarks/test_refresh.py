@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from esmerald.conf import settings
+
+from esmerald_simple_jwt.backends import RefreshAuthentication
+from esmerald_simple_jwt.schemas import RefreshToken
+from esmerald_simple_jwt.token import Token
+
+
+def create_refresh_token() -> RefreshToken:
+    token = Token(sub="1", exp=datetime.now() + timedelta(days=1), jti=uuid4().hex)
+    return RefreshToken(
+        refresh_token=token.encode(
+            key=settings.simple_jwt.signing_key,
+            algorithm=settings.simple_jwt.algorithm,
+            claims_extra={"token_type": settings.simple_jwt.refresh_token_name},
+        )
+    )
+
+
+def test_refresh_authentication(benchmark, run):
+    token = create_refresh_token()
+
+    async def refresh():
+        return await RefreshAuthentication(token=token).refresh()
+
+    benchmark.group = "refresh"
+    access_token = benchmark(run, refresh)
+
+    assert access_token.access_token
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Tuple
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from esmerald_simple_jwt.keys import KeyMaterial, KeyRing
+from esmerald_simple_jwt.token import Token, TokenDecoder, TokenEncoder
+
+ALGORITHMS = ["HS256", "HS512", "RS256", "ES256", "EdDSA"]
+
+
+def generate_keys(algorithm: str) -> Tuple[Any, Any]:
+    """
+    Returns the `(signing_key, verifying_key)` of an algorithm.
+    """
+    if algorithm.startswith("HS"):
+        secret = "a-benchmark-secret-long-enough-for-hs512-" * 2
+        return secret, secret
+    if algorithm == "RS256":
+        private: Any = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif algorithm == "ES256":
+        private = ec.generate_private_key(ec.SECP256R1())
+    else:
+        private = ed25519.Ed25519PrivateKey.generate()
+    return private, private.public_key()
+
+
+KEYS: Dict[str, Tuple[Any, Any]] = {
+    algorithm: generate_keys(algorithm) for algorithm in ALGORITHMS
+}
+
+
+def create_token() -> Token:
+    return Token(sub="1", exp=datetime.now() + timedelta(hours=1), token_type="access_token")
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_token_encode(benchmark, algorithm):
+    signing_key, _ = KEYS[algorithm]
+    token = create_token()
+
+    benchmark.group = "token-encode"
+    encoded = benchmark(token.encode, key=signing_key, algorithm=algorithm)
+
+    assert encoded.count(".") == 2
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_token_decode(benchmark, algorithm):
+    signing_key, verifying_key = KEYS[algorithm]
+    encoded = create_token().encode(key=signing_key, algorithm=algorithm)
+
+    benchmark.group = "token-decode"
+    token = benchmark(Token.decode, token=encoded, key=verifying_key, algorithms=[algorithm])
+
+    assert token.sub == "1"
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_encoder_encode(benchmark, algorithm):
+    signing_key, _ = KEYS[algorithm]
+    encoder = TokenEncoder(signing_key, algorithm)
+    claims = create_token().model_dump(exclude_none=True)
+
+    benchmark.group = "encoder-encode"
+    encoded = benchmark(encoder.encode, claims)
+
+    assert encoded.count(".") == 2
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_decoder_decode(benchmark, algorithm):
+    signing_key, verifying_key = KEYS[algorithm]
+    keyring = KeyRing(KeyMaterial(algorithm, signing_key, verifying_key, algorithms=[algorithm]))
+    decoder = TokenDecoder(keyring)
+    encoded = create_token().encode(key=signing_key, algorithm=algorithm)
+
+    benchmark.group = "decoder-decode"
+    claims = benchmark(decoder.decode, encoded)
+
+    assert claims.sub == "1"
@@ -0,0 +1,26 @@
+from benchmarks.conftest import EMAIL, PASSWORD
+from benchmarks.test_refresh import create_refresh_token
+
+
+def test_signin_view(benchmark, run, client):
+    async def signin():
+        return await client.post("/simple-jwt/signin", json={"email": EMAIL, "password": PASSWORD})
+
+    benchmark.group = "views"
+    response = benchmark(run, signin)
+
+    assert response.status_code == 200, response.text
+    assert set(response.json()) == {"access_token", "refresh_token"}
+
+
+def test_refresh_token_view(benchmark, run, client):
+    payload = create_refresh_token().model_dump()
+
+    async def refresh():
+        return await client.post("/simple-jwt/refresh-access", json=payload)
+
+    benchmark.group = "views"
+    response = benchmark(run, refresh)
+
+    assert response.status_code == 200, response.text
+    assert "access_token" in response.json()
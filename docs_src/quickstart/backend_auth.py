@@ -1,7 +1,7 @@
 from datetime import datetime
+from uuid import uuid4
 
 from edgy.exceptions import ObjectNotFound
-from esmerald.conf import settings
 from esmerald.exceptions import NotAuthorized
 from esmerald.utils.module_loading import import_string
 
@@ -23,28 +23,35 @@ class BackendAuthentication(SimpleBackend):
         try:
             user: User = await User.query.get(email=self.email)
         except ObjectNotFound:
-            # Run the default password hasher once to reduce the timing
+            # Check the password against a dummy hash to reduce the timing
             # difference between an existing and a nonexistent user.
-            await User().set_password(self.password)
+            await self.check_dummy_password(self.password)
         else:
-            is_password_valid = await user.check_password(self.password)
+            is_password_valid = await self.check_password(
+                self.password, user.password, setter=user.set_password
+            )
             if is_password_valid and self.user_can_authenticate(user):
                 # The lifetime of a token should be short, let us make 5 minutes.
                 # You can use also the access_token_lifetime from the JWT config directly
-                access_time = datetime.now() + settings.simple_jwt.access_token_lifetime
-                refresh_time = datetime.now() + settings.simple_jwt.refresh_token_lifetime
+                runtime = self.runtime
+                # The token version of the user, if a `token_version_store` is set.
+                version = await self.get_token_version(str(user.id))
+                access_time = datetime.now() + runtime.access_token_lifetime
+                refresh_time = datetime.now() + runtime.refresh_token_lifetime
                 access_token = TokenAccess(
                     # The `token_type` defaults to `access_token`
-                    access_token=self.generate_user_token(
+                    access_token=await self.generate_user_token(
                         user,
                         time=access_time,
-                        token_type=settings.simple_jwt.access_token_name,
+                        token_type=runtime.access_token_name,
+                        version=version,
                     ),
                     # The `token_type` defaults to `refresh_token`
-                    refresh_token=self.generate_user_token(
+                    refresh_token=await self.generate_user_token(
                         user,
                         time=refresh_time,
-                        token_type=settings.simple_jwt.refresh_token_name,
+                        token_type=runtime.refresh_token_name,
+                        version=version,
                     ),
                 )
                 return access_token.model_dump()
@@ -58,20 +65,22 @@ class BackendAuthentication(SimpleBackend):
         """
         return getattr(user, "is_active", True)
 
-    def generate_user_token(self, user: User, token_type: str, time: datetime = None):
+    async def generate_user_token(
+        self, user: User, token_type: str, time: datetime = None, version: int = None
+    ):
         """
         Generates the JWT token for the authenticated user.
         """
+        runtime = self.runtime
         if not time:
-            later = datetime.now() + settings.simple_jwt.access_token_lifetime
+            later = datetime.now() + runtime.access_token_lifetime
         else:
             later = time
 
-        token = Token(sub=str(user.id), exp=later)
+        # The `jti` allows the token to be revoked and the `ver` all the tokens of the user.
+        token = Token(sub=str(user.id), exp=later, jti=uuid4().hex, ver=version)
 
-        claims_extra = {"token_type": token_type}
-        return token.encode(
-            key=settings.simple_jwt.signing_key,
-            algorithm=settings.simple_jwt.algorithm,
-            claims_extra=claims_extra,
-        )
+        # The user attributes of the `claims_projection`, if any.
+        claims_extra = {"token_type": token_type, **self.project_claims(user)}
+        # Signed by the `crypto_executor`, if configured, away from the event loop.
+        return await token.aencode_with(runtime.services.encoder, claims_extra=claims_extra)
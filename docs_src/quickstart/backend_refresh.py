@@ -1,6 +1,5 @@
 from datetime import datetime
 
-from esmerald.conf import settings
 from esmerald.exceptions import AuthenticationError, NotAuthorized
 from jwt.exceptions import PyJWTError
 
@@ -20,32 +19,30 @@ class RefreshAuthentication(BaseRefreshAuthentication):
     token: RefreshToken
 
     async def refresh(self) -> AccessToken:
-        token = self.token.refresh_token
+        # The SimpleJWT configuration resolved once for the application.
+        runtime = self.runtime
 
         try:
-            token = Token.decode(
-                token=token,
-                key=settings.simple_jwt.signing_key,
-                algorithms=[settings.simple_jwt.algorithm],
-            )
+            # The key is picked by the `kid` header of the token and the claims
+            # are returned without building the full `Token` model. The signature is
+            # verified by the `crypto_executor`, if configured.
+            token = await runtime.services.decoder.adecode(self.token.refresh_token)
         except PyJWTError as e:
             raise AuthenticationError(str(e)) from e
 
-        if token.token_type != settings.simple_jwt.refresh_token_name:
+        if token.token_type != runtime.refresh_token_name:
             raise NotAuthorized(detail="Only refresh tokens are allowed.")
 
         # Apply the maximum living time
-        expiry_date = datetime.now() + settings.simple_jwt.access_token_lifetime
+        expiry_date = datetime.now() + runtime.access_token_lifetime
 
         # New token object
         new_token = Token(sub=token.sub, exp=expiry_date)
 
         # Encode the token
-        claims_extra = {"token_type": settings.simple_jwt.access_token_name}
-        access_token = new_token.encode(
-            key=settings.simple_jwt.signing_key,
-            algorithm=settings.simple_jwt.algorithm,
-            claims_extra=claims_extra,
+        claims_extra = {"token_type": runtime.access_token_name}
+        access_token = await new_token.aencode_with(
+            runtime.services.encoder, claims_extra=claims_extra
         )
 
         return AccessToken(access_token=access_token)
@@ -0,0 +1,105 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from esmerald.exceptions import ImproperlyConfigured, ServiceUnavailable
+
+from esmerald_simple_jwt.hashing import HashingExecutor
+
+
+class DelayController:
+    """
+    Detects a standing queue from the time the calls wait before being served, in
+    the spirit of CoDel (Controlled Delay).
+
+    A short burst queues for a moment and drains, it is fine. When every call keeps
+    waiting more than the `target` for at least an `interval`, the queue is not
+    draining anymore and the controller reports an overload until a call waits less
+    than the `target` again.
+    """
+
+    __slots__ = ("target", "interval", "overloaded", "_above_since")
+
+    def __init__(self, target: float = 0.05, interval: float = 0.1) -> None:
+        self.target = target
+        self.interval = interval
+        self.overloaded = False
+        self._above_since: Optional[float] = None
+
+    def observe(self, delay: float) -> None:
+        """
+        Reports the time (in seconds) a call waited before being served.
+        """
+        if delay < self.target:
+            self._above_since = None
+            self.overloaded = False
+            return
+
+        now = time.monotonic()
+        if self._above_since is None:
+            self._above_since = now
+        elif now - self._above_since >= self.interval:
+            self.overloaded = True
+
+
+class AdmissionControl:
+    """
+    Sheds the signin requests under overload, failing fast with a `503` and a
+    `Retry-After` header instead of queuing them without limit.
+
+    A signin is rejected when:
+
+    * `max_inflight` signins are already in progress.
+    * `max_queue` calls are already waiting for the hashing executor.
+    * The hashing queue is standing, as detected by the `DelayController`.
+
+    Only the signin goes through the admission control. The refreshes never hash a
+    password and are always admitted, keeping them fast while the signins are shed.
+    """
+
+    def __init__(
+        self,
+        hashing: HashingExecutor,
+        max_inflight: int = 64,
+        max_queue: int = 16,
+        delay: Optional[DelayController] = None,
+        retry_after: int = 1,
+    ) -> None:
+        if max_inflight < 1 or max_queue < 1:
+            raise ImproperlyConfigured(
+                "The admission `max_inflight` and `max_queue` must be positive."
+            )
+
+        self.hashing = hashing
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.delay = delay
+        self.retry_after = retry_after
+        self.inflight = 0
+        self.rejected = 0
+
+    @property
+    def overloaded(self) -> bool:
+        waiting = self.hashing.waiting
+        if waiting >= self.max_queue or self.inflight >= self.max_inflight:
+            return True
+        # An empty queue means the overload is over, even without any new delay.
+        return waiting > 0 and self.delay is not None and self.delay.overloaded
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        """
+        Admits a signin for the duration of the block or raises `ServiceUnavailable`.
+        """
+        if self.overloaded:
+            self.rejected += 1
+            raise ServiceUnavailable(
+                detail="The service is overloaded, try again later.",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+
+        self.inflight += 1
+        try:
+            yield
+        finally:
+            self.inflight -= 1
@@ -1,14 +1,16 @@
 from abc import ABC
 from datetime import datetime
-from typing import Any, Dict, Union
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+from uuid import uuid4
 
-from esmerald.conf import settings
-from esmerald.exceptions import AuthenticationError, NotAuthorized
+from esmerald.exceptions import AuthenticationError, ImproperlyConfigured, NotAuthorized
 from jwt.exceptions import PyJWTError
 from pydantic import BaseModel, EmailStr
 
-from esmerald_simple_jwt.schemas import AccessToken, RefreshToken
-from esmerald_simple_jwt.token import Token
+from esmerald_simple_jwt.hashing import hash_password, verify_password
+from esmerald_simple_jwt.runtime import RuntimeConfig, get_runtime_config
+from esmerald_simple_jwt.schemas import AccessToken, RefreshToken, TokenAccess
+from esmerald_simple_jwt.token import Claims, Token
 
 
 class BaseBackendAuthentication(ABC, BaseModel):
@@ -16,6 +18,78 @@ class BaseBackendAuthentication(ABC, BaseModel):
     Base for all authentication backends.
     """
 
+    @property
+    def runtime(self) -> RuntimeConfig:
+        """
+        The pre-resolved `SimpleJWT` configuration of the running application.
+        """
+        return get_runtime_config()
+
+    def project_claims(self, user: Any) -> Dict[str, Any]:
+        """
+        Returns the claims projected from the user by the `claims_projection`, to be
+        added to the `claims_extra` of the issued tokens.
+        """
+        projection = self.runtime.projection
+        return projection.project(user) if projection is not None else {}
+
+    async def get_token_version(self, sub: str) -> Optional[int]:
+        """
+        Returns the token version of the user, to be stamped in the `ver` of the issued
+        tokens, or `None` when no `token_version_store` is configured.
+        """
+        versions = self.runtime.services.token_versions
+        return await versions.get(sub) if versions is not None else None
+
+    async def revoke_user_tokens(self, sub: str) -> int:
+        """
+        Revokes all the refresh tokens of the user at once by bumping its token version,
+        for instance, after a password reset. Returns the new version.
+        """
+        versions = self.runtime.services.token_versions
+        if versions is None:
+            raise ImproperlyConfigured(
+                "A `token_version_store` must be configured to revoke the tokens of a user."
+            )
+        return await versions.bump(sub)
+
+    async def make_password(self, password: Optional[str]) -> str:
+        """
+        Hashes a password in the hashing executor, without blocking the event loop.
+        """
+        return await self.runtime.services.hashing.run(hash_password, password)
+
+    async def check_password(
+        self,
+        password: str,
+        encoded: str,
+        setter: Optional[Callable[[str], Awaitable[Any]]] = None,
+    ) -> bool:
+        """
+        Checks a password against its hash in the hashing executor, without blocking
+        the event loop.
+
+        When the password is correct but the hash is outdated, the `setter` (usually
+        `user.set_password`) is awaited with the password.
+        """
+        is_correct, must_update = await self.runtime.services.hashing.run(
+            verify_password, password, encoded
+        )
+        if setter is not None and is_correct and must_update:
+            await setter(password)
+        return is_correct
+
+    async def check_dummy_password(self, password: str) -> bool:
+        """
+        Checks a password against a precomputed dummy hash, always returning `False`.
+
+        Meant for the unknown users, making the miss exactly as expensive as checking
+        the password of an existing user and reducing the timing difference between them.
+        """
+        hashing = self.runtime.services.hashing
+        await hashing.run(verify_password, password, await hashing.dummy_hash())
+        return False
+
     async def authenticate(self) -> Union[Dict[str, str], Any]:
         raise NotImplementedError("All backends must implement the `authenticate()` method.")
 
@@ -25,6 +99,13 @@ class BaseRefreshAuthentication(ABC, BaseModel):
     Base for all refresh backends.
     """
 
+    @property
+    def runtime(self) -> RuntimeConfig:
+        """
+        The pre-resolved `SimpleJWT` configuration of the running application.
+        """
+        return get_runtime_config()
+
     async def refresh(self) -> Union[Dict[str, str], Any]:
         raise NotImplementedError("All refresh backends must implement the `refresh()` method.")
 
@@ -58,39 +139,140 @@ class RefreshAuthentication(BaseRefreshAuthentication):
     Refreshes the access token given a refresh token of a given user.
 
     This object does not perform any DB action, instead, uses the existing refresh
-    token to generate a new access.
+    token to generate a new access. When a `revocation_store` is configured, the `jti`
+    of the refresh token is checked against it.
+
+    When `rotate_refresh_tokens` is enabled, a new refresh token is also returned and
+    the reuse of a refresh token revokes its whole family.
     """
 
     token: RefreshToken
 
-    async def refresh(self) -> AccessToken:
-        token = self.token.refresh_token
+    def decode_token(self, runtime: RuntimeConfig) -> Claims:
+        """
+        Verifies the refresh token and returns its claims.
 
+        The key is picked by the `kid` of the token (or the active one). The claims
+        are not validated by the `Token` model, use `claims.to_token()` for that.
+        """
         try:
-            token = Token.decode(
-                token=token,
-                key=settings.simple_jwt.signing_key,
-                algorithms=[settings.simple_jwt.algorithm],
-            )  # type: ignore
+            token = runtime.services.decoder.decode(self.token.refresh_token)
         except PyJWTError as e:
             raise AuthenticationError(str(e)) from e
 
-        if token.token_type != settings.simple_jwt.refresh_token_name:
+        if token.token_type != runtime.refresh_token_name:
             raise NotAuthorized(detail="Only refresh tokens are allowed.")
+        return token
+
+    async def adecode_token(self, runtime: RuntimeConfig) -> Claims:
+        """
+        Same as `decode_token()`, with the signature verified by the `crypto_executor`
+        (if any) away from the event loop.
+        """
+        try:
+            token = await runtime.services.decoder.adecode(self.token.refresh_token)
+        except PyJWTError as e:
+            raise AuthenticationError(str(e)) from e
+
+        if token.token_type != runtime.refresh_token_name:
+            raise NotAuthorized(detail="Only refresh tokens are allowed.")
+        return token
+
+    async def revoke(self) -> None:
+        """
+        Revokes the refresh token, for instance, when the user logs out.
+        """
+        runtime = self.runtime
+        services = runtime.services
+        if services.revocation is None:
+            raise ImproperlyConfigured("A `revocation_store` must be configured to revoke tokens.")
+
+        token = await self.adecode_token(runtime)
+        if token.jti is None:
+            raise NotAuthorized(detail="Only tokens with a `jti` can be revoked.")
+        await services.revocation.revoke(token.jti, token.exp)
+
+        if token.fam is not None and services.token_families is not None:
+            # The newer generations of the family expire later than the presented
+            # token, the family is kept revoked until the last one could expire.
+            await services.token_families.revoke(
+                token.fam, datetime.now() + runtime.refresh_token_lifetime
+            )
+
+        if services.refresh_flight is not None:
+            services.refresh_flight.forget(self.token.refresh_token)
+
+    async def rotate(self, runtime: RuntimeConfig, token: Claims) -> TokenAccess:
+        """
+        Issues a new pair of tokens, moving the family of the refresh token to the
+        next generation.
+        """
+        family = token.fam or token.jti
+        if family is None:
+            raise NotAuthorized(detail="Only refresh tokens with a `jti` can be rotated.")
+
+        generation = token.gen or 0
+        if not await runtime.services.token_families.advance(family, generation, token.exp):
+            raise NotAuthorized(detail="The refresh token has already been used.")
+
+        now = datetime.now()
+        projected = runtime.projection.carry(token) if runtime.projection else {}
+        refresh_token = Token(
+            sub=token.sub,
+            exp=now + runtime.refresh_token_lifetime,
+            jti=uuid4().hex,
+            fam=family,
+            gen=generation + 1,
+            ver=token.ver,
+        )
+        access_token = Token(sub=token.sub, exp=now + runtime.access_token_lifetime, ver=token.ver)
+
+        # The tokens were just encoded, there is nothing to validate.
+        return TokenAccess.model_construct(
+            access_token=await access_token.aencode_with(
+                runtime.services.encoder,
+                claims_extra={"token_type": runtime.access_token_name, **projected},
+            ),
+            refresh_token=await refresh_token.aencode_with(
+                runtime.services.encoder,
+                claims_extra={"token_type": runtime.refresh_token_name, **projected},
+            ),
+        )
+
+    async def refresh(self) -> Union[AccessToken, TokenAccess]:
+        runtime = self.runtime
+        services = runtime.services
+        token = await self.adecode_token(runtime)
+
+        if (
+            services.revocation is not None
+            and token.jti is not None
+            and await services.revocation.is_revoked(token.jti)
+        ):
+            raise NotAuthorized(detail="The token has been revoked.")
+
+        # A token issued before the version of the user was bumped is revoked. The
+        # tokens without `ver` are of the version `0`.
+        if services.token_versions is not None and (
+            token.ver or 0
+        ) != await services.token_versions.get(token.sub):
+            raise NotAuthorized(detail="The token has been revoked.")
+
+        if runtime.rotate_refresh_tokens:
+            return await self.rotate(runtime, token)
 
         # Apply the maximum living time
-        expiry_date = datetime.now() + settings.simple_jwt.access_token_lifetime
+        expiry_date = datetime.now() + runtime.access_token_lifetime
 
         # New token object
-        new_token = Token(sub=token.sub, exp=expiry_date)
+        new_token = Token(sub=token.sub, exp=expiry_date, ver=token.ver)
 
-        claims_extra = {"token_type": settings.simple_jwt.access_token_name}
+        claims_extra = {"token_type": runtime.access_token_name}
+        if runtime.projection is not None:
+            # The claims projected from the user when signing in.
+            claims_extra.update(runtime.projection.carry(token))
 
-        # Encode the token
-        access_token = new_token.encode(
-            key=settings.simple_jwt.signing_key,
-            algorithm=settings.simple_jwt.algorithm,
-            claims_extra=claims_extra,
-        )
+        # Encode the token, the same as `new_token.encode()` with the active key.
+        access_token = await new_token.aencode_with(services.encoder, claims_extra=claims_extra)
 
-        return AccessToken(access_token=access_token)
+        return AccessToken.model_construct(access_token=access_token)
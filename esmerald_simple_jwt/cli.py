@@ -0,0 +1,114 @@
+import argparse
+import json
+import sys
+from typing import Any, Iterator, Optional, Sequence, TextIO
+
+import anyio
+from esmerald.utils.module_loading import import_string
+
+from esmerald_simple_jwt.issuance import Subject, issue_many
+from esmerald_simple_jwt.runtime import get_runtime_config
+
+
+def parse_subjects(lines: Iterator[str]) -> Iterator[Subject]:
+    """
+    Reads the subjects, one per line: either the `sub` or a JSON object with the `sub`
+    and the `claims` overriding the defaults, `{"sub": "device-1", "claims": {...}}`.
+
+    The empty lines are ignored.
+    """
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        if not line.startswith("{"):
+            yield line
+            continue
+
+        try:
+            data = json.loads(line)
+            yield str(data["sub"]), dict(data.get("claims") or {})
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Invalid subject on the line {number}: {e}") from e
+
+
+async def issue(
+    source: TextIO, target: TextIO, settings: Any = None, batch_size: int = 256
+) -> int:
+    """
+    Issues the tokens of the subjects read from `source` and writes them to `target` as
+    NDJSON, one `{"sub", "access_token", "refresh_token"}` object per line.
+
+    Returns the number of subjects.
+    """
+    runtime = get_runtime_config(settings)
+    count = 0
+    async for sub, tokens in issue_many(parse_subjects(source), runtime, batch_size=batch_size):
+        target.write(
+            json.dumps(
+                {
+                    "sub": sub,
+                    "access_token": tokens.access_token,
+                    "refresh_token": tokens.refresh_token,
+                },
+                separators=(",", ":"),
+            )
+            + "\n"
+        )
+        count += 1
+    return count
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="esmerald-simple-jwt",
+        description="The command line of esmerald-simple-jwt.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    issue = commands.add_parser(
+        "issue",
+        help="Issues the tokens of many subjects, written as NDJSON.",
+        description=(
+            "Reads the subjects, one per line (a sub or a JSON object with the sub and the "
+            "claims), and writes a JSON object with the sub and its tokens per line."
+        ),
+    )
+    issue.add_argument(
+        "-i", "--input", type=argparse.FileType("r"), default="-", help="Defaults to stdin."
+    )
+    issue.add_argument(
+        "-o", "--output", type=argparse.FileType("w"), default="-", help="Defaults to stdout."
+    )
+    issue.add_argument(
+        "--settings",
+        help=(
+            "The dotted path of the settings class with the `simple_jwt` configuration. "
+            "Defaults to the ESMERALD_SETTINGS_MODULE."
+        ),
+    )
+    issue.add_argument("--batch-size", type=int, default=256)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    The entry point of the `esmerald-simple-jwt` command.
+    """
+    args = build_parser().parse_args(argv)
+    settings = import_string(args.settings)() if args.settings else None
+
+    try:
+        count: int = anyio.run(issue, args.input, args.output, settings, args.batch_size)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        args.output.flush()
+
+    print(f"Issued the tokens of {count} subjects.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -1,16 +1,61 @@
-from typing import Any, List, Type, Union
+from typing import Any, Dict, List, Type, Union
 
 from esmerald.core.config.jwt import JWTConfig
 from esmerald.security.http import HTTPBearer
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing_extensions import Annotated, Doc
 
 from esmerald_simple_jwt.backends import BaseBackendAuthentication, BaseRefreshAuthentication
+from esmerald_simple_jwt.keys import KeyMaterial, KeyRing, load_key_material
+from esmerald_simple_jwt.revocation import RevocationStore, TokenFamilyStore, TokenVersionStore
 from esmerald_simple_jwt.schemas import AccessToken, LoginEmailIn, RefreshToken, TokenAccess
+from esmerald_simple_jwt.throttling import ThrottleStore
 
 security = HTTPBearer()
 
 
+class VerifyingKey(BaseModel):
+    """
+    A verify-only key of the keyring, usually a previous signing key still accepted
+    while rotating the keys.
+
+    **Example**
+
+    ```python
+    from esmerald_simple_jwt.config import VerifyingKey
+
+    VerifyingKey(kid="2023-12", key=..., algorithm="RS256")
+    ```
+    """
+
+    kid: Annotated[
+        str,
+        Doc(
+            """
+            The key id sent in the `kid` header of the tokens signed with this key.
+            """
+        ),
+    ]
+    key: Annotated[
+        str,
+        Doc(
+            """
+            The key used to verify the tokens. The raw secret for HMAC algorithms or the
+            PEM/JWK (public or private) for the asymmetric ones.
+            """
+        ),
+    ]
+    algorithm: Annotated[
+        str,
+        Doc(
+            """
+            The algorithm of the key. Only this algorithm is accepted for the tokens
+            with this `kid`.
+            """
+        ),
+    ] = "HS256"
+
+
 class SimpleJWT(JWTConfig):
     """
     A subclass of [JWTConfig](https://esmerald.dev/configurations/jwt/).
@@ -34,6 +79,8 @@ class SimpleJWT(JWTConfig):
     ```
     """
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     backend_authentication: Annotated[
         Type[BaseBackendAuthentication],
         Doc(
@@ -205,3 +252,616 @@ class SimpleJWT(JWTConfig):
             """
         ),
     ] = [security]
+    signing_key_id: Annotated[
+        Union[str, None],
+        Doc(
+            """
+            The key id (`kid`) of the active `signing_key`. When provided, the issued
+            tokens carry it in the `kid` header allowing the keys to be rotated.
+            """
+        ),
+    ] = None
+    verify_only_keys: Annotated[
+        List[VerifyingKey],
+        Doc(
+            """
+            The keys accepted to verify tokens but never used to sign new ones.
+
+            When rotating keys, the previous `signing_key` is moved here (with its `kid`)
+            and a new `signing_key` and `signing_key_id` are set. The outstanding tokens
+            remain valid until they expire and the new ones are signed with the new key.
+
+            ```python
+            SimpleJWT(
+                signing_key=new_key,
+                signing_key_id="2024-01",
+                verify_only_keys=[VerifyingKey(kid="2023-12", key=old_key)],
+                ...
+            )
+            ```
+            """
+        ),
+    ] = []
+    enable_jwks: Annotated[
+        bool,
+        Doc(
+            """
+            Boolean flag indicating if the JWKS endpoint publishing the public keys of
+            the keyring should be added to the urls.
+
+            Only the keys of the asymmetric algorithms are published, the HMAC secrets
+            never are.
+            """
+        ),
+    ] = False
+    jwks_url: Annotated[
+        str,
+        Doc(
+            """
+            The URL path in the format of `/path` used for the JWKS endpoint.
+            """
+        ),
+    ] = "/.well-known/jwks.json"
+    jwks_summary: Annotated[
+        str,
+        Doc(
+            """
+            The OpenAPI URL summary for the path the JWKS endpoint.
+            """
+        ),
+    ] = "JSON Web Key Set"
+    jwks_description: Annotated[
+        str,
+        Doc(
+            """
+            The OpenAPI URL description for the path the JWKS endpoint.
+            """
+        ),
+    ] = "Publishes the public keys used to verify the tokens issued by the system."
+    jwks_max_age: Annotated[
+        int,
+        Doc(
+            """
+            The `max-age` in seconds of the `Cache-Control` header sent by the JWKS endpoint,
+            allowing the verifiers to cache the keys.
+            """
+        ),
+    ] = 3600
+    enable_introspection: Annotated[
+        bool,
+        Doc(
+            """
+            Boolean flag indicating if the token introspection endpoint (RFC 7662) should
+            be added to the urls, allowing the services unable to verify the tokens to
+            ask if a token is active and get its claims.
+
+            !!! Warning
+                The endpoint must be protected, for instance, with the
+                `introspection_permissions` or by not exposing it publicly.
+            """
+        ),
+    ] = False
+    introspection_url: Annotated[
+        str,
+        Doc(
+            """
+            The URL path in the format of `/path` used for the introspection endpoint.
+            """
+        ),
+    ] = "/introspect"
+    introspection_summary: Annotated[
+        str,
+        Doc(
+            """
+            The OpenAPI URL summary for the path the introspection endpoint.
+            """
+        ),
+    ] = "Introspect a token"
+    introspection_description: Annotated[
+        str,
+        Doc(
+            """
+            The OpenAPI URL description for the path the introspection endpoint.
+            """
+        ),
+    ] = "Tells if a token is active and returns its claims (RFC 7662)."
+    introspection_batch_url: Annotated[
+        str,
+        Doc(
+            """
+            The URL path in the format of `/path` used for the batch introspection
+            endpoint, added with the introspection endpoint.
+            """
+        ),
+    ] = "/introspect/batch"
+    introspection_batch_summary: Annotated[
+        str,
+        Doc(
+            """
+            The OpenAPI URL summary for the path the batch introspection endpoint.
+            """
+        ),
+    ] = "Introspect tokens"
+    introspection_batch_description: Annotated[
+        str,
+        Doc(
+            """
+            The OpenAPI URL description for the path the batch introspection endpoint.
+            """
+        ),
+    ] = "Tells if the tokens are active and returns their claims, in the same order."
+    introspection_permissions: Annotated[
+        List[Any],
+        Doc(
+            """
+            The [permissions](https://esmerald.dev/permissions/) of the introspection
+            endpoint, for instance, restricting it to the internal services.
+            """
+        ),
+    ] = []
+    introspection_max_batch: Annotated[
+        int,
+        Doc(
+            """
+            The maximum number of tokens introspected by a single request to the batch
+            introspection endpoint.
+            """
+        ),
+    ] = 100
+    introspection_cache_ttl: Annotated[
+        float,
+        Doc(
+            """
+            The time in seconds the introspection results are cached per token, never
+            beyond the `exp` of the token. A token revoked meanwhile may be reported as
+            active for up to this time. Set to `0` to disable the cache.
+            """
+        ),
+    ] = 30.0
+    introspection_cache_size: Annotated[
+        int,
+        Doc(
+            """
+            The maximum number of introspection results cached.
+            """
+        ),
+    ] = 10_000
+    revocation_store: Annotated[
+        Union[RevocationStore, None],
+        Doc(
+            """
+            The store of the revoked tokens, indexed by `jti`, consulted when refreshing
+            an access token. A subclass of `esmerald_simple_jwt.revocation.RevocationStore`.
+
+            Only the tokens containing a `jti` claim can be revoked.
+
+            ```python
+            from esmerald_simple_jwt.revocation import InMemoryRevocationStore
+
+            SimpleJWT(revocation_store=InMemoryRevocationStore(), ...)
+            ```
+            """
+        ),
+    ] = None
+    revocation_cache_ttl: Annotated[
+        float,
+        Doc(
+            """
+            The time in seconds the results of the `revocation_store` are cached in the
+            process. `0` disables the cache.
+
+            !!! Warning
+                A token revoked by another process can still be accepted for up to
+                this time.
+            """
+        ),
+    ] = 5.0
+    revocation_filter: Annotated[
+        bool,
+        Doc(
+            """
+            Boolean flag indicating if a Bloom filter should be put in front of the
+            `revocation_store`. Most of the tokens are not revoked and for those the filter
+            answers without reaching the store.
+
+            !!! Warning
+                The `revocation_store` must implement `entries()` for the filter to know
+                about the tokens revoked by other processes. Otherwise, the filter is
+                bypassed and every check reaches the store.
+            """
+        ),
+    ] = False
+    revocation_filter_capacity: Annotated[
+        int,
+        Doc(
+            """
+            The expected number of revoked tokens (not yet expired). The filter grows when
+            the capacity is reached.
+            """
+        ),
+    ] = 100_000
+    revocation_filter_fp_rate: Annotated[
+        float,
+        Doc(
+            """
+            The false positive rate of the filter, the fraction of not revoked tokens that
+            still need to be checked against the `revocation_store`.
+            """
+        ),
+    ] = 0.001
+    revocation_filter_sync_interval: Annotated[
+        float,
+        Doc(
+            """
+            The interval in seconds used to add the tokens revoked by other processes to
+            the filter, between `0` (before every check) and `60`.
+
+            !!! Warning
+                A token revoked by another process can still be accepted for up to
+                this time.
+            """
+        ),
+    ] = 5.0
+    rotate_refresh_tokens: Annotated[
+        bool,
+        Doc(
+            """
+            Boolean flag indicating if the refresh tokens should be rotated. When enabled,
+            each refresh returns a new `access_token` **and** `refresh_token` and presenting
+            an already used refresh token again revokes all the refresh tokens issued from
+            the same sign-in.
+
+            !!! Warning
+                The refresh tokens issued by the `backend_authentication` must contain a `jti`.
+            """
+        ),
+    ] = False
+    token_family_store: Annotated[
+        Union[TokenFamilyStore, None],
+        Doc(
+            """
+            The store of the refresh token families used when `rotate_refresh_tokens` is
+            enabled. A subclass of `esmerald_simple_jwt.revocation.TokenFamilyStore`.
+
+            Defaults to an `InMemoryTokenFamilyStore`.
+            """
+        ),
+    ] = None
+    token_version_store: Annotated[
+        Union[TokenVersionStore, None],
+        Doc(
+            """
+            The store of the per-user token versions. A subclass of
+            `esmerald_simple_jwt.revocation.TokenVersionStore`.
+
+            When set, the refresh tokens carry the `ver` of the user when issued and a
+            refresh token whose `ver` is not the current version of the user is rejected.
+            Bumping the version of a user, for instance after a password reset, revokes
+            all the refresh tokens of the user at once.
+
+            **Example**
+
+            ```python
+            from esmerald_simple_jwt.revocation import InMemoryTokenVersionStore
+
+            SimpleJWT(token_version_store=InMemoryTokenVersionStore(), ...)
+            ```
+            """
+        ),
+    ] = None
+    token_version_cache_ttl: Annotated[
+        float,
+        Doc(
+            """
+            The time in seconds the versions of the `token_version_store` are cached in
+            the process. A version bumped by another process may be ignored for up to
+            this time. Set to `0` to disable the cache.
+            """
+        ),
+    ] = 5.0
+    coalesce_refreshes: Annotated[
+        bool,
+        Doc(
+            """
+            Boolean flag indicating if the concurrent refreshes of the same refresh token
+            should be coalesced. The first one does the work and the others, in the same
+            process, get its result.
+
+            This also prevents the duplicated requests (common with flaky networks) from
+            being detected as a reuse when `rotate_refresh_tokens` is enabled.
+            """
+        ),
+    ] = False
+    coalesce_refreshes_ttl: Annotated[
+        float,
+        Doc(
+            """
+            The time in seconds the result of a refresh is kept and returned to the
+            duplicated requests arriving after it completed.
+
+            !!! Warning
+                During this time, the same refresh token gets the same response, even
+                after being revoked. Keep it short.
+            """
+        ),
+    ] = 3.0
+    fast_responses: Annotated[
+        bool,
+        Doc(
+            """
+            Boolean flag indicating if the signin and refresh responses should be written
+            straight from the token strings into a precompiled JSON template, skipping
+            the validation and serialization of the response models.
+
+            Only applies to the default schemas, the `access_token_model` and the
+            `token_model` must be left as they are. The OpenAPI schema is not affected.
+            """
+        ),
+    ] = False
+    hashing_executor: Annotated[
+        str,
+        Doc(
+            """
+            Where the password hashing of the `make_password()` and `check_password()`
+            helpers of the authentication backends runs, `thread` or `process`.
+
+            The `process` executor is not limited by the GIL but the settings must be
+            importable by the worker processes.
+            """
+        ),
+    ] = "thread"
+    hashing_concurrency: Annotated[
+        int,
+        Doc(
+            """
+            The maximum number of passwords hashed at the same time.
+            """
+        ),
+    ] = 4
+    hashing_max_pending: Annotated[
+        int,
+        Doc(
+            """
+            The maximum number of passwords waiting to be hashed. Beyond it, the
+            authentication fails with a `503` and a `Retry-After` header instead of
+            queuing more work.
+            """
+        ),
+    ] = 64
+    crypto_executor: Annotated[
+        Union[str, None],
+        Doc(
+            """
+            Where the signature and verification of the tokens with the asymmetric
+            algorithms (RSA, EC, EdDSA) run, `thread` or `process`. By default, they run
+            on the event loop.
+
+            The `process` executor spreads them across all the cores, each worker
+            process loading the keys once. The HMAC algorithms always run inline.
+            """
+        ),
+    ] = None
+    crypto_workers: Annotated[
+        Union[int, None],
+        Doc(
+            """
+            The number of threads or processes of the `crypto_executor`. Defaults to
+            the number of CPUs.
+            """
+        ),
+    ] = None
+    crypto_max_batch: Annotated[
+        int,
+        Doc(
+            """
+            The maximum number of signatures (or verifications) sent at once to the
+            `crypto_executor`, reducing the exchanges with the worker processes.
+            """
+        ),
+    ] = 64
+    throttle_signin: Annotated[
+        bool,
+        Doc(
+            """
+            Boolean flag indicating if the signin attempts are throttled, per identifier
+            and per client IP, before calling the `backend_authentication`.
+
+            The attempts beyond the limits are rejected with a `429` and a `Retry-After`
+            header, without any database lookup or password hashing.
+            """
+        ),
+    ] = False
+    throttle_store: Annotated[
+        Union[ThrottleStore, None],
+        Doc(
+            """
+            The store keeping the token buckets of the throttling.
+
+            Defaults to an `InMemoryThrottleStore`, meaning the limits are per worker. Use
+            a `RedisThrottleStore` to share them between the workers.
+            """
+        ),
+    ] = None
+    throttle_identifier_field: Annotated[
+        str,
+        Doc(
+            """
+            The field of the `login_model` identifying the user, for instance, `email`
+            or `username`.
+            """
+        ),
+    ] = "email"
+    throttle_identifier_limit: Annotated[
+        int,
+        Doc(
+            """
+            The maximum number of signin attempts for the same identifier during the
+            `throttle_identifier_period`.
+            """
+        ),
+    ] = 5
+    throttle_identifier_period: Annotated[
+        float,
+        Doc(
+            """
+            The time in seconds for the `throttle_identifier_limit` to be fully restored.
+            """
+        ),
+    ] = 60.0
+    throttle_ip_limit: Annotated[
+        int,
+        Doc(
+            """
+            The maximum number of signin attempts from the same client IP during the
+            `throttle_ip_period`.
+            """
+        ),
+    ] = 50
+    throttle_ip_period: Annotated[
+        float,
+        Doc(
+            """
+            The time in seconds for the `throttle_ip_limit` to be fully restored.
+            """
+        ),
+    ] = 60.0
+    admission_control: Annotated[
+        bool,
+        Doc(
+            """
+            Boolean flag indicating if the signin requests are shed under overload,
+            failing fast with a `503` and a `Retry-After` header.
+
+            The refreshes are never shed.
+            """
+        ),
+    ] = False
+    admission_max_inflight: Annotated[
+        int,
+        Doc(
+            """
+            The maximum number of signin requests in progress at the same time.
+            """
+        ),
+    ] = 64
+    admission_max_queue: Annotated[
+        int,
+        Doc(
+            """
+            The maximum number of passwords waiting for the hashing executor before the
+            new signin requests are shed. Must be at least `1`.
+            """
+        ),
+    ] = 16
+    admission_target_delay: Annotated[
+        float,
+        Doc(
+            """
+            The acceptable time in seconds waited for the hashing executor. When every
+            hash waits longer during the `admission_interval`, the new signin requests
+            are shed until the queue drains.
+            """
+        ),
+    ] = 0.05
+    admission_interval: Annotated[
+        float,
+        Doc(
+            """
+            The time in seconds the waits must stay above the `admission_target_delay`
+            to be considered an overload rather than a burst.
+            """
+        ),
+    ] = 0.1
+    admission_retry_after: Annotated[
+        int,
+        Doc(
+            """
+            The value in seconds of the `Retry-After` header of the shed requests.
+            """
+        ),
+    ] = 1
+    token_max_length: Annotated[
+        int,
+        Doc(
+            """
+            The maximum length of the tokens accepted by the `TokenDecoder`. Longer
+            tokens are rejected before any decoding.
+            """
+        ),
+    ] = 4096
+    verified_token_cache: Annotated[
+        bool,
+        Doc(
+            """
+            Boolean flag indicating if the claims of the tokens already verified by the
+            `TokenDecoder` are cached, avoiding verifying the same token again.
+
+            The cache is invalidated when the keyring changes and the entries never
+            outlive the `exp` of the tokens.
+            """
+        ),
+    ] = False
+    verified_token_cache_size: Annotated[
+        int,
+        Doc(
+            """
+            The maximum number of tokens kept in the verified token cache. The least
+            recently used tokens are evicted first.
+            """
+        ),
+    ] = 10_000
+    verified_token_cache_ttl: Annotated[
+        float,
+        Doc(
+            """
+            The maximum time in seconds a verified token is kept in the cache.
+            """
+        ),
+    ] = 300.0
+    claims_projection: Annotated[
+        Dict[str, str],
+        Doc(
+            """
+            A mapping of the (short) names of the claims to the (dotted) attributes of
+            the user embedded in the issued tokens, for instance,
+            `{"rol": "role", "tid": "tenant.id"}`.
+
+            The protected routes can read them from the verified claims instead of
+            loading the user from the database. The `RefreshAuthentication` carries
+            them from the refresh token to the new access token.
+            """
+        ),
+    ] = {}
+    claims_projection_max_size: Annotated[
+        int,
+        Doc(
+            """
+            The maximum size in bytes of the projected claims once serialized.
+            """
+        ),
+    ] = 512
+
+    def load_keys(self) -> KeyMaterial:
+        """
+        Loads the `signing_key` and `verifying_key` into the key objects used by PyJWT.
+
+        The keys can be a raw secret (HMAC), PEM or JWK. They are parsed only once
+        and cached, avoiding PyJWT parsing a PEM again on every `encode()` and
+        `decode()` when using algorithms like `RS256` or `ES256`.
+        """
+        return load_key_material(
+            self.algorithm, self.signing_key, self.verifying_key, self.signing_key_id
+        )
+
+    def load_keyring(self) -> KeyRing:
+        """
+        Loads the active key and the `verify_only_keys` into a `KeyRing` indexed
+        by `kid`.
+        """
+        return KeyRing(
+            self.load_keys(),
+            [
+                load_key_material(key.algorithm, key.key, kid=key.kid)
+                for key in self.verify_only_keys
+            ],
+        )
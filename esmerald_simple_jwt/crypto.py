@@ -0,0 +1,254 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from anyio import CapacityLimiter, Event, sleep, to_thread
+from esmerald.exceptions import ImproperlyConfigured
+
+from esmerald_simple_jwt.keys import HMAC_ALGORITHMS, parse_key
+from esmerald_simple_jwt.token import Signer
+
+if TYPE_CHECKING:
+    from esmerald_simple_jwt.keys import KeyRing
+
+EXECUTORS = ("thread", "process")
+
+# The exported keys are `(kid, algorithm, key)`, the key being a PEM or a raw secret.
+ExportedKey = Tuple[Optional[str], str, bytes]
+
+# The signers of a worker process, loaded once by `init_worker()`.
+worker_signer: Optional[Signer] = None
+worker_verifiers: Dict[Optional[str], Signer] = {}
+
+
+def export_key(key: Any) -> bytes:
+    """
+    Serializes a key object into bytes that can be sent to a worker process, the PEM
+    of the `cryptography` keys or the raw secret of HMAC.
+    """
+    if isinstance(key, bytes):
+        return key
+
+    from cryptography.hazmat.primitives import serialization
+
+    if hasattr(key, "private_bytes"):
+        return key.private_bytes(  # type: ignore[no-any-return]
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    return key.public_bytes(  # type: ignore[no-any-return]
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+
+
+def init_worker(signing: ExportedKey, verifying: Sequence[ExportedKey]) -> None:
+    """
+    Loads the keys of a worker process, once when the process starts.
+    """
+    global worker_signer, worker_verifiers
+
+    kid, algorithm, key = signing
+    worker_signer = Signer(parse_key(algorithm, key), algorithm, kid=kid)
+    worker_verifiers = {
+        kid: Signer(parse_key(algorithm, key), algorithm, kid=kid)
+        for kid, algorithm, key in verifying
+    }
+
+
+def sign_batch(messages: List[bytes]) -> List[bytes]:
+    """
+    Signs the messages with the signing key of the worker process.
+    """
+    assert worker_signer is not None, "The worker keys are not loaded."
+    sign = worker_signer.sign
+    return [sign(message) for message in messages]
+
+
+def verify_batch(items: List[Tuple[Optional[str], bytes, bytes]]) -> List[bool]:
+    """
+    Verifies the `(kid, message, signature)` with the verifying keys of the worker process.
+    """
+    return [worker_verifiers[kid].verify(message, signature) for kid, message, signature in items]
+
+
+class Batch:
+    """
+    The calls gathered while the event loop runs, sent to the executor at once.
+    """
+
+    __slots__ = ("items", "results", "error", "done")
+
+    def __init__(self) -> None:
+        self.items: List[Any] = []
+        self.results: List[Any] = []
+        self.error: Optional[BaseException] = None
+        self.done = Event()
+
+
+class CryptoExecutor:
+    """
+    Runs the signature and verification of the tokens with the asymmetric algorithms
+    (RSA, EC, EdDSA) away from the event loop.
+
+    Signing a token with `RS256` takes around a millisecond of CPU, enough to keep the
+    event loop of a worker busy while the other cores sit idle. The executor sends the
+    work to `workers` threads or processes instead:
+
+    * `thread` - The signatures run in OpenSSL via `cryptography`, in worker threads of
+    the same process.
+    * `process` - The signatures run in a pool of worker processes, spreading them
+    across all the cores. Each process loads the keys of the keyring once, when it
+    starts.
+
+    The calls made while the event loop runs are gathered into batches of up to
+    `max_batch` calls, sent to the executor at once, meaning a single exchange with a
+    worker process for many tokens.
+
+    The HMAC algorithms are cheaper than sending the work anywhere and always run
+    inline.
+    """
+
+    def __init__(
+        self,
+        keyring: "KeyRing",
+        kind: str = "thread",
+        workers: Optional[int] = None,
+        max_batch: int = 64,
+    ) -> None:
+        if kind not in EXECUTORS:
+            raise ImproperlyConfigured(
+                f"The crypto executor must be one of {', '.join(EXECUTORS)}, got `{kind}`."
+            )
+        if workers is not None and workers < 1:
+            raise ImproperlyConfigured("The crypto executor needs at least one worker.")
+        if max_batch < 1:
+            raise ImproperlyConfigured("The crypto executor `max_batch` must be positive.")
+
+        self.keyring = keyring
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.max_batch = max_batch
+        self.batches = 0
+
+        active = keyring.active
+        self.signer = Signer(active.signing_key, active.algorithm, kid=active.kid)
+        self.verifiers: Dict[Optional[str], Signer] = {
+            key.kid: Signer(key.verifying_key, key.algorithm, kid=key.kid) for key in keyring
+        }
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._limiter: Optional[CapacityLimiter] = None
+        # The batches being gathered, by kind of work.
+        self._gathering: Dict[str, Batch] = {}
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        # Created lazily, the worker processes only start when needed.
+        if self._pool is None:
+            active = self.keyring.active
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+                initargs=(
+                    (active.kid, active.algorithm, export_key(active.signing_key)),
+                    [
+                        (key.kid, key.algorithm, export_key(key.verifying_key))
+                        for key in self.keyring
+                    ],
+                ),
+            )
+        return self._pool
+
+    @property
+    def limiter(self) -> CapacityLimiter:
+        if self._limiter is None:
+            self._limiter = CapacityLimiter(self.workers)
+        return self._limiter
+
+    def offloads(self, signer: Signer) -> bool:
+        """
+        Checks if the work of a signer is worth sending to the executor.
+        """
+        return signer.algorithm not in HMAC_ALGORITHMS
+
+    def shutdown(self) -> None:
+        """
+        Stops the worker processes, if any.
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _sign_local(self, messages: List[bytes]) -> List[bytes]:
+        sign = self.signer.sign
+        return [sign(message) for message in messages]
+
+    def _verify_local(self, items: List[Tuple[Optional[str], bytes, bytes]]) -> List[bool]:
+        verifiers = self.verifiers
+        return [verifiers[kid].verify(message, signature) for kid, message, signature in items]
+
+    async def _run(
+        self,
+        local: Callable[[List[Any]], List[Any]],
+        remote: Callable[[List[Any]], List[Any]],
+        items: List[Any],
+    ) -> List[Any]:
+        self.batches += 1
+        if self.kind == "process":
+            return await asyncio.wrap_future(self.pool.submit(remote, items))
+        return await to_thread.run_sync(local, items, limiter=self.limiter)
+
+    async def _submit(
+        self,
+        kind: str,
+        item: Any,
+        local: Callable[[List[Any]], List[Any]],
+        remote: Callable[[List[Any]], List[Any]],
+    ) -> Any:
+        batch = self._gathering.get(kind)
+        if batch is not None and len(batch.items) < self.max_batch:
+            # Joins the batch being gathered and waits for it to run.
+            index = len(batch.items)
+            batch.items.append(item)
+            await batch.done.wait()
+            if batch.error is not None:
+                raise batch.error
+            return batch.results[index]
+
+        batch = self._gathering[kind] = Batch()
+        batch.items.append(item)
+        try:
+            # Lets the other tasks ready to run join the batch.
+            await sleep(0)
+            if self._gathering.get(kind) is batch:
+                del self._gathering[kind]
+            batch.results = await self._run(local, remote, batch.items)
+        except Exception as e:
+            batch.error = e
+            raise
+        finally:
+            if self._gathering.get(kind) is batch:
+                del self._gathering[kind]
+            if not batch.results and batch.error is None:
+                batch.error = RuntimeError("The batch was cancelled.")
+            batch.done.set()
+        return batch.results[0]
+
+    async def sign(self, message: bytes) -> bytes:
+        """
+        Signs a message with the active key of the keyring.
+        """
+        return await self._submit(  # type: ignore[no-any-return]
+            "sign", message, self._sign_local, sign_batch
+        )
+
+    async def verify(self, kid: Optional[str], message: bytes, signature: bytes) -> bool:
+        """
+        Verifies the signature of a message with the key of the given `kid`.
+        """
+        return await self._submit(  # type: ignore[no-any-return]
+            "verify", (kid, message, signature), self._verify_local, verify_batch
+        )
@@ -8,6 +8,8 @@ from esmerald.routing.router import Include
 from esmerald.types import Dependencies, ExceptionHandlerMap, Middleware
 from typing_extensions import Annotated, Doc
 
+from esmerald_simple_jwt.runtime import build_runtime_config, get_runtime_config
+
 if TYPE_CHECKING:
     from esmerald.types import SettingsType
 
@@ -193,6 +195,21 @@ class SimpleJWTExtension(Extension):
             enable_openapi=enable_openapi,
             settings_module=settings_module,
         )
+        # Resolves the SimpleJWT configuration once for the settings used by the child.
+        app_settings = simple_jwt.settings
+        build_runtime_config(app_settings)
+
+        # The services of the runtime configuration in use when the application starts
+        # and stops.
+        async def start_services() -> None:
+            await get_runtime_config(app_settings).services.startup()
+
+        def shutdown_services() -> None:
+            get_runtime_config(app_settings).services.shutdown()
+
+        self.app.add_event_handler("startup", start_services)
+        self.app.add_event_handler("shutdown", shutdown_services)
+
         self.app.add_child_esmerald(
             path=path,
             child=simple_jwt,
@@ -0,0 +1,157 @@
+import secrets
+import time
+from typing import TYPE_CHECKING, Any, Callable, Optional, Tuple, TypeVar
+
+from anyio import CapacityLimiter, Lock, Semaphore, to_process, to_thread
+from esmerald.contrib.auth.hashers import (
+    get_hasher,
+    identify_hasher,
+    is_password_usable,
+    make_password,
+)
+from esmerald.exceptions import ImproperlyConfigured, ServiceUnavailable
+
+if TYPE_CHECKING:
+    from esmerald_simple_jwt.admission import DelayController
+
+T = TypeVar("T")
+
+EXECUTORS = ("thread", "process")
+
+
+def hash_password(password: Optional[str], hasher: str = "default") -> str:
+    """
+    Hashes a password for storage. A blocking call, meant to run in a `HashingExecutor`.
+    """
+    return make_password(password, hasher)
+
+
+def verify_password(password: str, encoded: str, preferred: str = "default") -> Tuple[bool, bool]:
+    """
+    Checks a password against its hash. A blocking call, meant to run in a
+    `HashingExecutor`.
+
+    Returns if the password is correct and if the hash must be updated, for
+    instance, because the preferred hasher changed.
+    """
+    if password is None or not is_password_usable(encoded):
+        return False, False
+
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        # The hash is gibberish or uses a hasher no longer installed.
+        return False, False
+
+    preferred_hasher = get_hasher(preferred)
+    must_update = hasher.algorithm != preferred_hasher.algorithm or preferred_hasher.must_update(
+        encoded
+    )
+    return hasher.verify(password, encoded), must_update
+
+
+class HashingExecutor:
+    """
+    Runs the password hashing away from the event loop.
+
+    The hashers are CPU bound and take tens of milliseconds per call, blocking every
+    other request of the worker while they run. The executor runs them in worker
+    threads (or processes) instead, with at most `concurrency` hashes running at the
+    same time and at most `max_pending` waiting for their turn. When the queue is full,
+    a `ServiceUnavailable` is raised instead of queuing more work.
+
+    The `process` executor avoids the GIL at the cost of pickling the calls, the
+    functions must be importable and the settings available in the worker processes.
+
+    When a `delay` controller is provided, the time every call waited for a free
+    worker is reported to it.
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        concurrency: int = 4,
+        max_pending: int = 64,
+        retry_after: int = 1,
+        delay: Optional["DelayController"] = None,
+    ) -> None:
+        if kind not in EXECUTORS:
+            raise ImproperlyConfigured(
+                f"The hashing executor must be one of {', '.join(EXECUTORS)}, got `{kind}`."
+            )
+        if concurrency < 1:
+            raise ImproperlyConfigured("The hashing concurrency must be at least 1.")
+        if max_pending < 0:
+            raise ImproperlyConfigured("The hashing `max_pending` cannot be negative.")
+
+        self.kind = kind
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self.delay = delay
+        self.pending = 0
+        self._slots: Optional[Semaphore] = None
+        self._limiter: Optional[CapacityLimiter] = None
+        self._dummy_hash: Optional[str] = None
+        self._dummy_lock: Optional[Lock] = None
+
+    @property
+    def slots(self) -> Semaphore:
+        # Created lazily, the semaphore and the limiter need a running event loop.
+        if self._slots is None:
+            self._slots = Semaphore(self.concurrency)
+        return self._slots
+
+    @property
+    def limiter(self) -> CapacityLimiter:
+        if self._limiter is None:
+            self._limiter = CapacityLimiter(self.concurrency)
+        return self._limiter
+
+    @property
+    def waiting(self) -> int:
+        """
+        The number of calls waiting for a free worker.
+        """
+        return max(self.pending - self.concurrency, 0)
+
+    async def dummy_hash(self) -> str:
+        """
+        The hash of a random password, made once with the default hasher and its current
+        parameters, used to check the passwords of unknown users.
+
+        The `SimpleJWTExtension` makes it when the application starts. Otherwise, as when
+        only the urls are included, the first call makes it and the concurrent ones wait
+        for it.
+        """
+        if self._dummy_hash is None:
+            if self._dummy_lock is None:
+                self._dummy_lock = Lock()
+            async with self._dummy_lock:
+                if self._dummy_hash is None:
+                    self._dummy_hash = await self.run(hash_password, secrets.token_urlsafe(32))
+        return self._dummy_hash
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Runs `func(*args)` in the executor.
+        """
+        if self.pending >= self.concurrency + self.max_pending:
+            raise ServiceUnavailable(
+                detail="Too many concurrent authentications, try again later.",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+
+        self.pending += 1
+        try:
+            queued_at = time.monotonic()
+            async with self.slots:
+                if self.delay is not None:
+                    self.delay.observe(time.monotonic() - queued_at)
+
+                # The limiter sizes the pool, the slots already bound the calls.
+                if self.kind == "process":
+                    return await to_process.run_sync(func, *args, limiter=self.limiter)
+                return await to_thread.run_sync(func, *args, limiter=self.limiter)
+        finally:
+            self.pending -= 1
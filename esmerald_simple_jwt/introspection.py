@@ -0,0 +1,92 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+from anyio import create_task_group
+from jwt.exceptions import PyJWTError
+
+from esmerald_simple_jwt.runtime import RuntimeConfig, get_runtime_config
+from esmerald_simple_jwt.token import TokenRejectedError
+
+INACTIVE: Dict[str, Any] = {"active": False}
+
+
+async def verify(token: str, runtime: RuntimeConfig) -> Dict[str, Any]:
+    """
+    Verifies a token for the introspection, without any cache.
+    """
+    services = runtime.services
+    try:
+        claims = await services.decoder.adecode(token)
+    except PyJWTError:
+        return INACTIVE
+
+    if claims.token_type not in (runtime.access_token_name, runtime.refresh_token_name):
+        return INACTIVE
+    if (
+        services.revocation is not None
+        and claims.jti is not None
+        and await services.revocation.is_revoked(claims.jti)
+    ):
+        return INACTIVE
+    if (
+        services.token_versions is not None
+        and claims.token_type == runtime.refresh_token_name
+        and (claims.ver or 0) != await services.token_versions.get(claims.sub)
+    ):
+        return INACTIVE
+    return {"active": True, **claims.as_dict()}
+
+
+async def introspect(token: str, runtime: Optional[RuntimeConfig] = None) -> Dict[str, Any]:
+    """
+    Introspects a token as described by the RFC 7662, returning `{"active": False}`
+    or `{"active": True}` with the claims of the token.
+
+    A token is active when its signature, `exp` and `nbf` are valid, its `token_type`
+    is the access or refresh one and it was not revoked (by `jti` with a
+    `revocation_store` or, for the refresh tokens, by `ver` with a
+    `token_version_store`).
+
+    With an `introspection_cache_ttl`, the results are cached per token for that time
+    at most, never beyond the `exp` of the token. The malformed and oversized tokens
+    are rejected before, never hashed for the cache.
+    """
+    if runtime is None:
+        runtime = get_runtime_config()
+
+    cache = runtime.services.introspection_cache
+    if cache is None:
+        return await verify(token, runtime)
+
+    try:
+        runtime.services.decoder.check(token)
+    except TokenRejectedError:
+        return INACTIVE
+
+    result = cache.get(token)
+    if result is None:
+        result = await verify(token, runtime)
+        cache.put(token, result)
+    return result
+
+
+async def introspect_many(
+    tokens: Sequence[str], runtime: Optional[RuntimeConfig] = None
+) -> List[Dict[str, Any]]:
+    """
+    Introspects many tokens at once, returning the results in the same order.
+
+    The tokens are introspected concurrently, letting a `crypto_executor` verify the
+    signatures in batches.
+    """
+    if runtime is None:
+        runtime = get_runtime_config()
+
+    results: List[Dict[str, Any]] = [INACTIVE] * len(tokens)
+
+    async def run(index: int) -> None:
+        results[index] = await introspect(tokens[index], runtime)
+
+    async with create_task_group() as tg:
+        for index in range(len(tokens)):
+            tg.start_soon(run, index)
+    return results
@@ -0,0 +1,137 @@
+import time
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+from uuid import uuid4
+
+from anyio import create_task_group
+from esmerald.exceptions import ImproperlyConfigured
+
+from esmerald_simple_jwt.runtime import RuntimeConfig, get_runtime_config
+from esmerald_simple_jwt.schemas import TokenAccess
+from esmerald_simple_jwt.token import TokenEncoder
+
+# A subject, alone or with the claims overriding the defaults of its tokens.
+Subject = Union[str, Tuple[str, Mapping[str, Any]]]
+
+
+async def gather_subjects(
+    subjects: Union[Iterable[Subject], AsyncIterable[Subject]], size: int
+) -> AsyncIterator[List[Tuple[str, Mapping[str, Any]]]]:
+    """
+    Groups the subjects, from a sync or async iterable, in lists of `size` at most.
+    """
+    batch: List[Tuple[str, Mapping[str, Any]]] = []
+
+    async def iterate() -> AsyncIterator[Subject]:
+        if isinstance(subjects, AsyncIterable):
+            async for subject in subjects:
+                yield subject
+        else:
+            for subject in subjects:
+                yield subject
+
+    async for subject in iterate():
+        batch.append((subject, {}) if isinstance(subject, str) else subject)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def encode_all(encoder: TokenEncoder, claims: List[Dict[str, Any]]) -> List[str]:
+    """
+    Encodes many tokens, concurrently when the encoder has a crypto executor, letting
+    it sign them in batches.
+    """
+    executor = encoder.executor
+    if executor is None or not executor.offloads(encoder.signer):
+        return [encoder.encode(item) for item in claims]
+
+    tokens: List[str] = [""] * len(claims)
+
+    async def encode(index: int) -> None:
+        tokens[index] = await encoder.aencode(claims[index])
+
+    async with create_task_group() as tg:
+        for index in range(len(claims)):
+            tg.start_soon(encode, index)
+    return tokens
+
+
+async def issue_many(
+    subjects: Union[Iterable[Subject], AsyncIterable[Subject]],
+    runtime: Optional[RuntimeConfig] = None,
+    batch_size: int = 256,
+) -> AsyncIterator[Tuple[str, TokenAccess]]:
+    """
+    Issues an access and refresh token pair for each subject, for instance, to
+    pre-provision the tokens of service accounts or devices.
+
+    The subjects are either the `sub` or a `(sub, claims)` tuple whose claims override
+    the defaults of both tokens (the `exp`, extra claims...), except the `token_type`.
+    The refresh tokens have a `jti` and, with a `token_version_store`, both tokens carry
+    the `ver` of the subject, like the tokens issued by the signin.
+
+    The pairs are yielded as `(sub, TokenAccess)` in the order of the subjects. They are
+    issued in batches of `batch_size`, reading the clock once per batch and encoding
+    with the `TokenEncoder` of the runtime configuration (the header serialized and the
+    key prepared once). With a `crypto_executor`, the tokens of a batch are signed in
+    parallel.
+
+    **Example**
+
+    ```python
+    from esmerald_simple_jwt.issuance import issue_many
+
+    async for sub, tokens in issue_many(["device-1", ("device-2", {"scope": "read"})]):
+        print(sub, tokens.access_token, tokens.refresh_token)
+    ```
+    """
+    if batch_size < 1:
+        raise ImproperlyConfigured("The `batch_size` must be positive.")
+    if runtime is None:
+        runtime = get_runtime_config()
+
+    access_lifetime = int(runtime.access_token_lifetime.total_seconds())
+    refresh_lifetime = int(runtime.refresh_token_lifetime.total_seconds())
+    access_name, refresh_name = runtime.access_token_name, runtime.refresh_token_name
+    versions = runtime.services.token_versions
+
+    async for batch in gather_subjects(subjects, batch_size):
+        now = int(time.time())
+        claims: List[Dict[str, Any]] = []
+
+        for sub, overrides in batch:
+            common: Dict[str, Any] = {"iat": now, "sub": sub}
+            if versions is not None:
+                common["ver"] = await versions.get(sub)
+
+            claims.append(
+                {"exp": now + access_lifetime, **common, **overrides, "token_type": access_name}
+            )
+            claims.append(
+                {
+                    "exp": now + refresh_lifetime,
+                    **common,
+                    "jti": uuid4().hex,
+                    **overrides,
+                    "token_type": refresh_name,
+                }
+            )
+
+        tokens = await encode_all(runtime.services.encoder, claims)
+        for index, (sub, _) in enumerate(batch):
+            yield sub, TokenAccess(
+                access_token=tokens[2 * index], refresh_token=tokens[2 * index + 1]
+            )
@@ -0,0 +1,250 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import jwt
+from esmerald.exceptions import ImproperlyConfigured
+from jwt.algorithms import get_default_algorithms, has_crypto
+from jwt.exceptions import InvalidKeyError
+
+HMAC_ALGORITHMS = frozenset({"HS256", "HS384", "HS512"})
+
+
+@dataclass(frozen=True, slots=True)
+class KeyMaterial:
+    """
+    The keys of a given algorithm, parsed once.
+
+    For the HMAC algorithms, both keys are the raw secret as `bytes`. For the asymmetric
+    algorithms (RSA, EC, EdDSA...), the keys are the `cryptography` key objects and
+    the `verifying_key` is the public counterpart of the `signing_key` unless a
+    different one was provided.
+
+    These objects can be passed directly to `Token.encode()` and `Token.decode()`.
+    """
+
+    algorithm: str
+    signing_key: Any
+    verifying_key: Any
+    kid: Optional[str] = None
+    algorithms: List[str] = field(default_factory=list)
+    headers: Optional[Dict[str, str]] = None
+
+    @property
+    def is_symmetric(self) -> bool:
+        return self.algorithm in HMAC_ALGORITHMS
+
+
+def is_jwk(key: Union[str, bytes], algorithm: Optional[str] = None) -> bool:
+    """
+    Checks if a given key is in the JWK (JSON) format rather than PEM or a raw secret.
+
+    A raw HMAC secret can start with `{` as well, so for the HMAC algorithms the key
+    is only a JWK when it is a JSON object with a `kty`.
+    """
+    if isinstance(key, bytes):
+        if not key.lstrip().startswith(b"{"):
+            return False
+    elif not key.lstrip().startswith("{"):
+        return False
+
+    if algorithm not in HMAC_ALGORITHMS:
+        return True
+    try:
+        data = json.loads(key)
+    except ValueError:
+        return False
+    return isinstance(data, dict) and "kty" in data
+
+
+def parse_key(algorithm: str, key: Union[str, bytes]) -> Any:
+    """
+    Parses a PEM, JWK or raw secret into the object used by PyJWT for the
+    given algorithm.
+    """
+    algorithms = get_default_algorithms()
+    if algorithm not in algorithms:
+        if not has_crypto and algorithm not in HMAC_ALGORITHMS:
+            raise ImproperlyConfigured(
+                f"The algorithm `{algorithm}` requires the `cryptography` package. "
+                "Run `pip install esmerald-simple-jwt[crypto]`."
+            )
+        raise ImproperlyConfigured(f"Unsupported algorithm `{algorithm}`.")
+
+    handler = algorithms[algorithm]
+    try:
+        if is_jwk(key, algorithm):
+            return handler.from_jwk(key if isinstance(key, str) else key.decode())
+        return handler.prepare_key(key)
+    except (InvalidKeyError, ValueError, TypeError, json.JSONDecodeError) as e:
+        raise ImproperlyConfigured(f"Invalid key for the algorithm `{algorithm}`: {e}") from e
+
+
+@lru_cache(maxsize=64)
+def load_key_material(
+    algorithm: str,
+    signing_key: Union[str, bytes],
+    verifying_key: Union[str, bytes] = "",
+    kid: Optional[str] = None,
+) -> KeyMaterial:
+    """
+    Loads (and caches) the signing and verifying keys for the given algorithm.
+
+    When no `verifying_key` is provided, the public key is derived from the
+    `signing_key` for the asymmetric algorithms and the same secret is used for HMAC.
+
+    When a `kid` is provided, the `headers` to be used when encoding a token are
+    also prepared.
+    """
+    signing = parse_key(algorithm, signing_key)
+
+    if verifying_key:
+        verifying = parse_key(algorithm, verifying_key)
+    elif algorithm in HMAC_ALGORITHMS or not hasattr(signing, "public_key"):
+        verifying = signing
+    else:
+        verifying = signing.public_key()
+
+    return KeyMaterial(
+        algorithm=algorithm,
+        signing_key=signing,
+        verifying_key=verifying,
+        kid=kid,
+        algorithms=[algorithm],
+        headers={"kid": kid} if kid else None,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class JWKS:
+    """
+    The serialized JSON Web Key Set of the public keys and its strong `ETag`.
+    """
+
+    body: bytes
+    etag: str
+
+    def matches(self, if_none_match: Union[str, None]) -> bool:
+        """
+        Checks the value of an `If-None-Match` header against the `etag`.
+        """
+        if not if_none_match:
+            return False
+        for value in if_none_match.split(","):
+            value = value.strip()
+            if value == "*" or value.removeprefix("W/") == self.etag:
+                return True
+        return False
+
+
+def build_jwks(keys: Iterable[KeyMaterial]) -> JWKS:
+    """
+    Serializes the public keys into a JWKS document.
+
+    The HMAC keys are secrets and are never published.
+    """
+    algorithms = get_default_algorithms()
+    jwks: List[Dict[str, Any]] = []
+
+    for key in keys:
+        if key.is_symmetric:
+            continue
+
+        public_key = key.verifying_key
+        if hasattr(public_key, "public_key"):
+            # Never publish the private parts.
+            public_key = public_key.public_key()
+
+        jwk: Dict[str, Any] = algorithms[key.algorithm].to_jwk(public_key, as_dict=True)
+        jwk.update({"alg": key.algorithm, "use": "sig"})
+        if key.kid is not None:
+            jwk["kid"] = key.kid
+        jwks.append(jwk)
+
+    body = json.dumps({"keys": jwks}, separators=(",", ":"), sort_keys=True).encode()
+    return JWKS(body=body, etag=f'"{hashlib.sha256(body).hexdigest()}"')
+
+
+class KeyRing:
+    """
+    A set of keys used to verify tokens, indexed by their `kid`.
+
+    One key is the `active` key, the one used to sign the new tokens. The others
+    are verify-only keys, allowing tokens signed by previous keys to still be
+    accepted while rotating the keys.
+
+    Tokens without a `kid` header are verified against the active key and then against
+    the verify-only keys of the same algorithm, accepting the tokens signed before the
+    keys had a `kid`.
+    """
+
+    __slots__ = ("active", "_keys", "_jwks")
+
+    def __init__(self, active: KeyMaterial, verify_only: Sequence[KeyMaterial] = ()) -> None:
+        self.active = active
+        self._keys: Dict[Optional[str], KeyMaterial] = {None: active}
+        self._jwks: Optional[JWKS] = None
+
+        for key in (active, *verify_only):
+            if key.kid is None:
+                if key is not active:
+                    raise ImproperlyConfigured("The verify-only keys must declare a `kid`.")
+                continue
+            if key.kid in self._keys:
+                raise ImproperlyConfigured(f"Duplicate `kid` in the keyring: {key.kid}.")
+            self._keys[key.kid] = key
+
+    def __iter__(self) -> Iterator[KeyMaterial]:
+        """
+        Iterates over the distinct keys of the keyring, the active one first.
+        """
+        yield self.active
+        for kid, key in self._keys.items():
+            if kid is not None and key is not self.active:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def get(self, kid: Optional[str]) -> KeyMaterial:
+        """
+        Returns the key for the given `kid` or raises `InvalidKeyError` if unknown.
+        """
+        try:
+            return self._keys[kid]
+        except (KeyError, TypeError):
+            raise InvalidKeyError(f"Unknown key id: {kid}.") from None
+
+    def candidates(self, kid: Optional[str], algorithm: Optional[str] = None) -> List[KeyMaterial]:
+        """
+        Returns the keys to try, in order, to verify a token with the given `kid` and
+        `alg` headers.
+
+        With a `kid`, only its key is returned or `InvalidKeyError` raised if unknown.
+        Without, all the keys allowing the `algorithm`, the active one first.
+        """
+        if kid is not None:
+            return [self.get(kid)]
+        return [key for key in self if algorithm is None or algorithm in key.algorithms]
+
+    def for_token(self, token: Union[str, bytes]) -> List[KeyMaterial]:
+        """
+        Returns the keys able to verify the given token, based on its `kid` and `alg`
+        headers. See `candidates()`.
+        """
+        header = jwt.get_unverified_header(token)
+        return self.candidates(header.get("kid"), header.get("alg"))
+
+    @property
+    def kids(self) -> List[str]:
+        return [key.kid for key in self if key.kid is not None]
+
+    def jwks(self) -> JWKS:
+        """
+        Returns the JWKS of the public keys of the keyring, serialized only once.
+        """
+        if self._jwks is None:
+            self._jwks = build_jwks(self)
+        return self._jwks
@@ -0,0 +1,64 @@
+from typing import Sequence, Tuple
+
+from esmerald.core.protocols.middleware import MiddlewareProtocol
+from esmerald.exceptions import NotAuthorized
+from lilya.types import ASGIApp, Receive, Scope, Send
+
+from esmerald_simple_jwt.verification import averify_scope
+
+
+class AccessTokenMiddleware(MiddlewareProtocol):
+    """
+    Verifies the bearer access token of every request, using the `SimpleJWT`
+    configuration of the application.
+
+    The claims of the token are stored in the state of the request, available as
+    `request.state.claims`.
+
+    Requests to one of the `exclude` paths or below it are not verified, for
+    instance, the signin and refresh urls. The paths are matched on whole segments,
+    excluding `/auth` excludes `/auth/signin` but not `/authz`. When `optional` is `True`, the
+    requests without token are let through without claims, but an invalid token is
+    still rejected.
+
+    **Example**
+
+    ```python
+    from esmerald import Esmerald
+    from lilya.middleware import DefineMiddleware
+
+    from esmerald_simple_jwt.middleware import AccessTokenMiddleware
+
+    app = Esmerald(
+        routes=[...],
+        middleware=[DefineMiddleware(AccessTokenMiddleware, exclude=["/auth"])],
+    )
+    ```
+    """
+
+    def __init__(self, app: ASGIApp, exclude: Sequence[str] = (), optional: bool = False) -> None:
+        self.app = app
+        self.exclude: Tuple[str, ...] = tuple(exclude)
+        self.optional = optional
+        # The excluded paths themselves and the prefixes of the paths below them.
+        self._excluded_paths = frozenset(path.rstrip("/") or "/" for path in self.exclude)
+        self._excluded_prefixes = tuple(path.rstrip("/") + "/" for path in self.exclude)
+
+    def is_excluded(self, path: str) -> bool:
+        """
+        Checks if a path is one of the `exclude` paths or below it.
+        """
+        return path in self._excluded_paths or path.startswith(self._excluded_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket") or (
+            self.exclude and self.is_excluded(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        # The claims are kept in the scope, never verified again for this request.
+        if await averify_scope(scope) is None and not self.optional:
+            raise NotAuthorized(detail="Token not found in the request header.")
+
+        await self.app(scope, receive, send)
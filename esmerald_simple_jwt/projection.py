@@ -0,0 +1,130 @@
+from enum import Enum
+from typing import Any, Callable, Dict, Mapping, Optional, Type, TypeVar, Union, overload
+
+from esmerald.exceptions import ImproperlyConfigured
+
+from esmerald_simple_jwt.token import Claims, dump_claims
+
+M = TypeVar("M")
+
+# The claims used by the package, never overridden by a projection.
+RESERVED_CLAIMS = frozenset(
+    {"exp", "iat", "nbf", "sub", "iss", "aud", "jti", "token_type", "fam", "gen", "ver"}
+)
+
+
+def to_claim(value: Any) -> Any:
+    """
+    Converts an attribute of a user into a JSON compatible claim.
+    """
+    if isinstance(value, Enum):
+        value = value.value
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [to_claim(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): to_claim(item) for key, item in value.items()}
+    return str(value)
+
+
+def get_attribute(obj: Any, path: str) -> Any:
+    """
+    Reads a dotted attribute path (`tenant.id`) from an object or a mapping.
+    """
+    for name in path.split("."):
+        if obj is None:
+            return None
+        obj = obj.get(name) if isinstance(obj, Mapping) else getattr(obj, name, None)
+    return obj
+
+
+class ClaimsProjection:
+    """
+    Embeds attributes of the user in the tokens, allowing the protected routes to read
+    them from the verified claims instead of loading the user again.
+
+    The `mapping` goes from the (short) name of the claim to the (dotted) attribute of
+    the user, for instance `{"rol": "role", "tid": "tenant.id"}`.
+
+    The projected claims are limited to `max_size` bytes once serialized, keeping the
+    tokens small.
+    """
+
+    __slots__ = ("mapping", "max_size")
+
+    def __init__(self, mapping: Mapping[str, str], max_size: int = 512) -> None:
+        reserved = RESERVED_CLAIMS.intersection(mapping)
+        if reserved:
+            raise ImproperlyConfigured(
+                f"The claims {', '.join(sorted(reserved))} are reserved and cannot be projected."
+            )
+        self.mapping = dict(mapping)
+        self.max_size = max_size
+
+    def project(self, user: Any) -> Dict[str, Any]:
+        """
+        Returns the claims projected from a user, to be added to the issued tokens.
+
+        The attributes with a `None` value are not included.
+        """
+        claims = {}
+        for claim, path in self.mapping.items():
+            value = get_attribute(user, path)
+            if value is not None:
+                claims[claim] = to_claim(value)
+
+        size = len(dump_claims(claims))
+        if size > self.max_size:
+            raise ImproperlyConfigured(
+                f"The projected claims take {size} bytes, more than the maximum of "
+                f"{self.max_size} bytes."
+            )
+        return claims
+
+    def carry(self, claims: Union[Claims, Mapping[str, Any]]) -> Dict[str, Any]:
+        """
+        Returns the projected claims of a verified token, for instance, to carry them
+        from the refresh token to the new access token.
+        """
+        return {claim: claims[claim] for claim in self.mapping if claim in claims}
+
+    @overload
+    def load(self, claims: Union[Claims, Mapping[str, Any]]) -> Dict[str, Any]:
+        ...
+
+    @overload
+    def load(self, claims: Union[Claims, Mapping[str, Any]], model: Callable[..., M]) -> M:
+        ...
+
+    def load(
+        self,
+        claims: Union[Claims, Mapping[str, Any]],
+        model: Optional[Union[Type[M], Callable[..., M]]] = None,
+    ) -> Any:
+        """
+        Reads the projected claims of a verified token back under the names of the
+        attributes of the user (the last part of the dotted paths).
+
+        When a `model` (a pydantic model, a dataclass...) is provided, it is built from
+        them, giving a typed access to the claims.
+
+        **Example**
+
+        ```python
+        class Principal(BaseModel):
+            role: str
+            id: int
+
+
+        principal = runtime.projection.load(claims, Principal)
+        ```
+        """
+        values = {
+            path.rsplit(".", 1)[-1]: claims[claim]
+            for claim, path in self.mapping.items()
+            if claim in claims
+        }
+        if model is None:
+            return values
+        return model(**values)
@@ -0,0 +1,64 @@
+from typing import Any, Optional
+
+from esmerald import Response, status
+from esmerald.utils.enums import MediaType
+
+from esmerald_simple_jwt.schemas import AccessToken, TokenAccess
+from esmerald_simple_jwt.token import TOKEN_ALPHABET
+
+# The JSON of the default schemas, split around the tokens. The fields follow the order
+# of the models, `TokenAccess` inheriting the `refresh_token` first.
+ACCESS_TOKEN_TEMPLATE = (b'{"access_token":"', b'"}')
+TOKEN_ACCESS_TEMPLATE = (b'{"refresh_token":"', b'","access_token":"', b'"}')
+
+
+def token_bytes(token: Any) -> Optional[bytes]:
+    """
+    Returns the token as bytes when it can be written in a JSON string as it is, meaning
+    it only has the characters of the compact JWT serialization.
+    """
+    if not isinstance(token, str) or not token.isascii():
+        return None
+    data = token.encode()
+    if data.translate(None, TOKEN_ALPHABET):
+        return None
+    return data
+
+
+def render_tokens(tokens: Any) -> Optional[bytes]:
+    """
+    Writes the JSON of an `AccessToken` or a `TokenAccess` (the models or their dumped
+    dictionaries) straight from the token strings, without any pydantic serialization.
+
+    Returns `None` for anything else, including subclasses of the models and tokens
+    needing to be escaped, to be serialized the regular way.
+    """
+    if type(tokens) is TokenAccess or type(tokens) is AccessToken:
+        access, refresh = tokens.access_token, getattr(tokens, "refresh_token", None)
+    elif type(tokens) is dict and tokens.keys() <= {"access_token", "refresh_token"}:
+        access, refresh = tokens.get("access_token"), tokens.get("refresh_token")
+    else:
+        return None
+
+    access_bytes = token_bytes(access)
+    if access_bytes is None:
+        return None
+    if refresh is None:
+        head, tail = ACCESS_TOKEN_TEMPLATE
+        return head + access_bytes + tail
+
+    refresh_bytes = token_bytes(refresh)
+    if refresh_bytes is None:
+        return None
+    head, middle, tail = TOKEN_ACCESS_TEMPLATE
+    return b"".join((head, refresh_bytes, middle, access_bytes, tail))
+
+
+def token_response(tokens: Any) -> Optional[Response]:
+    """
+    Returns a response with the JSON of the `render_tokens()`, if possible.
+    """
+    body = render_tokens(tokens)
+    if body is None:
+        return None
+    return Response(body, media_type=MediaType.JSON, status_code=status.HTTP_200_OK)
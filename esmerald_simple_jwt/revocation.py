@@ -0,0 +1,785 @@
+import hashlib
+import heapq
+import math
+import sqlite3
+import time
+from abc import ABC
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Protocol, Tuple, Union
+
+from anyio import Lock as AsyncLock
+from anyio import to_thread
+from esmerald.exceptions import ImproperlyConfigured
+
+# The longest a token revoked by another process can be missed by the Bloom filter.
+MAX_SYNC_INTERVAL = 60.0
+
+
+def to_timestamp(value: Union[datetime, float, int]) -> float:
+    """
+    Converts the expiry of a token (usually the `exp` claim) into a unix timestamp.
+    """
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+class RevocationStore(ABC):  # noqa: B024
+    """
+    Base for all revocation stores.
+
+    A revocation store keeps the `jti` of the revoked tokens until the tokens expire,
+    after that there is no point keeping them since an expired token is rejected
+    anyway.
+    """
+
+    async def revoke(self, jti: str, expires_at: Union[datetime, float]) -> None:
+        raise NotImplementedError("All revocation stores must implement the `revoke()` method.")
+
+    async def is_revoked(self, jti: str) -> bool:
+        raise NotImplementedError(
+            "All revocation stores must implement the `is_revoked()` method."
+        )
+
+    async def entries(self, since: float = 0) -> List[Tuple[str, float]]:
+        """
+        Returns the `(jti, expires_at)` of the tokens revoked after `since` (a unix
+        timestamp) that did not expire yet.
+
+        Optional, used to populate the `BloomFilterRevocationStore`.
+        """
+        raise NotImplementedError("This revocation store does not support listing the entries.")
+
+
+class InMemoryRevocationStore(RevocationStore):
+    """
+    Revocation store kept in the memory of the process.
+
+    The entries are evicted once the tokens expire. Useful for a single process
+    deployment or for the tests.
+    """
+
+    def __init__(self) -> None:
+        # jti -> (expires_at, revoked_at)
+        self._revoked: Dict[str, Tuple[float, float]] = {}
+        self._expiries: List[Tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def evict(self, now: Optional[float] = None) -> None:
+        """
+        Removes the entries of the tokens that already expired.
+        """
+        if now is None:
+            now = time.time()
+
+        while self._expiries and self._expiries[0][0] <= now:
+            expires_at, jti = heapq.heappop(self._expiries)
+            entry = self._revoked.get(jti)
+            if entry is not None and entry[0] == expires_at:
+                del self._revoked[jti]
+
+    async def revoke(self, jti: str, expires_at: Union[datetime, float]) -> None:
+        timestamp = to_timestamp(expires_at)
+        self.evict()
+        self._revoked[jti] = (timestamp, time.time())
+        heapq.heappush(self._expiries, (timestamp, jti))
+
+    async def is_revoked(self, jti: str) -> bool:
+        entry = self._revoked.get(jti)
+        return entry is not None and entry[0] > time.time()
+
+    async def entries(self, since: float = 0) -> List[Tuple[str, float]]:
+        now = time.time()
+        return [
+            (jti, expires_at)
+            for jti, (expires_at, revoked_at) in self._revoked.items()
+            if revoked_at >= since and expires_at > now
+        ]
+
+
+class SQLiteRevocationStore(RevocationStore):
+    """
+    Revocation store persisted in a SQLite database.
+
+    The queries run in a worker thread to not block the event loop.
+    """
+
+    def __init__(self, path: str = "revoked_tokens.sqlite", table: str = "revoked_tokens") -> None:
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}.")
+
+        self.table = table
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "(jti TEXT PRIMARY KEY, expires_at REAL NOT NULL, revoked_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+
+    def _revoke(self, jti: str, expires_at: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO {self.table} (jti, expires_at, revoked_at) VALUES (?, ?, ?)",
+                (jti, expires_at, now),
+            )
+            self._connection.commit()
+
+    def _is_revoked(self, jti: str) -> bool:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT 1 FROM {self.table} WHERE jti = ? AND expires_at > ?",
+                (jti, time.time()),
+            ).fetchone()
+        return row is not None
+
+    def _entries(self, since: float) -> List[Tuple[str, float]]:
+        with self._lock:
+            return self._connection.execute(
+                f"SELECT jti, expires_at FROM {self.table} WHERE revoked_at >= ? AND expires_at > ?",
+                (since, time.time()),
+            ).fetchall()
+
+    async def revoke(self, jti: str, expires_at: Union[datetime, float]) -> None:
+        await to_thread.run_sync(self._revoke, jti, to_timestamp(expires_at))
+
+    async def is_revoked(self, jti: str) -> bool:
+        return await to_thread.run_sync(self._is_revoked, jti)
+
+    async def entries(self, since: float = 0) -> List[Tuple[str, float]]:
+        return await to_thread.run_sync(self._entries, since)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class RedisClient(Protocol):
+    """
+    The subset of an asynchronous Redis client (for instance `redis.asyncio.Redis`)
+    used by the `RedisRevocationStore`.
+    """
+
+    async def set(self, name: str, value: Any, ex: Optional[int] = None) -> Any:
+        ...
+
+    async def exists(self, *names: str) -> int:
+        ...
+
+
+class RedisRevocationStore(RevocationStore):
+    """
+    Revocation store using Redis (or any server speaking the Redis protocol).
+
+    The entries are created with a TTL matching the expiry of the tokens, meaning
+    Redis takes care of the eviction.
+    """
+
+    def __init__(self, client: RedisClient, prefix: str = "simple-jwt:revoked:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    async def revoke(self, jti: str, expires_at: Union[datetime, float]) -> None:
+        ttl = int(to_timestamp(expires_at) - time.time()) + 1
+        if ttl <= 0:
+            return
+        await self.client.set(f"{self.prefix}{jti}", 1, ex=ttl)
+
+    async def is_revoked(self, jti: str) -> bool:
+        return bool(await self.client.exists(f"{self.prefix}{jti}"))
+
+
+class CachedRevocationStore(RevocationStore):
+    """
+    Caches, in process, the results of another revocation store for a short `ttl`.
+
+    Both the positive and negative results are cached meaning most of the checks never
+    reach the store. A token revoked via another process may still be accepted by this
+    one for up to `ttl` seconds.
+    """
+
+    def __init__(self, store: RevocationStore, ttl: float = 5.0, maxsize: int = 10_000) -> None:
+        self.store = store
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._cache: Dict[str, Tuple[bool, float]] = {}
+
+    def _set(self, jti: str, revoked: bool, until: float) -> None:
+        if jti not in self._cache and len(self._cache) >= self.maxsize:
+            # Drops the oldest entry.
+            del self._cache[next(iter(self._cache))]
+        self._cache[jti] = (revoked, until)
+
+    async def revoke(self, jti: str, expires_at: Union[datetime, float]) -> None:
+        timestamp = to_timestamp(expires_at)
+        await self.store.revoke(jti, timestamp)
+        # A revoked token stays revoked until it expires.
+        self._set(jti, True, time.monotonic() + max(timestamp - time.time(), 0))
+
+    async def is_revoked(self, jti: str) -> bool:
+        now = time.monotonic()
+        entry = self._cache.get(jti)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+        revoked = await self.store.is_revoked(jti)
+        self._set(jti, revoked, now + self.ttl)
+        return revoked
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+class CountingBloomFilter:
+    """
+    A Bloom filter with counters instead of bits, allowing the entries to be removed.
+
+    The filter is sized for a `capacity` and a false positive rate `fp_rate`. Each counter
+    takes one byte.
+    """
+
+    __slots__ = ("capacity", "fp_rate", "size", "hashes", "_counters", "_count")
+
+    def __init__(self, capacity: int, fp_rate: float) -> None:
+        if capacity <= 0:
+            raise ValueError("The capacity must be a positive number.")
+        if not 0 < fp_rate < 1:
+            raise ValueError("The false positive rate must be between 0 and 1.")
+
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.size = max(8, math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._counters = bytearray(self.size)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, item: str) -> bool:
+        counters = self._counters
+        return all(counters[index] for index in self._indexes(item))
+
+    @property
+    def memory(self) -> int:
+        """
+        The memory used by the counters, in bytes.
+        """
+        return len(self._counters)
+
+    def _indexes(self, item: str) -> Iterator[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        size = self.size
+        for i in range(self.hashes):
+            yield (first + i * second) % size
+
+    def add(self, item: str) -> None:
+        counters = self._counters
+        for index in self._indexes(item):
+            if counters[index] < 255:
+                counters[index] += 1
+        self._count += 1
+
+    def remove(self, item: str) -> None:
+        counters = self._counters
+        for index in self._indexes(item):
+            # A saturated counter can't be decremented safely.
+            if 0 < counters[index] < 255:
+                counters[index] -= 1
+        self._count -= 1
+
+
+class BloomFilterRevocationStore(RevocationStore):
+    """
+    Puts a `CountingBloomFilter` in front of another revocation store.
+
+    Most of the tokens are never revoked and for those the filter answers, with
+    certainty, that the token is not revoked without reaching the store. Only when the
+    filter says that the token *may* be revoked, the store is consulted.
+
+    The filter is populated with the tokens revoked via this object and with the tokens
+    revoked by other processes, read from the `entries()` of the store every
+    `sync_interval` seconds (`0` meaning before every check, at most `60`). The entries
+    are removed from the filter when the tokens expire.
+
+    !!! Warning
+        A token revoked by another process can still be accepted for up to the
+        `sync_interval`.
+
+    With a store not implementing `entries()` (like the `RedisRevocationStore`), the
+    filter cannot know the tokens revoked by other processes and is bypassed, every
+    check reaching the store.
+
+    When the number of entries goes over the `capacity`, the filter is rebuilt with
+    twice the capacity to keep the false positive rate.
+    """
+
+    def __init__(
+        self,
+        store: RevocationStore,
+        capacity: int = 100_000,
+        fp_rate: float = 0.001,
+        sync_interval: float = 5.0,
+        source: Optional[RevocationStore] = None,
+    ) -> None:
+        if not 0 <= sync_interval <= MAX_SYNC_INTERVAL:
+            raise ImproperlyConfigured(
+                f"The `sync_interval` of the Bloom filter must be between 0 and "
+                f"{MAX_SYNC_INTERVAL:g} seconds, got {sync_interval}."
+            )
+
+        self.store = store
+        self.source = source or store
+        self.sync_interval = sync_interval
+        self.filter = CountingBloomFilter(capacity, fp_rate)
+        self.hits = 0
+        self.misses = 0
+        self.false_positives = 0
+        self._entries: Dict[str, float] = {}
+        self._expiries: List[Tuple[float, str]] = []
+        self._synced_at: Optional[float] = None
+        self._sync_lock = AsyncLock()
+        self._can_sync = True
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        The statistics of the filter.
+
+        * `hits` - The checks answered by the filter without reaching the store.
+        * `misses` - The checks where the store had to be consulted.
+        * `false_positives` - The misses where the token was not revoked after all.
+        * `bypassed` - If the store does not implement `entries()` and every check
+        reaches it.
+        """
+        return {
+            "entries": len(self._entries),
+            "capacity": self.filter.capacity,
+            "fp_rate": self.filter.fp_rate,
+            "memory": self.filter.memory,
+            "hits": self.hits,
+            "misses": self.misses,
+            "false_positives": self.false_positives,
+            "bypassed": not self._can_sync,
+        }
+
+    def _add(self, jti: str, expires_at: float) -> None:
+        if jti in self._entries:
+            return
+
+        if len(self._entries) >= self.filter.capacity:
+            self._rebuild(self.filter.capacity * 2)
+
+        self._entries[jti] = expires_at
+        self.filter.add(jti)
+        heapq.heappush(self._expiries, (expires_at, jti))
+
+    def _rebuild(self, capacity: int) -> None:
+        self.filter = CountingBloomFilter(capacity, self.filter.fp_rate)
+        for jti in self._entries:
+            self.filter.add(jti)
+
+    def evict(self, now: Optional[float] = None) -> None:
+        """
+        Removes the entries of the tokens that already expired from the filter.
+        """
+        if now is None:
+            now = time.time()
+
+        while self._expiries and self._expiries[0][0] <= now:
+            expires_at, jti = heapq.heappop(self._expiries)
+            if self._entries.get(jti) == expires_at:
+                del self._entries[jti]
+                self.filter.remove(jti)
+
+    async def sync(self) -> None:
+        """
+        Adds the entries revoked since the last synchronisation to the filter.
+        """
+        now = time.time()
+        # A small overlap covers the clock differences, duplicates are ignored.
+        since = 0.0 if self._synced_at is None else self._synced_at - 1
+
+        try:
+            entries = await self.source.entries(since=since)
+        except NotImplementedError:
+            self._can_sync = False
+            return
+
+        for jti, expires_at in entries:
+            self._add(jti, expires_at)
+        self._synced_at = now
+
+    def _needs_sync(self, now: float) -> bool:
+        return self._can_sync and (
+            self._synced_at is None or now - self._synced_at >= self.sync_interval
+        )
+
+    async def revoke(self, jti: str, expires_at: Union[datetime, float]) -> None:
+        timestamp = to_timestamp(expires_at)
+        await self.store.revoke(jti, timestamp)
+        self._add(jti, timestamp)
+
+    async def is_revoked(self, jti: str) -> bool:
+        now = time.time()
+        if self._needs_sync(now):
+            async with self._sync_lock:
+                # Other checks wait for the synchronisation instead of trusting a
+                # partially populated filter.
+                if self._needs_sync(now):
+                    await self.sync()
+        self.evict(now)
+
+        if not self._can_sync:
+            # The filter does not know the tokens revoked by other processes, trusting
+            # it would accept them.
+            self.misses += 1
+            return await self.store.is_revoked(jti)
+
+        if jti not in self.filter:
+            self.hits += 1
+            return False
+
+        self.misses += 1
+        revoked = await self.store.is_revoked(jti)
+        if not revoked:
+            self.false_positives += 1
+        return revoked
+
+
+class TokenFamilyStore(ABC):  # noqa: B024
+    """
+    Base for all the stores of refresh token families, used when rotating the refresh
+    tokens.
+
+    All the refresh tokens issued from the same sign-in belong to the same family and
+    each refresh creates a new generation. Only a compact record is kept per family:
+    the current generation, if the family was revoked and when the family expires.
+    """
+
+    async def advance(
+        self, family: str, generation: int, expires_at: Union[datetime, float]
+    ) -> bool:
+        """
+        Moves the family to the next generation if the `generation` is the current one.
+
+        When an older generation is presented, the token was reused and the whole family
+        is revoked. Returns `False` if the family was (or got) revoked.
+        """
+        raise NotImplementedError("All token family stores must implement the `advance()` method.")
+
+    async def revoke(self, family: str, expires_at: Union[datetime, float]) -> None:
+        """
+        Revokes the whole family. The record is kept until the latest of `expires_at`
+        and the expiry already known for the family.
+        """
+        raise NotImplementedError("All token family stores must implement the `revoke()` method.")
+
+
+class InMemoryTokenFamilyStore(TokenFamilyStore):
+    """
+    Token family store kept in the memory of the process.
+    """
+
+    def __init__(self) -> None:
+        # family -> (generation, revoked, expires_at)
+        self._families: Dict[str, Tuple[int, bool, float]] = {}
+        self._expiries: List[Tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._families)
+
+    def evict(self, now: Optional[float] = None) -> None:
+        """
+        Removes the families whose tokens already expired.
+        """
+        if now is None:
+            now = time.time()
+
+        while self._expiries and self._expiries[0][0] <= now:
+            expires_at, family = heapq.heappop(self._expiries)
+            record = self._families.get(family)
+            if record is not None and record[2] <= expires_at:
+                del self._families[family]
+
+    def _set(self, family: str, generation: int, revoked: bool, expires_at: float) -> None:
+        self._families[family] = (generation, revoked, expires_at)
+        heapq.heappush(self._expiries, (expires_at, family))
+
+    async def advance(
+        self, family: str, generation: int, expires_at: Union[datetime, float]
+    ) -> bool:
+        self.evict()
+        timestamp = to_timestamp(expires_at)
+        record = self._families.get(family)
+
+        if record is None:
+            self._set(family, generation + 1, False, timestamp)
+            return True
+
+        current, revoked, family_expires_at = record
+        if revoked:
+            return False
+        if current != generation:
+            self._set(family, current, True, family_expires_at)
+            return False
+
+        self._set(family, generation + 1, False, max(timestamp, family_expires_at))
+        return True
+
+    async def revoke(self, family: str, expires_at: Union[datetime, float]) -> None:
+        timestamp = to_timestamp(expires_at)
+        record = self._families.get(family)
+        if record is None:
+            self._set(family, 0, True, timestamp)
+        else:
+            self._set(family, record[0], True, max(timestamp, record[2]))
+
+
+class SQLiteTokenFamilyStore(TokenFamilyStore):
+    """
+    Token family store persisted in a SQLite database.
+
+    The queries run in a worker thread to not block the event loop.
+    """
+
+    def __init__(self, path: str = "token_families.sqlite", table: str = "token_families") -> None:
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}.")
+
+        self.table = table
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (family TEXT PRIMARY KEY, "
+            "generation INTEGER NOT NULL, revoked INTEGER NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+
+    def _advance(self, family: str, generation: int, expires_at: float) -> bool:
+        with self._lock:
+            self._connection.execute(
+                f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),)
+            )
+            row = self._connection.execute(
+                f"SELECT generation, revoked FROM {self.table} WHERE family = ?", (family,)
+            ).fetchone()
+
+            if row is None:
+                self._connection.execute(
+                    f"INSERT INTO {self.table} (family, generation, revoked, expires_at) "
+                    "VALUES (?, ?, 0, ?)",
+                    (family, generation + 1, expires_at),
+                )
+                advanced = True
+            elif row[1]:
+                advanced = False
+            elif row[0] != generation:
+                self._connection.execute(
+                    f"UPDATE {self.table} SET revoked = 1 WHERE family = ?", (family,)
+                )
+                advanced = False
+            else:
+                self._connection.execute(
+                    f"UPDATE {self.table} SET generation = ?, expires_at = MAX(expires_at, ?) "
+                    "WHERE family = ?",
+                    (generation + 1, expires_at, family),
+                )
+                advanced = True
+
+            self._connection.commit()
+            return advanced
+
+    def _revoke(self, family: str, expires_at: float) -> None:
+        with self._lock:
+            self._connection.execute(
+                f"INSERT INTO {self.table} (family, generation, revoked, expires_at) "
+                "VALUES (?, 0, 1, ?) ON CONFLICT(family) DO UPDATE SET revoked = 1, "
+                "expires_at = MAX(expires_at, excluded.expires_at)",
+                (family, expires_at),
+            )
+            self._connection.commit()
+
+    async def advance(
+        self, family: str, generation: int, expires_at: Union[datetime, float]
+    ) -> bool:
+        return await to_thread.run_sync(
+            self._advance, family, generation, to_timestamp(expires_at)
+        )
+
+    async def revoke(self, family: str, expires_at: Union[datetime, float]) -> None:
+        await to_thread.run_sync(self._revoke, family, to_timestamp(expires_at))
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class TokenVersionStore(ABC):  # noqa: B024
+    """
+    Base for all the stores of the token versions of the users.
+
+    Every user has an integer version, `0` until bumped, stamped in the `ver` claim of
+    the issued tokens. Bumping the version invalidates all the refresh tokens of the
+    user at once, whatever the number of sessions.
+    """
+
+    async def get(self, sub: str) -> int:
+        """
+        Returns the current token version of the user.
+        """
+        raise NotImplementedError("All token version stores must implement the `get()` method.")
+
+    async def bump(self, sub: str) -> int:
+        """
+        Increments the token version of the user and returns the new one.
+        """
+        raise NotImplementedError("All token version stores must implement the `bump()` method.")
+
+
+class InMemoryTokenVersionStore(TokenVersionStore):
+    """
+    Token version store kept in the memory of the process.
+
+    Only the users whose version was bumped take an entry.
+    """
+
+    def __init__(self) -> None:
+        self._versions: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._versions)
+
+    async def get(self, sub: str) -> int:
+        return self._versions.get(sub, 0)
+
+    async def bump(self, sub: str) -> int:
+        version = self._versions[sub] = self._versions.get(sub, 0) + 1
+        return version
+
+
+class SQLiteTokenVersionStore(TokenVersionStore):
+    """
+    Token version store persisted in a SQLite database.
+
+    The queries run in a worker thread to not block the event loop.
+    """
+
+    def __init__(self, path: str = "token_versions.sqlite", table: str = "token_versions") -> None:
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}.")
+
+        self.table = table
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (sub TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+        )
+        self._connection.commit()
+
+    def _get(self, sub: str) -> int:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT version FROM {self.table} WHERE sub = ?", (sub,)
+            ).fetchone()
+        return row[0] if row is not None else 0
+
+    def _bump(self, sub: str) -> int:
+        with self._lock:
+            self._connection.execute(
+                f"INSERT INTO {self.table} (sub, version) VALUES (?, 1) "
+                "ON CONFLICT(sub) DO UPDATE SET version = version + 1",
+                (sub,),
+            )
+            self._connection.commit()
+            row = self._connection.execute(
+                f"SELECT version FROM {self.table} WHERE sub = ?", (sub,)
+            ).fetchone()
+        return int(row[0])
+
+    async def get(self, sub: str) -> int:
+        return await to_thread.run_sync(self._get, sub)
+
+    async def bump(self, sub: str) -> int:
+        return await to_thread.run_sync(self._bump, sub)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class RedisCounterClient(Protocol):
+    """
+    The subset of an asynchronous Redis client (for instance `redis.asyncio.Redis`)
+    used by the `RedisTokenVersionStore`.
+    """
+
+    async def get(self, name: str) -> Any:
+        ...
+
+    async def incr(self, name: str, amount: int = 1) -> int:
+        ...
+
+
+class RedisTokenVersionStore(TokenVersionStore):
+    """
+    Token version store using Redis (or any server speaking the Redis protocol).
+
+    The versions are bumped atomically with `INCR` and never expire.
+    """
+
+    def __init__(self, client: RedisCounterClient, prefix: str = "simple-jwt:version:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, sub: str) -> int:
+        version = await self.client.get(f"{self.prefix}{sub}")
+        return int(version) if version is not None else 0
+
+    async def bump(self, sub: str) -> int:
+        return int(await self.client.incr(f"{self.prefix}{sub}"))
+
+
+class CachedTokenVersionStore(TokenVersionStore):
+    """
+    Caches, in process, the versions of another token version store for a short `ttl`.
+
+    Most of the refreshes never reach the store. A version bumped via another process
+    may still be accepted by this one for up to `ttl` seconds.
+    """
+
+    def __init__(self, store: TokenVersionStore, ttl: float = 5.0, maxsize: int = 10_000) -> None:
+        self.store = store
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._cache: Dict[str, Tuple[int, float]] = {}
+
+    def _set(self, sub: str, version: int, until: float) -> None:
+        if sub not in self._cache and len(self._cache) >= self.maxsize:
+            # Drops the oldest entry.
+            del self._cache[next(iter(self._cache))]
+        self._cache[sub] = (version, until)
+
+    async def get(self, sub: str) -> int:
+        now = time.monotonic()
+        entry = self._cache.get(sub)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+        version = await self.store.get(sub)
+        self._set(sub, version, now + self.ttl)
+        return version
+
+    async def bump(self, sub: str) -> int:
+        version = await self.store.bump(sub)
+        self._set(sub, version, time.monotonic() + self.ttl)
+        return version
+
+    def clear(self) -> None:
+        self._cache.clear()
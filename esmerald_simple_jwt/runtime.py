@@ -0,0 +1,204 @@
+from dataclasses import dataclass
+from datetime import timedelta
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type, Union
+
+from esmerald.conf import monkay
+from esmerald.exceptions import ImproperlyConfigured
+
+from esmerald_simple_jwt.keys import KeyRing
+from esmerald_simple_jwt.projection import ClaimsProjection
+from esmerald_simple_jwt.schemas import AccessToken, TokenAccess
+from esmerald_simple_jwt.services import RuntimeServices
+
+if TYPE_CHECKING:
+    from esmerald_simple_jwt.backends import BaseBackendAuthentication, BaseRefreshAuthentication
+    from esmerald_simple_jwt.config import SimpleJWT
+
+
+def to_timedelta(value: Any, name: str) -> timedelta:
+    """
+    Normalises a lifetime coming from the `SimpleJWT` configuration into a `timedelta`.
+
+    Numbers are interpreted as seconds.
+    """
+    if isinstance(value, timedelta):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return timedelta(seconds=value)
+    raise ImproperlyConfigured(
+        f"`{name}` must be a timedelta or a number of seconds, got {type(value).__name__}."
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class RuntimeConfig:
+    """
+    An immutable, pre-resolved view of a `SimpleJWT` configuration.
+
+    The `SimpleJWT` object is a pydantic model that can be (and often is) exposed as a
+    settings property, meaning every `settings.simple_jwt.<field>` may build a brand new
+    model. The `RuntimeConfig` resolves all the values used by the views and backends
+    once and keeps them as plain attributes.
+
+    The stateful objects (the stores, the executors and the caches) are not part of the
+    configuration, they live in the `services`, carried over when the configuration is
+    rebuilt.
+
+    **Example**
+
+    ```python
+    from esmerald_simple_jwt.runtime import get_runtime_config
+
+    runtime = get_runtime_config()
+    runtime.signing_key
+    runtime.access_token_lifetime
+    runtime.services.revocation
+    ```
+    """
+
+    config: "SimpleJWT"
+    keyring: KeyRing
+    signing_key: Any
+    verifying_key: Any
+    key_id: Optional[str]
+    headers: Optional[Dict[str, str]]
+    fast_responses: bool
+    algorithm: str
+    algorithms: List[str]
+    leeway: Union[str, int]
+    access_token_lifetime: timedelta
+    refresh_token_lifetime: timedelta
+    access_token_name: str
+    refresh_token_name: str
+    backend_authentication: Type["BaseBackendAuthentication"]
+    backend_refresh: Type["BaseRefreshAuthentication"]
+    jwks_cache_control: str
+    rotate_refresh_tokens: bool
+    projection: Optional[ClaimsProjection]
+    services: RuntimeServices
+
+    @classmethod
+    def from_config(
+        cls, config: "SimpleJWT", previous: Optional[RuntimeServices] = None
+    ) -> "RuntimeConfig":
+        """
+        Builds the runtime configuration from a `SimpleJWT` instance.
+
+        The keys are parsed once, meaning the `signing_key` and `verifying_key` are the
+        objects expected by PyJWT (the raw secret for HMAC or the `cryptography` keys).
+
+        The services of a `previous` build are carried over when their configuration
+        did not change.
+        """
+        keyring = config.load_keyring()
+        keys = keyring.active
+
+        return cls(
+            config=config,
+            keyring=keyring,
+            signing_key=keys.signing_key,
+            verifying_key=keys.verifying_key,
+            key_id=keys.kid,
+            headers=keys.headers,
+            algorithm=config.algorithm,
+            algorithms=[config.algorithm],
+            leeway=config.leeway,
+            access_token_lifetime=to_timedelta(
+                config.access_token_lifetime, "access_token_lifetime"
+            ),
+            refresh_token_lifetime=to_timedelta(
+                config.refresh_token_lifetime, "refresh_token_lifetime"
+            ),
+            access_token_name=config.access_token_name,
+            refresh_token_name=config.refresh_token_name,
+            backend_authentication=config.backend_authentication,
+            backend_refresh=config.backend_refresh,
+            jwks_cache_control=f"public, max-age={config.jwks_max_age}",
+            rotate_refresh_tokens=config.rotate_refresh_tokens,
+            # The template only knows the default schemas.
+            fast_responses=(
+                config.fast_responses
+                and config.access_token_model is AccessToken
+                and config.token_model is TokenAccess
+            ),
+            projection=(
+                ClaimsProjection(
+                    config.claims_projection, max_size=config.claims_projection_max_size
+                )
+                if config.claims_projection
+                else None
+            ),
+            services=RuntimeServices.from_config(config, keyring, previous=previous),
+        )
+
+
+# Maps the id of a settings object to the settings object itself (to keep the id stable)
+# and the runtime configuration built from it.
+_registry: Dict[int, Tuple[Any, RuntimeConfig]] = {}
+_lock = Lock()
+
+
+def resolve_settings(app_settings: Any = None) -> Any:
+    """
+    Returns the given settings or, when none are provided, the settings currently
+    active for the application.
+
+    The settings are typed as `Any`, the `simple_jwt` being declared by the settings
+    of the application and not by the `EsmeraldSettings`.
+    """
+    return monkay.settings if app_settings is None else app_settings
+
+
+def build_runtime_config(app_settings: Any = None) -> RuntimeConfig:
+    """
+    Builds (or rebuilds) the runtime configuration for the given settings.
+
+    When no settings are provided, the settings currently active for the application
+    are used.
+
+    This is called automatically by the `SimpleJWTExtension` and when the
+    `esmerald_simple_jwt.urls` are included but it can also be called on purpose, for
+    instance, after reloading the settings in the tests.
+
+    When rebuilt, the services of the previous runtime configuration (the revoked
+    tokens, the token families, the caches...) are carried over unless their
+    configuration changed.
+    """
+    app_settings = resolve_settings(app_settings)
+    with _lock:
+        entry = _registry.get(id(app_settings))
+    previous = entry[1].services if entry is not None and entry[0] is app_settings else None
+
+    runtime = RuntimeConfig.from_config(app_settings.simple_jwt, previous=previous)
+    with _lock:
+        _registry[id(app_settings)] = (app_settings, runtime)
+    return runtime
+
+
+def get_runtime_config(app_settings: Any = None) -> RuntimeConfig:
+    """
+    Returns the runtime configuration for the given settings, building it only
+    the first time.
+
+    When no settings are provided, the settings currently active for the application
+    are used.
+    """
+    app_settings = resolve_settings(app_settings)
+    entry = _registry.get(id(app_settings))
+    if entry is not None and entry[0] is app_settings:
+        return entry[1]
+    return build_runtime_config(app_settings)
+
+
+def clear_runtime_configs() -> None:
+    """
+    Discards all the runtime configurations built so far, shutting down their services.
+    The next call to `get_runtime_config()` builds them again from the settings.
+    """
+    with _lock:
+        entries = list(_registry.values())
+        _registry.clear()
+
+    for _, runtime in entries:
+        runtime.services.shutdown()
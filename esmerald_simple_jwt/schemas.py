@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from pydantic import BaseModel, EmailStr
 
 
@@ -88,3 +90,31 @@ class LoginUserIn(BaseModel):
 
     username: str
     password: str
+
+
+class IntrospectionIn(BaseModel):
+    """
+    The representation of the form of the introspection endpoint, as described by the
+    RFC 7662 and sent as `application/x-www-form-urlencoded`.
+
+    ```
+    token=...&token_type_hint=...
+    ```
+    """
+
+    token: str
+    token_type_hint: Optional[str] = None
+
+
+class IntrospectionBatchIn(BaseModel):
+    """
+    The representation of the payload of the batch introspection endpoint.
+
+    ```python
+    {
+        "tokens": [...]
+    }
+    ```
+    """
+
+    tokens: List[str]
@@ -0,0 +1,348 @@
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from esmerald_simple_jwt.admission import AdmissionControl, DelayController
+from esmerald_simple_jwt.crypto import CryptoExecutor
+from esmerald_simple_jwt.hashing import HashingExecutor
+from esmerald_simple_jwt.revocation import (
+    BloomFilterRevocationStore,
+    CachedRevocationStore,
+    CachedTokenVersionStore,
+    InMemoryTokenFamilyStore,
+    RevocationStore,
+    TokenFamilyStore,
+    TokenVersionStore,
+)
+from esmerald_simple_jwt.singleflight import SingleFlight
+from esmerald_simple_jwt.throttling import InMemoryThrottleStore, LoginThrottle
+from esmerald_simple_jwt.token import TokenDecoder, TokenEncoder, VerifiedTokenCache
+
+if TYPE_CHECKING:
+    from esmerald_simple_jwt.config import SimpleJWT
+    from esmerald_simple_jwt.keys import KeyRing
+
+T = TypeVar("T")
+
+
+class RuntimeServices:
+    """
+    The long-lived services of a `SimpleJWT` configuration: the stores, the executors
+    and the caches used by the views and backends.
+
+    Unlike the values of the `RuntimeConfig`, the services hold state (the revoked
+    tokens, the token families, the cached results, the worker processes...) that must
+    not be lost when the runtime configuration is rebuilt. When built from the services
+    of a previous build, every service whose configuration did not change is carried
+    over as it is, the others are built again and the executors no longer used are
+    shut down.
+
+    The `SimpleJWTExtension` prepares the services with `startup()` when the application
+    starts and shuts them down with `shutdown()` when it stops, as
+    `clear_runtime_configs()` does.
+
+    **Example**
+
+    ```python
+    from esmerald_simple_jwt.runtime import get_runtime_config
+
+    services = get_runtime_config().services
+    services.revocation
+    services.encoder
+    ```
+    """
+
+    __slots__ = (
+        "encoder",
+        "decoder",
+        "crypto",
+        "verified_token_cache",
+        "introspection_cache",
+        "revocation",
+        "token_families",
+        "token_versions",
+        "refresh_flight",
+        "hashing",
+        "admission",
+        "throttle",
+        "_entries",
+    )
+
+    def __init__(self) -> None:
+        self.encoder: TokenEncoder
+        self.decoder: TokenDecoder
+        self.crypto: Optional[CryptoExecutor] = None
+        self.verified_token_cache: Optional[VerifiedTokenCache] = None
+        self.introspection_cache: Optional[VerifiedTokenCache] = None
+        self.revocation: Optional[RevocationStore] = None
+        self.token_families: Optional[TokenFamilyStore] = None
+        self.token_versions: Optional[TokenVersionStore] = None
+        self.refresh_flight: Optional[SingleFlight] = None
+        self.hashing: HashingExecutor
+        self.admission: Optional[AdmissionControl] = None
+        self.throttle: Optional[LoginThrottle] = None
+        # Maps the name of a service to the configuration it was built from and itself.
+        self._entries: Dict[str, Tuple[Tuple[Any, ...], Any]] = {}
+
+    def _reuse(
+        self,
+        previous: Optional["RuntimeServices"],
+        name: str,
+        spec: Tuple[Any, ...],
+        build: Callable[[], T],
+    ) -> T:
+        """
+        Returns the service of the previous build when built from the same `spec`,
+        otherwise builds it.
+        """
+        if previous is not None:
+            entry = previous._entries.get(name)
+            if entry is not None and entry[0] == spec:
+                self._entries[name] = entry
+                return entry[1]  # type: ignore[no-any-return]
+
+        value = build()
+        self._entries[name] = (spec, value)
+        return value
+
+    @classmethod
+    def from_config(
+        cls,
+        config: "SimpleJWT",
+        keyring: "KeyRing",
+        previous: Optional["RuntimeServices"] = None,
+    ) -> "RuntimeServices":
+        """
+        Builds the services of a `SimpleJWT` configuration, carrying over the services
+        of the `previous` build whose configuration did not change.
+        """
+        services = cls()
+
+        services.crypto = services._reuse(
+            previous,
+            "crypto",
+            (config.crypto_executor, config.crypto_workers, config.crypto_max_batch, *keyring),
+            lambda: (
+                CryptoExecutor(
+                    keyring,
+                    kind=config.crypto_executor,
+                    workers=config.crypto_workers,
+                    max_batch=config.crypto_max_batch,
+                )
+                if config.crypto_executor is not None
+                else None
+            ),
+        )
+
+        services.verified_token_cache = services._reuse(
+            previous,
+            "verified_token_cache",
+            (
+                config.verified_token_cache,
+                config.verified_token_cache_size,
+                config.verified_token_cache_ttl,
+            ),
+            lambda: (
+                VerifiedTokenCache(
+                    maxsize=config.verified_token_cache_size,
+                    ttl=config.verified_token_cache_ttl,
+                )
+                if config.verified_token_cache
+                else None
+            ),
+        )
+
+        services.introspection_cache = services._reuse(
+            previous,
+            "introspection_cache",
+            (config.introspection_cache_ttl, config.introspection_cache_size),
+            lambda: (
+                VerifiedTokenCache(
+                    maxsize=config.introspection_cache_size, ttl=config.introspection_cache_ttl
+                )
+                if config.introspection_cache_ttl > 0
+                else None
+            ),
+        )
+        if services.introspection_cache is not None:
+            # The results are discarded when the keys change.
+            services.introspection_cache.bind(keyring)
+
+        active = keyring.active
+        services.encoder = TokenEncoder(
+            active.signing_key, active.algorithm, kid=active.kid, executor=services.crypto
+        )
+        services.decoder = TokenDecoder(
+            keyring,
+            executor=services.crypto,
+            leeway=config.leeway,
+            max_length=config.token_max_length,
+            cache=services.verified_token_cache,
+        )
+
+        services.revocation = services._reuse(
+            previous,
+            "revocation",
+            (
+                config.revocation_store,
+                config.revocation_cache_ttl,
+                config.revocation_filter,
+                config.revocation_filter_capacity,
+                config.revocation_filter_fp_rate,
+                config.revocation_filter_sync_interval,
+            ),
+            lambda: build_revocation(config),
+        )
+
+        # The default in-memory store is carried over, with the families it knows.
+        services.token_families = services._reuse(
+            previous,
+            "token_families",
+            (config.token_family_store, config.rotate_refresh_tokens),
+            lambda: (
+                InMemoryTokenFamilyStore()
+                if config.token_family_store is None and config.rotate_refresh_tokens
+                else config.token_family_store
+            ),
+        )
+
+        services.token_versions = services._reuse(
+            previous,
+            "token_versions",
+            (config.token_version_store, config.token_version_cache_ttl),
+            lambda: (
+                CachedTokenVersionStore(
+                    config.token_version_store, ttl=config.token_version_cache_ttl
+                )
+                if config.token_version_store is not None and config.token_version_cache_ttl > 0
+                else config.token_version_store
+            ),
+        )
+
+        services.refresh_flight = services._reuse(
+            previous,
+            "refresh_flight",
+            (config.coalesce_refreshes, config.coalesce_refreshes_ttl),
+            lambda: (
+                SingleFlight(ttl=config.coalesce_refreshes_ttl)
+                if config.coalesce_refreshes
+                else None
+            ),
+        )
+
+        # The admission control watches the queue of the hashing executor.
+        services.hashing, services.admission = services._reuse(
+            previous,
+            "hashing",
+            (
+                config.hashing_executor,
+                config.hashing_concurrency,
+                config.hashing_max_pending,
+                config.admission_control,
+                config.admission_target_delay,
+                config.admission_interval,
+                config.admission_max_inflight,
+                config.admission_max_queue,
+                config.admission_retry_after,
+            ),
+            lambda: build_hashing(config),
+        )
+
+        services.throttle = services._reuse(
+            previous,
+            "throttle",
+            (
+                config.throttle_signin,
+                config.throttle_store,
+                config.throttle_identifier_field,
+                config.throttle_identifier_limit,
+                config.throttle_identifier_period,
+                config.throttle_ip_limit,
+                config.throttle_ip_period,
+            ),
+            lambda: (
+                LoginThrottle(
+                    config.throttle_store or InMemoryThrottleStore(),
+                    identifier_field=config.throttle_identifier_field,
+                    identifier_limit=config.throttle_identifier_limit,
+                    identifier_period=config.throttle_identifier_period,
+                    ip_limit=config.throttle_ip_limit,
+                    ip_period=config.throttle_ip_period,
+                )
+                if config.throttle_signin
+                else None
+            ),
+        )
+
+        if previous is not None:
+            previous.release(services)
+        return services
+
+    def release(self, successor: "RuntimeServices") -> None:
+        """
+        Shuts down the executors not carried over by the `successor`.
+        """
+        if self.crypto is not None and self.crypto is not successor.crypto:
+            self.crypto.shutdown()
+
+    async def startup(self) -> None:
+        """
+        Prepares the services before the first request: the dummy hash checked against
+        the passwords of unknown users.
+        """
+        await self.hashing.dummy_hash()
+
+    def shutdown(self) -> None:
+        """
+        Stops the worker processes of the crypto executor, if any.
+
+        The workers of the hashing executor are the ones of AnyIO, shared by the event
+        loop and stopped with it.
+        """
+        if self.crypto is not None:
+            self.crypto.shutdown()
+
+
+def build_revocation(config: "SimpleJWT") -> Optional[RevocationStore]:
+    """
+    Wraps the `revocation_store` with the cache and the Bloom filter, if enabled.
+    """
+    revocation = store = config.revocation_store
+    if store is not None and config.revocation_cache_ttl > 0:
+        revocation = CachedRevocationStore(store, ttl=config.revocation_cache_ttl)
+    if store is not None and config.revocation_filter:
+        revocation = BloomFilterRevocationStore(
+            revocation,
+            capacity=config.revocation_filter_capacity,
+            fp_rate=config.revocation_filter_fp_rate,
+            sync_interval=config.revocation_filter_sync_interval,
+            source=store,
+        )
+    return revocation
+
+
+def build_hashing(config: "SimpleJWT") -> Tuple[HashingExecutor, Optional[AdmissionControl]]:
+    """
+    Builds the hashing executor and, if enabled, the admission control watching it.
+    """
+    delay = None
+    if config.admission_control:
+        delay = DelayController(
+            target=config.admission_target_delay, interval=config.admission_interval
+        )
+    hashing = HashingExecutor(
+        kind=config.hashing_executor,
+        concurrency=config.hashing_concurrency,
+        max_pending=config.hashing_max_pending,
+        retry_after=config.admission_retry_after,
+        delay=delay,
+    )
+
+    admission = None
+    if config.admission_control:
+        admission = AdmissionControl(
+            hashing,
+            max_inflight=config.admission_max_inflight,
+            max_queue=config.admission_max_queue,
+            delay=delay,
+            retry_after=config.admission_retry_after,
+        )
+    return hashing, admission
@@ -0,0 +1,101 @@
+import hashlib
+import time
+from typing import Any, Awaitable, Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+from anyio import Event
+
+T = TypeVar("T")
+
+
+class Flight(Generic[T]):
+    """
+    A call in progress, awaited by the duplicated calls.
+    """
+
+    __slots__ = ("done", "completed", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = Event()
+        self.completed = False
+        self.result: Optional[T] = None
+        self.error: Optional[Exception] = None
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesces the concurrent calls for the same key.
+
+    The first call does the work and the others, arriving while it is in progress,
+    await its result instead of doing the same work again. The results are also kept
+    for `ttl` seconds, answering the duplicates arriving right after.
+
+    The errors are shared with the calls waiting but never kept. If the first call
+    is cancelled, the calls waiting try again.
+    """
+
+    def __init__(self, ttl: float = 3.0, maxsize: int = 10_000) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._flights: Dict[bytes, Flight[T]] = {}
+        self._results: Dict[bytes, Tuple[T, float]] = {}
+
+    @staticmethod
+    def make_key(value: Any) -> bytes:
+        """
+        Builds a compact key from a value (usually a token).
+        """
+        return hashlib.blake2b(str(value).encode(), digest_size=16).digest()
+
+    def forget(self, value: Any) -> None:
+        """
+        Discards the result kept for the given value.
+        """
+        self._results.pop(self.make_key(value), None)
+
+    def _keep(self, key: bytes, result: T) -> None:
+        if self.ttl <= 0:
+            return
+
+        now = time.monotonic()
+        if len(self._results) >= self.maxsize:
+            # Drops the expired results and, if still full, the oldest one.
+            for expired in [k for k, (_, until) in self._results.items() if until <= now]:
+                del self._results[expired]
+            if len(self._results) >= self.maxsize:
+                del self._results[next(iter(self._results))]
+        self._results[key] = (result, now + self.ttl)
+
+    async def run(self, value: Any, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Runs `func` once for the concurrent calls with the same `value`.
+        """
+        key = self.make_key(value)
+
+        kept = self._results.get(key)
+        if kept is not None:
+            if kept[1] > time.monotonic():
+                return kept[0]
+            del self._results[key]
+
+        flight = self._flights.get(key)
+        if flight is not None:
+            await flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            if not flight.completed:
+                return await self.run(value, func)
+            return flight.result
+
+        flight = self._flights[key] = Flight()
+        try:
+            flight.result = result = await func()
+            flight.completed = True
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            del self._flights[key]
+            flight.done.set()
+
+        self._keep(key, result)
+        return result
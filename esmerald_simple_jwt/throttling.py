@@ -0,0 +1,176 @@
+import math
+import time
+from abc import ABC
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+from esmerald import status
+from esmerald.exceptions import HTTPException, ImproperlyConfigured
+
+
+class Throttled(HTTPException):
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+
+
+class ThrottleStore(ABC):  # noqa: B024
+    """
+    The base of the stores keeping the token buckets of the throttling.
+
+    A bucket holds up to `burst` tokens and is refilled at `rate` tokens per second.
+    Every attempt consumes a token.
+    """
+
+    async def consume(self, key: str, rate: float, burst: int) -> float:
+        """
+        Consumes a token from the bucket of the given key.
+
+        Returns `0` when allowed or the time in seconds until a token is available.
+        """
+        raise NotImplementedError("All throttle stores must implement the `consume()` method.")
+
+
+class InMemoryThrottleStore(ThrottleStore):
+    """
+    Keeps the token buckets in memory, split in shards.
+
+    The shards keep the dictionaries small and bound the work of the eviction, done
+    only in the shard being full. The buckets already refilled are evicted first and,
+    if none, the least recently used one.
+
+    Each worker keeps its own buckets, meaning the limits are per worker.
+    """
+
+    def __init__(self, shards: int = 16, maxsize: int = 100_000) -> None:
+        if shards < 1:
+            raise ImproperlyConfigured("The throttle store needs at least one shard.")
+        # Maps a key to the tokens left, when it was updated and when it is full again.
+        self._shards: List[Dict[str, Tuple[float, float, float]]] = [{} for _ in range(shards)]
+        self.shard_size = max(maxsize // shards, 1)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def _evict(self, shard: Dict[str, Tuple[float, float, float]], now: float) -> None:
+        for key in [key for key, (_, _, full_at) in shard.items() if full_at <= now]:
+            del shard[key]
+        if len(shard) >= self.shard_size:
+            del shard[next(iter(shard))]
+
+    async def consume(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        shard = self._shards[hash(key) % len(self._shards)]
+
+        bucket = shard.pop(key, None)
+        if bucket is None:
+            tokens = float(burst)
+            if len(shard) >= self.shard_size:
+                self._evict(shard, now)
+        else:
+            tokens = min(float(burst), bucket[0] + (now - bucket[1]) * rate)
+
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+
+        # Reinserting keeps the shard ordered from the least to the most recently used.
+        shard[key] = (tokens, now, now + (burst - tokens) / rate)
+        return wait
+
+
+class RedisScriptClient(Protocol):
+    """
+    The subset of an asynchronous Redis client (for instance `redis.asyncio.Redis`)
+    used by the `RedisThrottleStore`.
+    """
+
+    async def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> Any:
+        ...
+
+
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 't', 'u')
+local tokens = tonumber(bucket[1]) or burst
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(now - updated, 0) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 't', tokens, 'u', now)
+redis.call('EXPIRE', KEYS[1], math.ceil((burst - tokens) / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisThrottleStore(ThrottleStore):
+    """
+    Keeps the token buckets in Redis (or any server speaking the Redis protocol),
+    sharing the limits between all the workers.
+
+    The buckets are updated atomically by a Lua script and expire once refilled.
+    """
+
+    def __init__(self, client: RedisScriptClient, prefix: str = "simple-jwt:throttle:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    async def consume(self, key: str, rate: float, burst: int) -> float:
+        wait = await self.client.eval(
+            TOKEN_BUCKET_SCRIPT, 1, self.prefix + key, rate, burst, time.time()
+        )
+        return float(wait)
+
+
+class LoginThrottle:
+    """
+    Limits the signin attempts per identifier (the `identifier_field` of the login data,
+    usually the email or username) and per client IP.
+
+    Both buckets are consumed on every attempt and the attempt is rejected, with a
+    `429` and a `Retry-After` header, when any of them is empty.
+    """
+
+    def __init__(
+        self,
+        store: ThrottleStore,
+        identifier_field: str = "email",
+        identifier_limit: int = 5,
+        identifier_period: float = 60.0,
+        ip_limit: int = 50,
+        ip_period: float = 60.0,
+    ) -> None:
+        if min(identifier_limit, ip_limit) < 1 or min(identifier_period, ip_period) <= 0:
+            raise ImproperlyConfigured("The throttling limits and periods must be positive.")
+
+        self.store = store
+        self.identifier_field = identifier_field
+        self.identifier_limit = identifier_limit
+        self.identifier_rate = identifier_limit / identifier_period
+        self.ip_limit = ip_limit
+        self.ip_rate = ip_limit / ip_period
+
+    async def check(self, identifier: Optional[str], client_ip: Optional[str]) -> None:
+        """
+        Consumes an attempt for the identifier and the client IP or raises `Throttled`.
+        """
+        wait = 0.0
+        if identifier:
+            wait = await self.store.consume(
+                f"id:{identifier.strip().lower()}", self.identifier_rate, self.identifier_limit
+            )
+        if client_ip:
+            wait = max(
+                wait, await self.store.consume(f"ip:{client_ip}", self.ip_rate, self.ip_limit)
+            )
+
+        if wait > 0:
+            raise Throttled(
+                detail="Too many signin attempts, try again later.",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
@@ -1,8 +1,658 @@
-from typing import Union
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from calendar import timegm
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
+from esmerald.exceptions import ImproperlyConfigured
 from esmerald.security.jwt.token import Token as EsmeraldToken
+from jwt.algorithms import HMACAlgorithm, get_default_algorithms
+from jwt.exceptions import (
+    DecodeError,
+    ExpiredSignatureError,
+    ImmatureSignatureError,
+    InvalidIssuedAtError,
+    InvalidJTIError,
+    InvalidKeyError,
+    InvalidSignatureError,
+    InvalidSubjectError,
+    MissingRequiredClaimError,
+)
+from jwt.utils import base64url_decode, base64url_encode
 from typing_extensions import Annotated, Doc
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+if TYPE_CHECKING:
+    from esmerald_simple_jwt.crypto import CryptoExecutor
+    from esmerald_simple_jwt.keys import KeyMaterial, KeyRing
+
+TIME_CLAIMS = ("exp", "iat", "nbf")
+# The characters of the base64url segments and their separators.
+TOKEN_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_."
+T = TypeVar("T", bound="Token")
+
+
+@lru_cache(maxsize=64)
+def header_segment(algorithm: str, kid: Optional[str] = None, typ: Optional[str] = "JWT") -> bytes:
+    """
+    Returns the base64url encoded header of a token, followed by the `.` separator.
+
+    The header is serialized exactly like PyJWT does, with the keys sorted.
+    """
+    header: Dict[str, Any] = {"typ": typ, "alg": algorithm}
+    if kid is not None:
+        header["kid"] = kid
+    if not typ:
+        del header["typ"]
+    return (
+        base64url_encode(json.dumps(header, separators=(",", ":"), sort_keys=True).encode()) + b"."
+    )
+
+
+def is_plain_str(value: str) -> bool:
+    """
+    Checks if a string is serialized the same way by `orjson` and the `json` module:
+    ASCII without DEL, that `orjson` writes as is and the `json` module escapes.
+    """
+    return value.isascii() and "\x7f" not in value
+
+
+def is_plain(value: Any) -> bool:
+    """
+    Checks if a claim is serialized the same way by `orjson` and the `json` module.
+    """
+    if isinstance(value, str):
+        return is_plain_str(value)
+    if value is None or isinstance(value, bool):
+        return True
+    if isinstance(value, int):
+        return -(2**63) <= value < 2**64
+    if isinstance(value, (list, tuple)):
+        return all(is_plain(item) for item in value)
+    if isinstance(value, dict):
+        return all(
+            isinstance(k, str) and is_plain_str(k) and is_plain(v) for k, v in value.items()
+        )
+    return False
+
+
+def dump_claims(claims: Dict[str, Any]) -> bytes:
+    """
+    Serializes the claims into the same bytes as PyJWT.
+
+    `orjson` is used when the result is guaranteed to be identical to the `json` module
+    (ASCII strings, integers, booleans, nulls and containers of them), which is the case
+    of the usual claims.
+    """
+    if orjson is not None and all(is_plain(value) for value in claims.values()):
+        return orjson.dumps(claims)
+    return json.dumps(claims, separators=(",", ":")).encode()
+
+
+class Signer:
+    """
+    A key prepared once to sign and verify messages with a given algorithm.
+
+    For the HMAC algorithms, the keyed hash is built once and copied for every message.
+    """
+
+    __slots__ = ("algorithm", "key", "kid", "_handler", "_hmac")
+
+    def __init__(self, key: Any, algorithm: str, kid: Optional[str] = None) -> None:
+        algorithms = get_default_algorithms()
+        if algorithm not in algorithms:
+            raise ImproperlyConfigured(f"Unsupported algorithm `{algorithm}`.")
+
+        self._handler = handler = algorithms[algorithm]
+        self.algorithm = algorithm
+        self.kid = kid
+        self.key = handler.prepare_key(key)
+        self._hmac = (
+            hmac.new(self.key, digestmod=handler.hash_alg)
+            if isinstance(handler, HMACAlgorithm)
+            else None
+        )
+
+    def sign(self, message: bytes) -> bytes:
+        if self._hmac is not None:
+            mac = self._hmac.copy()
+            mac.update(message)
+            return mac.digest()
+        return self._handler.sign(message, self.key)
+
+    def verify(self, message: bytes, signature: bytes) -> bool:
+        if self._hmac is not None:
+            return hmac.compare_digest(self.sign(message), signature)
+        return bool(self._handler.verify(message, self.key, signature))
+
+
+class TokenEncoder:
+    """
+    Encodes tokens with a prepared key, byte for byte identical to `jwt.encode()`.
+
+    The header segment is serialized once, the claims are serialized with `orjson`
+    and the key is prepared once. For the HMAC algorithms, the keyed hash is built
+    once and copied for every token.
+
+    **Example**
+
+    ```python
+    from esmerald_simple_jwt.token import TokenEncoder
+
+    encoder = TokenEncoder(key=..., algorithm="HS256")
+    encoder.encode({"sub": "1", "exp": ...})
+    ```
+    """
+
+    __slots__ = ("algorithm", "kid", "signer", "executor", "_header")
+
+    def __init__(
+        self,
+        key: Any,
+        algorithm: str,
+        kid: Optional[str] = None,
+        executor: Optional["CryptoExecutor"] = None,
+    ) -> None:
+        self.algorithm = algorithm
+        self.kid = kid
+        self.signer = Signer(key, algorithm, kid=kid)
+        self.executor = executor
+        self._header = header_segment(algorithm, kid)
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        """
+        Encodes the claims into a signed token.
+        """
+        message = self.signing_input(claims)
+        return self.join(message, self.signer.sign(message))
+
+    async def aencode(self, claims: Dict[str, Any]) -> str:
+        """
+        Encodes the claims into a signed token, signed by the `executor` (if any) away
+        from the event loop.
+        """
+        message = self.signing_input(claims)
+        executor = self.executor
+        if executor is None or not executor.offloads(self.signer):
+            return self.join(message, self.signer.sign(message))
+        return self.join(message, await executor.sign(message))
+
+    def join(self, message: bytes, signature: bytes) -> str:
+        return (message + b"." + base64url_encode(signature)).decode()
+
+    def signing_input(self, claims: Dict[str, Any]) -> bytes:
+        """
+        Returns the header and claims segments of the token, the message to sign.
+        """
+        claims = claims.copy()
+        for name in TIME_CLAIMS:
+            value = claims.get(name)
+            if isinstance(value, datetime):
+                claims[name] = timegm(value.utctimetuple())
+
+        if "iss" in claims and not isinstance(claims["iss"], str):
+            raise TypeError("Issuer (iss) must be a string.")
+
+        return self._header + base64url_encode(dump_claims(claims))
+
+
+def load_json(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class Claims:
+    """
+    A read-only view of the claims of a verified token.
+
+    Unlike the `Token` model, the claims are kept as decoded from the JSON, meaning the
+    `exp` is an integer timestamp and no validator runs. The `Token` model is only
+    built when `to_token()` is called.
+
+    **Example**
+
+    ```python
+    claims = runtime.services.decoder.decode(token)
+
+    claims.sub
+    claims.token_type
+    claims["custom"]
+    claims.to_token()
+    ```
+    """
+
+    __slots__ = ("_claims", "_token")
+
+    def __init__(self, claims: Dict[str, Any]) -> None:
+        object.__setattr__(self, "_claims", claims)
+        object.__setattr__(self, "_token", None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("The claims are read-only.")
+
+    def __getitem__(self, name: str) -> Any:
+        return self._claims[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._claims
+
+    def __repr__(self) -> str:
+        return f"Claims({self._claims!r})"
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self._claims.get(name, default)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(self._claims)
+
+    @property
+    def sub(self) -> Optional[str]:
+        return cast(Optional[str], self._claims.get("sub"))
+
+    @property
+    def exp(self) -> int:
+        return int(self._claims["exp"])
+
+    @property
+    def iat(self) -> Optional[int]:
+        return cast(Optional[int], self._claims.get("iat"))
+
+    @property
+    def jti(self) -> Optional[str]:
+        return cast(Optional[str], self._claims.get("jti"))
+
+    @property
+    def token_type(self) -> Optional[str]:
+        return cast(Optional[str], self._claims.get("token_type"))
+
+    @property
+    def fam(self) -> Optional[str]:
+        return cast(Optional[str], self._claims.get("fam"))
+
+    @property
+    def gen(self) -> Optional[int]:
+        return cast(Optional[int], self._claims.get("gen"))
+
+    @property
+    def ver(self) -> Optional[int]:
+        return cast(Optional[int], self._claims.get("ver"))
+
+    @property
+    def expires_at(self) -> datetime:
+        return datetime.fromtimestamp(self.exp, tz=timezone.utc)
+
+    def to_token(self, model: Optional[Type[T]] = None) -> T:
+        """
+        Builds (once) the full pydantic `Token` model, for the backends needing it.
+        """
+        if model is not None:
+            return model(**self._claims)
+        if self._token is None:
+            object.__setattr__(self, "_token", Token(**self._claims))
+        return cast(T, self._token)
+
+
+class TokenRejectedError(DecodeError):
+    """
+    Raised when a token is rejected by the structural checks, before any cryptography.
+
+    The `code` tells which check failed: `token_too_long`, `invalid_segments`,
+    `invalid_characters`, `invalid_header`, `unknown_kid` or `algorithm_not_allowed`.
+    """
+
+    def __init__(self, code: str, message: str) -> None:
+        super().__init__(f"{message} ({code})")
+        self.code = code
+
+
+class VerifiedTokenCache:
+    """
+    A LRU cache of the claims of the tokens already verified, avoiding verifying the
+    signature of the same token again (expensive for the asymmetric algorithms).
+
+    The entries are keyed by a hash of the token and kept for `ttl` seconds at most,
+    never beyond the `exp` of the token. Calling `invalidate()` (done automatically
+    when the cache is used with another keyring) discards all the entries at once.
+    """
+
+    __slots__ = ("maxsize", "ttl", "epoch", "keyring", "hits", "misses", "evictions", "_entries")
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 300.0) -> None:
+        if maxsize < 1:
+            raise ImproperlyConfigured("The verified token cache `maxsize` must be positive.")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.epoch = 0
+        self.keyring: Optional["KeyRing"] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Maps the hash of a token to its claims, until when they are valid and the epoch.
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, Any], float, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(token: Union[str, bytes]) -> bytes:
+        if isinstance(token, str):
+            token = token.encode()
+        return hashlib.blake2b(token, digest_size=16).digest()
+
+    def bind(self, keyring: "KeyRing") -> None:
+        """
+        Binds the cache to a keyring, discarding the entries verified by other keys.
+
+        A keyring with the same keys, for instance after rebuilding the runtime
+        configuration, keeps the entries.
+        """
+        if self.keyring is not keyring:
+            if self.keyring is None or list(self.keyring) != list(keyring):
+                self.invalidate()
+            self.keyring = keyring
+
+    def invalidate(self) -> None:
+        """
+        Discards all the entries, for instance after rotating the keys.
+        """
+        self.epoch += 1
+        self._entries.clear()
+
+    def get(self, token: Union[str, bytes]) -> Optional[Dict[str, Any]]:
+        key = self.make_key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        claims, until, epoch = entry
+        if epoch != self.epoch or until <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return claims
+
+    def put(self, token: Union[str, bytes], claims: Dict[str, Any]) -> None:
+        until = time.time() + self.ttl
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            until = min(until, exp)
+
+        self._entries[self.make_key(token)] = (claims, until, self.epoch)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class TokenDecoder:
+    """
+    Verifies and decodes tokens with the prepared keys of a keyring, a lean alternative
+    to `Token.decode()`.
+
+    The signature and the time claims (`exp`, `nbf` and `iat`) are verified the same way
+    as `jwt.decode()` and the same exceptions are raised but the key of every `kid` is
+    prepared once, the known header segments are parsed once and the claims are returned
+    as a `Claims` object instead of a validated pydantic model. An optional
+    `VerifiedTokenCache` keeps the claims of the tokens already verified.
+
+    Only the tokens whose `alg` header is the algorithm of their key are accepted. The
+    tokens without `kid` are verified against the active key and then against the
+    verify-only keys of their algorithm.
+
+    Before any decoding, the tokens longer than `max_length`, without exactly three
+    segments or with characters outside of the base64url alphabet are rejected with
+    a `TokenRejectedError`, as are the tokens with an unknown `kid` or an `alg` not
+    allowed for their key.
+    """
+
+    __slots__ = (
+        "keyring",
+        "leeway",
+        "require",
+        "max_length",
+        "maxsize",
+        "cache",
+        "executor",
+        "_signers",
+        "_headers",
+    )
+
+    def __init__(
+        self,
+        keyring: "KeyRing",
+        leeway: Union[int, float, str] = 0,
+        require: Sequence[str] = ("exp",),
+        max_length: int = 4096,
+        maxsize: int = 256,
+        cache: Optional[VerifiedTokenCache] = None,
+        executor: Optional["CryptoExecutor"] = None,
+    ) -> None:
+        self.keyring = keyring
+        self.cache = cache
+        self.executor = executor
+        if cache is not None:
+            cache.bind(keyring)
+        self.leeway = float(leeway)
+        self.require = tuple(require)
+        self.max_length = max_length
+        self._signers: Dict[Optional[str], Signer] = {
+            key.kid: Signer(key.verifying_key, key.algorithm, kid=key.kid) for key in keyring
+        }
+        # Maps the header segments already seen to the signers of their keys.
+        self._headers: Dict[bytes, Tuple[Signer, ...]] = {}
+        self.maxsize = maxsize
+
+    def check(self, token: Union[str, bytes]) -> None:
+        """
+        Checks the structure of a token, without decoding it.
+        """
+        if len(token) > self.max_length:
+            raise TokenRejectedError(
+                "token_too_long", f"The token is longer than {self.max_length} characters"
+            )
+        if isinstance(token, str):
+            if not token.isascii():
+                raise TokenRejectedError("invalid_characters", "Invalid characters in the token")
+            token = token.encode()
+
+        if (
+            token.count(b".") != 2
+            or token.startswith(b".")
+            or b".." in token
+            or token.endswith(b".")
+        ):
+            raise TokenRejectedError("invalid_segments", "The token must have three segments")
+        if token.translate(None, TOKEN_ALPHABET):
+            raise TokenRejectedError("invalid_characters", "Invalid characters in the token")
+
+    def signers_for(self, segment: bytes) -> Tuple[Signer, ...]:
+        """
+        Returns the signers to try, in order, for the header segment of a token.
+        """
+        signers = self._headers.get(segment)
+        if signers is not None:
+            return signers
+
+        try:
+            header = load_json(base64url_decode(segment))
+        except (ValueError, binascii.Error):
+            raise TokenRejectedError("invalid_header", "Invalid header string") from None
+        if not isinstance(header, dict):
+            raise TokenRejectedError("invalid_header", "The header must be a json object")
+        if "crit" in header or header.get("b64") is False:
+            raise TokenRejectedError("invalid_header", "Unsupported critical header parameters")
+
+        kid, algorithm = header.get("kid"), header.get("alg")
+        try:
+            keys: List["KeyMaterial"] = self.keyring.candidates(kid, algorithm)
+        except InvalidKeyError:
+            raise TokenRejectedError("unknown_kid", "Unknown key id") from None
+        if not keys or algorithm not in keys[0].algorithms:
+            raise TokenRejectedError("algorithm_not_allowed", "The alg value is not allowed")
+
+        signers = tuple(self._signers[key.kid] for key in keys)
+        if len(self._headers) >= self.maxsize:
+            self._headers.clear()
+        self._headers[segment] = signers
+        return signers
+
+    def split(self, token: Union[str, bytes]) -> Tuple[Tuple[Signer, ...], bytes, bytes, bytes]:
+        """
+        Checks a token and splits it into the signers of its possible keys, the signed
+        message, the signature and the claims segment.
+        """
+        self.check(token)
+        if isinstance(token, str):
+            token = token.encode()
+
+        message, signature_segment = token.rsplit(b".", 1)
+        header_segment, payload_segment = message.split(b".", 1)
+
+        signers = self.signers_for(header_segment)
+        try:
+            signature = base64url_decode(signature_segment)
+        except (TypeError, binascii.Error):
+            raise DecodeError("Invalid crypto padding") from None
+        return signers, message, signature, payload_segment
+
+    def verify(self, token: Union[str, bytes]) -> Dict[str, Any]:
+        """
+        Verifies the signature and the time claims of a token and returns its claims.
+        """
+        signers, message, signature, payload_segment = self.split(token)
+        if not any(signer.verify(message, signature) for signer in signers):
+            raise InvalidSignatureError("Signature verification failed")
+        return self.load(payload_segment)
+
+    async def averify(self, token: Union[str, bytes]) -> Dict[str, Any]:
+        """
+        Same as `verify()`, with the signature verified by the `executor` (if any) away
+        from the event loop.
+        """
+        executor = self.executor
+        signers, message, signature, payload_segment = self.split(token)
+        for signer in signers:
+            if executor is None or not executor.offloads(signer):
+                is_valid = signer.verify(message, signature)
+            else:
+                is_valid = await executor.verify(signer.kid, message, signature)
+            if is_valid:
+                return self.load(payload_segment)
+        raise InvalidSignatureError("Signature verification failed")
+
+    def load(self, payload_segment: bytes) -> Dict[str, Any]:
+        """
+        Loads and validates the claims segment of a token whose signature was verified.
+        """
+        try:
+            claims = load_json(base64url_decode(payload_segment))
+        except (ValueError, binascii.Error) as e:
+            raise DecodeError(f"Invalid payload string: {e}") from e
+        if not isinstance(claims, dict):
+            raise DecodeError("Invalid payload string: must be a json object")
+
+        self.validate(claims)
+        return claims
+
+    def validate(self, claims: Dict[str, Any], now: Optional[float] = None) -> None:
+        """
+        Validates the registered claims on plain numbers and strings.
+        """
+        for name in self.require:
+            if claims.get(name) is None:
+                raise MissingRequiredClaimError(name)
+
+        if now is None:
+            now = time.time()
+        leeway = self.leeway
+
+        for name in TIME_CLAIMS:
+            if name not in claims:
+                continue
+            value = claims[name]
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                if name == "iat":
+                    raise InvalidIssuedAtError("Issued At claim (iat) must be an integer.")
+                raise DecodeError(f"The claim ({name}) must be an integer.")
+            if name == "exp" and int(value) <= now - leeway:
+                raise ExpiredSignatureError("Signature has expired")
+            if name != "exp" and int(value) > now + leeway:
+                raise ImmatureSignatureError(f"The token is not yet valid ({name})")
+
+        if "sub" in claims and not isinstance(claims["sub"], str):
+            raise InvalidSubjectError("Subject must be a string")
+        if "jti" in claims and not isinstance(claims["jti"], str):
+            raise InvalidJTIError("JWT ID must be a string")
+
+    def decode(self, token: Union[str, bytes]) -> Claims:
+        """
+        Verifies a token and returns its `Claims`.
+
+        With a `cache`, the tokens already verified are not verified again until they
+        expire or the cache is invalidated. The structure of the token is checked first,
+        the malformed and oversized tokens are never hashed for a lookup.
+        """
+        cache = self.cache
+        if cache is None:
+            return Claims(self.verify(token))
+
+        self.check(token)
+        claims = cache.get(token)
+        if claims is None:
+            claims = self.verify(token)
+            cache.put(token, claims)
+        return Claims(claims)
+
+    async def adecode(self, token: Union[str, bytes]) -> Claims:
+        """
+        Same as `decode()`, with the signature verified by the `executor` (if any) away
+        from the event loop.
+        """
+        cache = self.cache
+        if cache is None:
+            return Claims(await self.averify(token))
+
+        self.check(token)
+        claims = cache.get(token)
+        if claims is None:
+            claims = await self.averify(token)
+            cache.put(token, claims)
+        return Claims(claims)
+
 
 class Token(EsmeraldToken):
     """
@@ -34,3 +684,54 @@ class Token(EsmeraldToken):
             """
         ),
     ] = None
+    fam: Annotated[
+        Union[str, None],
+        Doc(
+            """
+            The family of the refresh token, used when the refresh tokens are rotated.
+            All the refresh tokens issued from the same sign-in share the same family.
+            """
+        ),
+    ] = None
+    gen: Annotated[
+        Union[int, None],
+        Doc(
+            """
+            The generation of the refresh token inside its family, incremented on
+            every refresh when the refresh tokens are rotated.
+            """
+        ),
+    ] = None
+    ver: Annotated[
+        Union[int, None],
+        Doc(
+            """
+            The token version of the user when the token was issued, checked against
+            the `token_version_store` on refresh.
+            """
+        ),
+    ] = None
+
+    def encode_with(
+        self, encoder: TokenEncoder, claims_extra: Union[Dict[str, Any], None] = None
+    ) -> str:
+        """
+        Encodes the token with a `TokenEncoder`, producing the same token as `encode()`
+        with the key and algorithm of the encoder.
+        """
+        claims = self.model_dump(exclude_none=True)
+        if claims_extra:
+            claims.update(claims_extra)
+        return encoder.encode(claims)
+
+    async def aencode_with(
+        self, encoder: TokenEncoder, claims_extra: Union[Dict[str, Any], None] = None
+    ) -> str:
+        """
+        Same as `encode_with()`, with the token signed by the `executor` of the encoder
+        (if any) away from the event loop.
+        """
+        claims = self.model_dump(exclude_none=True)
+        if claims_extra:
+            claims.update(claims_extra)
+        return await encoder.aencode(claims)
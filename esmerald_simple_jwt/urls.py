@@ -1,8 +1,35 @@
 from esmerald import Gateway
 
-from esmerald_simple_jwt.views import refresh_token, signin
+from esmerald_simple_jwt.runtime import build_runtime_config
+from esmerald_simple_jwt.views import (
+    introspect_token,
+    introspect_tokens,
+    jwks,
+    refresh_token,
+    signin,
+)
+
+# Resolve the SimpleJWT configuration once when the urls are included.
+runtime = build_runtime_config()
 
 route_patterns = [
     Gateway(handler=signin, name="simplejwt-signin"),
     Gateway(handler=refresh_token, name="simplejwt-refresh"),
 ]
+
+if runtime.config.enable_jwks:
+    route_patterns.append(Gateway(handler=jwks, name="simplejwt-jwks"))
+
+if runtime.config.enable_introspection:
+    route_patterns += [
+        Gateway(
+            handler=introspect_token,
+            name="simplejwt-introspect",
+            permissions=runtime.config.introspection_permissions or None,
+        ),
+        Gateway(
+            handler=introspect_tokens,
+            name="simplejwt-introspect-batch",
+            permissions=runtime.config.introspection_permissions or None,
+        ),
+    ]
@@ -0,0 +1,189 @@
+from typing import TYPE_CHECKING, Any, Mapping, Optional, Tuple
+
+from esmerald import Request
+from esmerald.exceptions import AuthenticationError, NotAuthorized
+from esmerald.permissions import BasePermission
+from jwt.exceptions import PyJWTError
+from lilya.datastructures import Header
+from lilya.types import Scope
+
+from esmerald_simple_jwt.runtime import RuntimeConfig, get_runtime_config
+from esmerald_simple_jwt.token import Claims
+
+if TYPE_CHECKING:
+    from esmerald.types import APIGateHandler
+
+# The key of the scope keeping the token verified for the request and its claims.
+SCOPE_KEY = "esmerald_simple_jwt.claims"
+
+
+def get_bearer_token(headers: Mapping[str, Any], runtime: RuntimeConfig) -> Optional[str]:
+    """
+    Extracts the token from the `authorization_header` of the request.
+
+    Returns `None` when the header is missing and raises `NotAuthorized` when the
+    header type is not one of the `auth_header_types`.
+    """
+    value = headers.get(runtime.config.authorization_header)
+    if not value:
+        return None
+
+    header_type, _, token = str(value).partition(" ")
+    if header_type not in runtime.config.auth_header_types:
+        raise NotAuthorized(detail=f"'{header_type}' is not an authorized header.")
+    return token.strip()
+
+
+def verify_access_token(token: str, runtime: Optional[RuntimeConfig] = None) -> Claims:
+    """
+    Verifies an access token issued by the package and returns its claims.
+
+    The token is verified by the `TokenDecoder` of the runtime configuration (the
+    pre-parsed keys of the keyring and the optional verified token cache) and must be
+    of the `access_token_name` type.
+    """
+    if runtime is None:
+        runtime = get_runtime_config()
+
+    try:
+        claims = runtime.services.decoder.decode(token)
+    except PyJWTError as e:
+        raise AuthenticationError(str(e)) from e
+    return check_access_claims(claims, runtime)
+
+
+async def averify_access_token(token: str, runtime: Optional[RuntimeConfig] = None) -> Claims:
+    """
+    Same as `verify_access_token()`, with the signature verified by the
+    `crypto_executor` (if any) away from the event loop.
+    """
+    if runtime is None:
+        runtime = get_runtime_config()
+
+    try:
+        claims = await runtime.services.decoder.adecode(token)
+    except PyJWTError as e:
+        raise AuthenticationError(str(e)) from e
+    return check_access_claims(claims, runtime)
+
+
+def check_access_claims(claims: Claims, runtime: RuntimeConfig) -> Claims:
+    """
+    Checks that verified claims are the ones of an access token.
+    """
+    if claims.token_type != runtime.access_token_name:
+        raise NotAuthorized(detail="Only access tokens are allowed.")
+    return claims
+
+
+def scope_token(scope: Scope, runtime: RuntimeConfig) -> Tuple[Optional[str], Optional[Claims]]:
+    """
+    Returns the bearer token of a request and its claims, if already verified.
+    """
+    token = get_bearer_token(Header.from_scope(scope), runtime)
+    verified = scope.get(SCOPE_KEY)
+    if token is not None and verified is not None and verified[0] == token:
+        return token, verified[1]
+    return token, None
+
+
+def store_claims(scope: Scope, token: str, claims: Claims) -> Claims:
+    """
+    Stores the claims verified for the token of a request in its scope.
+    """
+    scope[SCOPE_KEY] = (token, claims)
+    scope.setdefault("state", {})["claims"] = claims
+    return claims
+
+
+def verify_scope(scope: Scope, runtime: Optional[RuntimeConfig] = None) -> Optional[Claims]:
+    """
+    Verifies the bearer access token of a request only once.
+
+    The first verification stores the token and its claims in the scope, the next ones
+    (a middleware, then a permission, then a dependency...) for the same token return
+    the stored claims without verifying it again. The claims are also available as
+    `request.state.claims`.
+
+    Returns `None` when the request has no token.
+    """
+    if runtime is None:
+        runtime = get_runtime_config()
+
+    token, claims = scope_token(scope, runtime)
+    if token is None or claims is not None:
+        return claims
+    return store_claims(scope, token, verify_access_token(token, runtime))
+
+
+async def averify_scope(scope: Scope, runtime: Optional[RuntimeConfig] = None) -> Optional[Claims]:
+    """
+    Same as `verify_scope()`, with the signature verified by the `crypto_executor`
+    (if any) away from the event loop. Used by the `AccessTokenMiddleware` and the
+    `access_claims` dependency.
+    """
+    if runtime is None:
+        runtime = get_runtime_config()
+
+    token, claims = scope_token(scope, runtime)
+    if token is None or claims is not None:
+        return claims
+    return store_claims(scope, token, await averify_access_token(token, runtime))
+
+
+def get_claims(request: Request) -> Optional[Claims]:
+    """
+    Returns the claims already verified for the request, if any, at no cost.
+    """
+    verified = request.scope.get(SCOPE_KEY)
+    return verified[1] if verified is not None else None  # type: ignore[no-any-return]
+
+
+class IsAuthenticated(BasePermission):
+    """
+    A permission granted to the requests with a valid bearer access token.
+
+    The token is verified only once per request, the claims verified by the
+    `AccessTokenMiddleware` (if installed) are reused.
+
+    **Example**
+
+    ```python
+    from esmerald import Request, get
+
+    from esmerald_simple_jwt.verification import IsAuthenticated
+
+
+    @get("/me", permissions=[IsAuthenticated])
+    async def me(request: Request) -> str:
+        return request.state.claims.sub
+    ```
+    """
+
+    def has_permission(self, request: Request, apiview: "APIGateHandler") -> bool:
+        return verify_scope(request.scope) is not None
+
+
+async def access_claims(request: Request) -> Claims:
+    """
+    A dependency verifying (once) the bearer access token of the request and returning
+    its claims.
+
+    **Example**
+
+    ```python
+    from esmerald import Inject, Injects, get
+
+    from esmerald_simple_jwt.token import Claims
+    from esmerald_simple_jwt.verification import access_claims
+
+
+    @get("/me", dependencies={"claims": Inject(access_claims)})
+    async def me(claims: Claims = Injects()) -> str:
+        return claims.sub
+    ```
+    """
+    claims = await averify_scope(request.scope)
+    if claims is None:
+        raise NotAuthorized(detail="Token not found in the request header.")
+    return claims
@@ -1,8 +1,15 @@
-from typing import Dict
+from typing import Dict, Union
 
-from esmerald import JSONResponse, post, status
+from esmerald import Form, JSONResponse, Request, Response, get, post, status
 from esmerald.conf import settings
+from esmerald.exceptions import ValidationErrorException
 from esmerald.openapi.datastructures import OpenAPIResponse
+from esmerald.utils.enums import MediaType
+
+from esmerald_simple_jwt.introspection import introspect, introspect_many
+from esmerald_simple_jwt.responses import token_response
+from esmerald_simple_jwt.runtime import get_runtime_config
+from esmerald_simple_jwt.schemas import IntrospectionBatchIn, IntrospectionIn
 
 
 @post(
@@ -14,12 +21,33 @@ from esmerald.openapi.datastructures import OpenAPIResponse
     tags=settings.simple_jwt.tags,
     responses={200: OpenAPIResponse(model=settings.simple_jwt.token_model)},
 )
-async def signin(data: settings.simple_jwt.login_model) -> JSONResponse:  # type: ignore
+async def signin(request: Request, data: settings.simple_jwt.login_model) -> Union[Response, JSONResponse]:  # type: ignore
     """
     Login a user and returns a JWT token, else raises ValueError.
     """
-    auth = settings.simple_jwt.backend_authentication(**data.model_dump())
-    access_tokens: Dict[str, str] = await auth.authenticate()
+    runtime = get_runtime_config()
+
+    # Rejects the attempts beyond the limits before any lookup or hashing.
+    throttle = runtime.services.throttle
+    if throttle is not None:
+        await throttle.check(
+            getattr(data, throttle.identifier_field, None),
+            request.client.host if request.client else None,
+        )
+
+    auth = runtime.backend_authentication(**data.model_dump())
+    admission = runtime.services.admission
+    if admission is None:
+        access_tokens: Dict[str, str] = await auth.authenticate()
+    else:
+        # Sheds the signin under overload, the refreshes are never shed.
+        with admission.admit():
+            access_tokens = await auth.authenticate()
+
+    if runtime.fast_responses:
+        response = token_response(access_tokens)
+        if response is not None:
+            return response
     return JSONResponse(access_tokens)
 
 
@@ -30,11 +58,91 @@ async def signin(data: settings.simple_jwt.login_model) -> JSONResponse:  # type
     security=settings.simple_jwt.security,
     tags=settings.simple_jwt.tags,
     status_code=status.HTTP_200_OK,
-    responses={200: OpenAPIResponse(model=settings.simple_jwt.access_token_model)},
+    responses={
+        200: OpenAPIResponse(
+            model=(
+                settings.simple_jwt.token_model
+                if settings.simple_jwt.rotate_refresh_tokens
+                else settings.simple_jwt.access_token_model
+            )
+        )
+    },
 )
 async def refresh_token(
     payload: settings.simple_jwt.refresh_model,  # type: ignore
 ) -> settings.simple_jwt.access_token_model:  # type: ignore
-    authentication = settings.simple_jwt.backend_refresh(token=payload)
-    access_token = await authentication.refresh()
+    runtime = get_runtime_config()
+    authentication = runtime.backend_refresh(token=payload)
+
+    # Concurrent refreshes of the same token share the result of the first one.
+    token = getattr(payload, "refresh_token", None)
+    flight = runtime.services.refresh_flight
+    if flight is not None and token is not None:
+        access_token = await flight.run(token, authentication.refresh)
+    else:
+        access_token = await authentication.refresh()
+
+    if runtime.fast_responses:
+        response = token_response(access_token)
+        if response is not None:
+            return response
     return access_token
+
+
+@get(
+    path=settings.simple_jwt.jwks_url,
+    summary=settings.simple_jwt.jwks_summary,
+    description=settings.simple_jwt.jwks_description,
+    tags=settings.simple_jwt.tags,
+    status_code=status.HTTP_200_OK,
+)
+async def jwks(request: Request) -> Response:
+    """
+    Publishes the public keys of the keyring.
+
+    The body is serialized once per keyring and the verifiers can cache it using the
+    `ETag` and `Cache-Control` headers.
+    """
+    runtime = get_runtime_config()
+    document = runtime.keyring.jwks()
+    headers = {"ETag": document.etag, "Cache-Control": runtime.jwks_cache_control}
+
+    if document.matches(request.headers.get("if-none-match")):
+        return Response(None, status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(document.body, media_type=MediaType.JSON, headers=headers)
+
+
+@post(
+    path=settings.simple_jwt.introspection_url,
+    summary=settings.simple_jwt.introspection_summary,
+    description=settings.simple_jwt.introspection_description,
+    tags=settings.simple_jwt.tags,
+    status_code=status.HTTP_200_OK,
+)
+async def introspect_token(data: IntrospectionIn = Form()) -> JSONResponse:  # type: ignore[assignment]
+    """
+    Introspects the `token` of a form and returns if it is active, with its claims, as
+    described by the RFC 7662.
+    """
+    return JSONResponse(await introspect(data.token))
+
+
+@post(
+    path=settings.simple_jwt.introspection_batch_url,
+    summary=settings.simple_jwt.introspection_batch_summary,
+    description=settings.simple_jwt.introspection_batch_description,
+    tags=settings.simple_jwt.tags,
+    status_code=status.HTTP_200_OK,
+)
+async def introspect_tokens(data: IntrospectionBatchIn) -> JSONResponse:
+    """
+    Introspects the `tokens` and returns `{"results": [...]}`, in the same order.
+    """
+    runtime = get_runtime_config()
+
+    if len(data.tokens) > runtime.config.introspection_max_batch:
+        raise ValidationErrorException(
+            detail=f"At most {runtime.config.introspection_max_batch} tokens can be "
+            "introspected at once."
+        )
+    return JSONResponse({"results": await introspect_many(data.tokens, runtime)})
@@ -0,0 +1,110 @@
+import threading
+import time
+
+import anyio
+import pytest
+from esmerald.exceptions import ImproperlyConfigured, ServiceUnavailable
+
+from esmerald_simple_jwt.admission import AdmissionControl, DelayController
+from esmerald_simple_jwt.hashing import HashingExecutor
+
+pytestmark = pytest.mark.anyio
+
+
+def test_short_bursts_are_not_an_overload():
+    delay = DelayController(target=0.01, interval=0.05)
+
+    delay.observe(0.5)
+    assert not delay.overloaded
+
+    delay.observe(0.001)
+    delay.observe(0.5)
+    assert not delay.overloaded
+
+
+def test_standing_queue_is_an_overload():
+    delay = DelayController(target=0.01, interval=0.01)
+
+    delay.observe(0.5)
+    time.sleep(0.02)
+    delay.observe(0.5)
+    assert delay.overloaded
+
+    delay.observe(0.001)
+    assert not delay.overloaded
+
+
+def test_invalid_limits():
+    with pytest.raises(ImproperlyConfigured):
+        AdmissionControl(HashingExecutor(), max_inflight=0)
+    with pytest.raises(ImproperlyConfigured):
+        AdmissionControl(HashingExecutor(), max_queue=0)
+
+
+def test_inflight_is_bounded():
+    admission = AdmissionControl(HashingExecutor(), max_inflight=1, retry_after=2)
+
+    with admission.admit():
+        with pytest.raises(ServiceUnavailable) as raised:
+            with admission.admit():
+                ...
+
+    assert raised.value.headers["Retry-After"] == "2"
+    assert admission.inflight == 0
+    assert admission.rejected == 1
+
+    with admission.admit():
+        ...
+
+
+async def test_hashing_queue_is_bounded():
+    delay = DelayController(target=0.01, interval=0.01)
+    hashing = HashingExecutor(concurrency=1, delay=delay)
+    admission = AdmissionControl(hashing, max_queue=2, delay=delay)
+    release = threading.Event()
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(3):
+            tg.start_soon(hashing.run, release.wait)
+        await anyio.sleep(0.05)
+
+        assert hashing.waiting == 2
+        assert admission.overloaded
+        release.set()
+
+    assert not admission.overloaded
+
+
+async def test_smallest_hashing_queue():
+    hashing = HashingExecutor(concurrency=1)
+    admission = AdmissionControl(hashing, max_queue=1)
+    release = threading.Event()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(hashing.run, release.wait)
+        await anyio.sleep(0.05)
+
+        # Hashing but nothing waiting, the signins are admitted.
+        assert hashing.waiting == 0
+        assert not admission.overloaded
+
+        tg.start_soon(hashing.run, release.wait)
+        await anyio.sleep(0.05)
+
+        assert hashing.waiting == 1
+        assert admission.overloaded
+        release.set()
+
+
+async def test_delay_is_reported_by_the_executor():
+    delay = DelayController(target=0.01, interval=0.0)
+    hashing = HashingExecutor(concurrency=1, delay=delay)
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(3):
+            tg.start_soon(hashing.run, time.sleep, 0.03)
+
+    assert delay.overloaded
+
+    # The queue is empty, the overload is over.
+    assert not AdmissionControl(hashing, delay=delay).overloaded
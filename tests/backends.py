@@ -19,11 +19,13 @@ class EmailBackendAuth(BackendEmailAuthentication):
         try:
             user: User = await User.objects.get(email=self.email)
         except ObjectNotFound:
-            # Run the default password hasher once to reduce the timing
+            # Check the password against a dummy hash to reduce the timing
             # difference between an existing and a nonexistent user.
-            await User().set_password(self.password)
+            await self.check_dummy_password(self.password)
         else:
-            is_password_valid = await user.check_password(self.password)
+            is_password_valid = await self.check_password(
+                self.password, user.password, setter=user.set_password
+            )
             if is_password_valid and self.is_user_able_to_authenticate(user):
                 # The lifetime of a token should be short, let us make 5 minutes.
                 # You can use also the access_token_lifetime from the JWT config directly
@@ -61,5 +63,5 @@ class EmailBackendAuth(BackendEmailAuthentication):
         return token.encode(
             key=settings.simple_jwt.signing_key,
             algorithm=settings.simple_jwt.algorithm,
-            token_type=token_type,
+            claims_extra={"token_type": token_type, **self.project_claims(user)},
         )
@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+
+import anyio
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from esmerald.exceptions import ImproperlyConfigured
+from jwt.exceptions import InvalidSignatureError
+from tests.settings import SIGNING_KEY
+
+from esmerald_simple_jwt.crypto import CryptoExecutor
+from esmerald_simple_jwt.keys import KeyRing, load_key_material
+from esmerald_simple_jwt.token import TokenDecoder, TokenEncoder
+
+pytestmark = pytest.mark.anyio
+
+PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+PRIVATE_PEM = PRIVATE_KEY.private_bytes(
+    encoding=serialization.Encoding.PEM,
+    format=serialization.PrivateFormat.PKCS8,
+    encryption_algorithm=serialization.NoEncryption(),
+).decode()
+PUBLIC_PEM = PRIVATE_KEY.public_key().public_bytes(
+    encoding=serialization.Encoding.PEM,
+    format=serialization.PublicFormat.SubjectPublicKeyInfo,
+)
+
+
+def create(algorithm="RS256", key=PRIVATE_PEM, kid="rsa", **kwargs):
+    keyring = KeyRing(load_key_material(algorithm, key, kid=kid))
+    executor = CryptoExecutor(keyring, **kwargs)
+    keys = keyring.active
+    encoder = TokenEncoder(keys.signing_key, algorithm, kid=kid, executor=executor)
+    decoder = TokenDecoder(keyring, executor=executor)
+    return executor, encoder, decoder
+
+
+def claims(sub="1"):
+    return {"sub": sub, "exp": datetime.now() + timedelta(minutes=5)}
+
+
+async def gather(func, values):
+    results = {}
+
+    async def run(value):
+        results[value] = await func(value)
+
+    async with anyio.create_task_group() as tg:
+        for value in values:
+            tg.start_soon(run, value)
+    return [results[value] for value in values]
+
+
+async def test_concurrent_signatures_are_batched():
+    executor, encoder, decoder = create(max_batch=8)
+
+    tokens = await gather(lambda sub: encoder.aencode(claims(sub)), [str(i) for i in range(20)])
+
+    assert executor.batches == 3
+    for i, token in enumerate(tokens):
+        assert jwt.decode(token, PUBLIC_PEM, algorithms=["RS256"])["sub"] == str(i)
+
+    decoded = await gather(decoder.adecode, tokens)
+    assert [item.sub for item in decoded] == [str(i) for i in range(20)]
+    assert executor.batches == 6
+
+
+async def test_invalid_signatures_are_rejected():
+    executor, encoder, decoder = create()
+    token = await encoder.aencode(claims())
+    message, signature = token.rsplit(".", 1)
+    forged = f"{message}.{signature[::-1]}"
+
+    with pytest.raises(InvalidSignatureError):
+        await decoder.adecode(forged)
+
+
+async def test_hmac_runs_inline():
+    executor, encoder, decoder = create("HS256", SIGNING_KEY, kid=None)
+
+    token = await encoder.aencode(claims())
+
+    assert token == encoder.encode(claims())
+    assert (await decoder.adecode(token)).sub == "1"
+    assert executor.batches == 0
+
+
+async def test_process_executor():
+    executor, encoder, decoder = create(kind="process", workers=2)
+    try:
+        tokens = await gather(lambda sub: encoder.aencode(claims(sub)), ["1", "2", "3"])
+        decoded = await gather(decoder.adecode, tokens)
+    finally:
+        executor.shutdown()
+
+    assert [item.sub for item in decoded] == ["1", "2", "3"]
+    assert executor.batches == 2
+
+
+def test_invalid_configuration():
+    keyring = KeyRing(load_key_material("RS256", PRIVATE_PEM))
+
+    with pytest.raises(ImproperlyConfigured):
+        CryptoExecutor(keyring, kind="fiber")
+    with pytest.raises(ImproperlyConfigured):
+        CryptoExecutor(keyring, workers=0)
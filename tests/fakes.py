@@ -0,0 +1,43 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class FakeRedis:
+    """
+    Implements, in memory, the subset of the Redis commands used by the stores.
+
+    The scripts are not run, `eval` records the call and returns the `result` given.
+    """
+
+    def __init__(self, result: Any = None) -> None:
+        self.result = result
+        self.data: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self.calls: List[Tuple[Any, ...]] = []
+
+    def lookup(self, name: str) -> Any:
+        value, expires = self.data.get(name, (None, None))
+        if expires is not None and expires <= time.time():
+            return None
+        return value
+
+    async def get(self, name):
+        self.calls.append(("get", name))
+        return self.lookup(name)
+
+    async def set(self, name, value, ex=None):
+        self.calls.append(("set", name, value, ex))
+        self.data[name] = (value, time.time() + ex if ex else None)
+
+    async def exists(self, *names):
+        self.calls.append(("exists", *names))
+        return sum(1 for name in names if self.lookup(name) is not None)
+
+    async def incr(self, name, amount=1):
+        self.calls.append(("incr", name, amount))
+        value = int(self.lookup(name) or 0) + amount
+        self.data[name] = (str(value).encode(), None)
+        return value
+
+    async def eval(self, script, numkeys, *keys_and_args):
+        self.calls.append(("eval", script, numkeys, *keys_and_args))
+        return self.result
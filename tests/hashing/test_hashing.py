@@ -0,0 +1,197 @@
+import threading
+import time
+
+import anyio
+import pytest
+from esmerald import Esmerald, Include
+from esmerald.exceptions import ImproperlyConfigured, NotAuthorized, ServiceUnavailable
+from httpx import ASGITransport, AsyncClient
+from tests.settings import simple_jwt_settings
+
+from esmerald_simple_jwt import hashing as hashing_module
+from esmerald_simple_jwt.backends import BackendEmailAuthentication
+from esmerald_simple_jwt.hashing import HashingExecutor, hash_password, verify_password
+
+pytestmark = pytest.mark.anyio
+
+
+def test_hash_and_verify_password():
+    encoded = hash_password("p4ssw0rd")
+
+    assert verify_password("p4ssw0rd", encoded) == (True, False)
+    assert verify_password("wrong", encoded)[0] is False
+    assert verify_password("p4ssw0rd", "gibberish") == (False, False)
+
+
+def test_invalid_executor():
+    with pytest.raises(ImproperlyConfigured):
+        HashingExecutor(kind="fibers")
+
+    with pytest.raises(ImproperlyConfigured):
+        HashingExecutor(concurrency=0)
+
+
+async def test_runs_outside_the_event_loop():
+    executor = HashingExecutor()
+
+    thread = await executor.run(threading.get_ident)
+
+    assert thread != threading.get_ident()
+    assert executor.pending == 0
+
+
+async def test_process_executor():
+    executor = HashingExecutor(kind="process", concurrency=1)
+
+    encoded = await executor.run(hash_password, "p4ssw0rd")
+
+    assert await executor.run(verify_password, "p4ssw0rd", encoded) == (True, False)
+    assert (await executor.run(verify_password, "wrong", encoded))[0] is False
+    assert executor.pending == 0
+
+
+async def test_concurrency_is_bounded():
+    executor = HashingExecutor(concurrency=2, max_pending=10)
+    running = []
+    peak = []
+
+    def work():
+        running.append(1)
+        peak.append(len(running))
+        time.sleep(0.02)
+        running.pop()
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(6):
+            tg.start_soon(executor.run, work)
+
+    assert max(peak) <= 2
+
+
+async def test_full_queue_is_rejected():
+    executor = HashingExecutor(concurrency=1, max_pending=1, retry_after=3)
+    release = threading.Event()
+    errors = []
+
+    async def call():
+        try:
+            await executor.run(release.wait)
+        except ServiceUnavailable as e:
+            errors.append(e)
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(call)
+        tg.start_soon(call)
+        await anyio.sleep(0.05)
+        await call()
+        release.set()
+
+    assert len(errors) == 1
+    assert errors[0].status_code == 503
+    assert errors[0].headers["Retry-After"] == "3"
+    assert executor.pending == 0
+
+
+async def test_backend_helpers():
+    backend = BackendEmailAuthentication(email="foo@bar.com", password="p4ssw0rd")
+    updated = []
+
+    async def setter(password):
+        updated.append(password)
+
+    encoded = await backend.make_password(backend.password)
+
+    assert await backend.check_password(backend.password, encoded, setter=setter)
+    assert not await backend.check_password("wrong", encoded, setter=setter)
+    assert updated == []
+
+
+async def test_dummy_hash_is_made_once():
+    executor = HashingExecutor()
+
+    dummy = await executor.dummy_hash()
+
+    assert await executor.dummy_hash() is dummy
+    assert verify_password("p4ssw0rd", dummy) == (False, False)
+
+
+async def test_dummy_hash_is_made_once_concurrently(monkeypatch):
+    executor = HashingExecutor()
+    calls = []
+    run = executor.run
+
+    async def spy(func, *args):
+        calls.append(func)
+        await anyio.sleep(0.01)
+        return await run(func, *args)
+
+    monkeypatch.setattr(executor, "run", spy)
+    hashes = []
+
+    async def dummy_hash():
+        hashes.append(await executor.dummy_hash())
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(3):
+            tg.start_soon(dummy_hash)
+
+    assert calls == [hash_password]
+    assert len(set(hashes)) == 1
+
+
+async def test_check_dummy_password():
+    backend = BackendEmailAuthentication(email="foo@bar.com", password="p4ssw0rd")
+    hashing = backend.runtime.services.hashing
+    calls = []
+    run = hashing.run
+
+    async def spy(func, *args):
+        calls.append(func)
+        return await run(func, *args)
+
+    hashing.run = spy
+    try:
+        assert await backend.check_dummy_password(backend.password) is False
+        assert await backend.check_dummy_password(backend.password) is False
+    finally:
+        del hashing.run
+
+    # The dummy hash is made on the first miss only, then only verified.
+    assert calls.count(verify_password) == 2
+    assert calls.count(hash_password) <= 1
+
+
+class UnknownUserBackend(BackendEmailAuthentication):
+    async def authenticate(self):
+        await self.check_dummy_password(self.password)
+        raise NotAuthorized(detail="Invalid credentials.")
+
+
+async def test_dummy_hash_without_the_extension(monkeypatch):
+    hashes = []
+
+    def spy(password):
+        hashes.append(password)
+        time.sleep(0.05)
+        return hash_password(password)
+
+    monkeypatch.setattr(hashing_module, "hash_password", spy)
+    app = Esmerald(
+        routes=[Include(path="/simple-jwt", namespace="esmerald_simple_jwt.urls")],
+        settings_module=simple_jwt_settings(backend_authentication=UnknownUserBackend),
+    )
+    data = {"email": "foo@bar.com", "password": "p4ssw0rd"}
+    responses = []
+
+    async with AsyncClient(transport=ASGITransport(app), base_url="http://test") as client:
+
+        async def signin():
+            responses.append(await client.post("/simple-jwt/signin", json=data))
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(3):
+                tg.start_soon(signin)
+
+    # Made by the first unknown user, the others wait for it.
+    assert [response.status_code for response in responses] == [401] * 3
+    assert len(hashes) == 1
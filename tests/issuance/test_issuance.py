@@ -0,0 +1,98 @@
+import io
+import json
+import time
+
+import jwt
+import pytest
+from tests.settings import SIGNING_KEY, simple_jwt_settings
+
+from esmerald_simple_jwt.cli import issue, main, parse_subjects
+from esmerald_simple_jwt.issuance import issue_many
+from esmerald_simple_jwt.revocation import InMemoryTokenVersionStore
+from esmerald_simple_jwt.runtime import get_runtime_config
+
+pytestmark = pytest.mark.anyio
+
+
+IssuanceSettings = simple_jwt_settings()
+
+
+def decode(token):
+    return jwt.decode(token, SIGNING_KEY, algorithms=["HS256"])
+
+
+async def collect(subjects, runtime, **kwargs):
+    return [item async for item in issue_many(subjects, runtime, **kwargs)]
+
+
+async def test_issue_many():
+    runtime = get_runtime_config(IssuanceSettings())
+
+    issued = await collect(
+        ["device-1", ("device-2", {"scope": "read", "token_type": "ignored"})],
+        runtime,
+        batch_size=1,
+    )
+
+    assert [sub for sub, _ in issued] == ["device-1", "device-2"]
+    access, refresh = decode(issued[1][1].access_token), decode(issued[1][1].refresh_token)
+    assert access["sub"] == refresh["sub"] == "device-2"
+    assert access["scope"] == refresh["scope"] == "read"
+    assert access["token_type"] == "access_token"
+    assert refresh["token_type"] == "refresh_token"
+    assert "jti" in refresh and "jti" not in access
+    assert access["exp"] == access["iat"] + 300
+    assert refresh["exp"] > access["exp"]
+
+
+async def test_issue_many_stamps_the_token_version():
+    app_settings = IssuanceSettings()
+    app_settings.simple_jwt.token_version_store = store = InMemoryTokenVersionStore()
+    await store.bump("device-1")
+
+    async def subjects():
+        yield "device-1"
+
+    [(_, tokens)] = await collect(subjects(), get_runtime_config(app_settings))
+
+    assert decode(tokens.refresh_token)["ver"] == 1
+
+
+async def test_issue_ndjson():
+    lines = io.StringIO('device-1\n\n{"sub": "device-2", "claims": {"exp": 2000000000}}\n')
+    output = io.StringIO()
+
+    assert await issue(lines, output, IssuanceSettings()) == 2
+
+    rows = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [row["sub"] for row in rows] == ["device-1", "device-2"]
+    assert decode(rows[1]["access_token"])["exp"] == 2000000000
+    assert decode(rows[0]["refresh_token"])["exp"] > time.time()
+
+
+def test_invalid_subjects():
+    with pytest.raises(ValueError):
+        list(parse_subjects(iter(['{"claims": {}}'])))
+
+
+def test_cli(tmp_path, capsys):
+    source, target = tmp_path / "subjects.txt", tmp_path / "tokens.ndjson"
+    source.write_text("".join(f"device-{i}\n" for i in range(10)))
+
+    code = main(
+        [
+            "issue",
+            "-i",
+            str(source),
+            "-o",
+            str(target),
+            "--settings",
+            "tests.issuance.test_issuance.IssuanceSettings",
+            "--batch-size",
+            "3",
+        ]
+    )
+
+    assert code == 0
+    assert len(target.read_text().splitlines()) == 10
+    assert "10 subjects" in capsys.readouterr().err
@@ -0,0 +1,85 @@
+import json
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from esmerald import Esmerald, Gateway
+from esmerald.testclient import EsmeraldTestClient
+from tests.settings import TestSettings
+
+from esmerald_simple_jwt.backends import BackendEmailAuthentication, RefreshAuthentication
+from esmerald_simple_jwt.config import SimpleJWT, VerifyingKey
+from esmerald_simple_jwt.views import jwks
+
+
+def private_pem(key) -> str:
+    return key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+
+
+simple_jwt = SimpleJWT(
+    signing_key=private_pem(rsa.generate_private_key(public_exponent=65537, key_size=2048)),
+    algorithm="RS256",
+    signing_key_id="rsa",
+    verify_only_keys=[
+        VerifyingKey(
+            kid="ec", key=private_pem(ec.generate_private_key(ec.SECP256R1())), algorithm="ES256"
+        ),
+        VerifyingKey(kid="hmac", key="a-secret-that-must-never-be-published", algorithm="HS256"),
+    ],
+    enable_jwks=True,
+    jwks_max_age=600,
+    backend_authentication=BackendEmailAuthentication,
+    backend_refresh=RefreshAuthentication,
+)
+
+
+class JWKSSettings(TestSettings):
+    @property
+    def simple_jwt(self) -> SimpleJWT:
+        return simple_jwt
+
+
+def get_client():
+    return EsmeraldTestClient(
+        Esmerald(routes=[Gateway(handler=jwks)], settings_module=JWKSSettings)
+    )
+
+
+def test_jwks_publishes_the_public_keys():
+    client = get_client()
+
+    response = client.get("/.well-known/jwks.json")
+    keys = {key["kid"]: key for key in response.json()["keys"]}
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "public, max-age=600"
+    assert response.headers["etag"].startswith('"')
+    assert set(keys) == {"rsa", "ec"}
+    assert keys["rsa"]["alg"] == "RS256"
+    assert "d" not in keys["rsa"]
+    assert "d" not in keys["ec"]
+
+
+def test_jwks_body_is_serialized_once():
+    keyring = simple_jwt.load_keyring()
+
+    assert keyring.jwks() is keyring.jwks()
+    assert json.loads(keyring.jwks().body)["keys"]
+
+
+def test_jwks_not_modified():
+    client = get_client()
+    etag = client.get("/.well-known/jwks.json").headers["etag"]
+
+    response = client.get("/.well-known/jwks.json", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    response = client.get("/.well-known/jwks.json", headers={"If-None-Match": '"other"'})
+
+    assert response.status_code == 200
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta
+
+import jwt
+import pytest
+from esmerald.conf import monkay
+from esmerald.exceptions import AuthenticationError, ImproperlyConfigured
+from tests.settings import TestSettings
+
+from esmerald_simple_jwt.backends import BackendEmailAuthentication, RefreshAuthentication
+from esmerald_simple_jwt.config import SimpleJWT, VerifyingKey
+from esmerald_simple_jwt.schemas import RefreshToken
+from esmerald_simple_jwt.token import Token
+
+pytestmark = pytest.mark.anyio
+
+NEW_KEY = "a-new-signing-key-long-enough-for-hs256"
+OLD_KEY = "an-old-signing-key-long-enough-for-hs256"
+
+
+def create_settings(**kwargs) -> TestSettings:
+    app_settings = TestSettings()
+    app_settings.simple_jwt = SimpleJWT(
+        backend_authentication=BackendEmailAuthentication,
+        backend_refresh=RefreshAuthentication,
+        **kwargs,
+    )
+    return app_settings
+
+
+def create_refresh_token(key: str, kid: str = None) -> str:
+    token = Token(sub="1", exp=datetime.now() + timedelta(days=1))
+    return token.encode(
+        key=key,
+        algorithm="HS256",
+        claims_extra={"token_type": "refresh_token"},
+        headers={"kid": kid} if kid else None,
+    )
+
+
+async def refresh(app_settings: TestSettings, refresh_token: str) -> str:
+    with monkay.with_settings(app_settings):
+        backend = RefreshAuthentication(token=RefreshToken(refresh_token=refresh_token))
+        return (await backend.refresh()).access_token
+
+
+async def test_tokens_carry_the_kid():
+    app_settings = create_settings(signing_key=NEW_KEY, signing_key_id="new")
+
+    access_token = await refresh(app_settings, create_refresh_token(NEW_KEY, kid="new"))
+
+    assert jwt.get_unverified_header(access_token)["kid"] == "new"
+
+
+async def test_verify_only_keys_accept_previous_tokens():
+    app_settings = create_settings(
+        signing_key=NEW_KEY,
+        signing_key_id="new",
+        verify_only_keys=[VerifyingKey(kid="old", key=OLD_KEY)],
+    )
+
+    access_token = await refresh(app_settings, create_refresh_token(OLD_KEY, kid="old"))
+
+    assert jwt.get_unverified_header(access_token)["kid"] == "new"
+    assert Token.decode(token=access_token, key=NEW_KEY, algorithms=["HS256"]).sub == "1"
+
+
+async def test_tokens_without_kid_use_the_active_key():
+    app_settings = create_settings(signing_key=NEW_KEY, signing_key_id="new")
+
+    assert await refresh(app_settings, create_refresh_token(NEW_KEY))
+
+
+async def test_tokens_without_kid_fall_back_to_the_verify_only_keys():
+    app_settings = create_settings(
+        signing_key=NEW_KEY,
+        signing_key_id="new",
+        verify_only_keys=[VerifyingKey(kid="old", key=OLD_KEY)],
+    )
+
+    assert await refresh(app_settings, create_refresh_token(OLD_KEY))
+
+    with pytest.raises(AuthenticationError):
+        await refresh(app_settings, create_refresh_token("another-key-long-enough-for-hs256"))
+
+
+def test_keys_to_try():
+    keyring = create_settings(
+        signing_key=NEW_KEY,
+        signing_key_id="new",
+        verify_only_keys=[VerifyingKey(kid="old", key=OLD_KEY)],
+    ).simple_jwt.load_keyring()
+
+    assert [key.kid for key in keyring.candidates(None, "HS256")] == ["new", "old"]
+    assert [key.kid for key in keyring.candidates("old", "HS256")] == ["old"]
+    assert keyring.candidates(None, "RS256") == []
+    assert [key.kid for key in keyring.for_token(create_refresh_token(OLD_KEY))] == ["new", "old"]
+
+
+async def test_unknown_kid_is_rejected():
+    app_settings = create_settings(signing_key=NEW_KEY, signing_key_id="new")
+
+    with pytest.raises(AuthenticationError):
+        await refresh(app_settings, create_refresh_token(NEW_KEY, kid="unknown"))
+
+
+async def test_kid_is_bound_to_its_key():
+    app_settings = create_settings(
+        signing_key=NEW_KEY,
+        signing_key_id="new",
+        verify_only_keys=[VerifyingKey(kid="old", key=OLD_KEY)],
+    )
+
+    with pytest.raises(AuthenticationError):
+        await refresh(app_settings, create_refresh_token(NEW_KEY, kid="old"))
+
+
+def test_duplicate_kid():
+    simple_jwt = SimpleJWT(
+        signing_key=NEW_KEY,
+        signing_key_id="new",
+        verify_only_keys=[VerifyingKey(kid="new", key=OLD_KEY)],
+        backend_authentication=BackendEmailAuthentication,
+        backend_refresh=RefreshAuthentication,
+    )
+
+    with pytest.raises(ImproperlyConfigured):
+        simple_jwt.load_keyring()
@@ -0,0 +1,101 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from esmerald.exceptions import ImproperlyConfigured
+from jwt.algorithms import ECAlgorithm
+
+from esmerald_simple_jwt.keys import load_key_material
+from esmerald_simple_jwt.token import Token
+
+
+def private_pem(key) -> str:
+    return key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+
+
+def public_pem(key) -> str:
+    return (
+        key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+
+
+def test_hmac_keys_are_bytes():
+    keys = load_key_material("HS256", "a-signing-secret-long-enough-for-hs256")
+
+    assert keys.is_symmetric
+    assert keys.signing_key == b"a-signing-secret-long-enough-for-hs256"
+    assert keys.verifying_key is keys.signing_key
+
+
+def test_hmac_secret_looking_like_json():
+    secret = '{"a-signing-secret": "long-enough-for-hs256"}'
+
+    keys = load_key_material("HS256", secret)
+
+    assert keys.signing_key == secret.encode()
+    assert load_key_material("HS256", "{not-json-but-a-long-signing-secret}").is_symmetric
+
+
+def test_hmac_jwk():
+    jwk = json.dumps({"kty": "oct", "k": "YS1zaWduaW5nLXNlY3JldC1sb25nLWVub3VnaC1mb3ItaHMyNTY"})
+
+    keys = load_key_material("HS256", jwk)
+
+    assert keys.signing_key == b"a-signing-secret-long-enough-for-hs256"
+
+
+def test_rsa_pem_is_parsed_once():
+    pem = private_pem(rsa.generate_private_key(public_exponent=65537, key_size=2048))
+
+    keys = load_key_material("RS256", pem)
+
+    assert isinstance(keys.signing_key, rsa.RSAPrivateKey)
+    assert isinstance(keys.verifying_key, rsa.RSAPublicKey)
+    assert load_key_material("RS256", pem) is keys
+
+    token = Token(sub="1", exp=datetime.now() + timedelta(minutes=5), token_type="access_token")
+    encoded = token.encode(key=keys.signing_key, algorithm="RS256")
+    decoded = Token.decode(token=encoded, key=keys.verifying_key, algorithms=["RS256"])
+
+    assert decoded.sub == "1"
+    assert decoded.token_type == "access_token"
+
+
+def test_separate_verifying_key():
+    private = ec.generate_private_key(ec.SECP256R1())
+
+    keys = load_key_material("ES256", private_pem(private), public_pem(private))
+
+    assert isinstance(keys.verifying_key, ec.EllipticCurvePublicKey)
+
+
+def test_jwk_keys():
+    private = ec.generate_private_key(ec.SECP256R1())
+    jwk = ECAlgorithm.to_jwk(private)
+
+    keys = load_key_material("ES256", jwk)
+    token = Token(sub="2", exp=datetime.now() + timedelta(minutes=5)).encode(
+        key=keys.signing_key, algorithm="ES256"
+    )
+
+    assert json.loads(jwk)["kty"] == "EC"
+    assert Token.decode(token=token, key=keys.verifying_key, algorithms=["ES256"]).sub == "2"
+
+
+def test_invalid_keys():
+    with pytest.raises(ImproperlyConfigured):
+        load_key_material("RS256", "not a pem")
+
+    with pytest.raises(ImproperlyConfigured):
+        load_key_material("XX256", "a-signing-secret-long-enough-for-hs256")
@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+from enum import Enum
+from types import SimpleNamespace
+
+import pytest
+from esmerald.exceptions import ImproperlyConfigured
+from pydantic import BaseModel
+from tests.settings import SIGNING_KEY
+
+from esmerald_simple_jwt.keys import KeyRing, load_key_material
+from esmerald_simple_jwt.projection import ClaimsProjection
+from esmerald_simple_jwt.token import TokenDecoder, TokenEncoder
+
+
+class Role(Enum):
+    ADMIN = "admin"
+
+
+class Principal(BaseModel):
+    role: str
+    id: int
+
+
+def make_user(**kwargs):
+    defaults = {"role": Role.ADMIN, "tenant": SimpleNamespace(id=7), "email": None}
+    return SimpleNamespace(**{**defaults, **kwargs})
+
+
+def test_project_short_names_and_dotted_paths():
+    projection = ClaimsProjection({"rol": "role", "tid": "tenant.id", "eml": "email"})
+
+    assert projection.project(make_user()) == {"rol": "admin", "tid": 7}
+
+
+def test_project_converts_values():
+    projection = ClaimsProjection({"grp": "groups", "tid": "tenant"})
+    user = {"groups": ("a", "b"), "tenant": SimpleNamespace()}
+
+    claims = projection.project(user)
+
+    assert claims["grp"] == ["a", "b"]
+    assert isinstance(claims["tid"], str)
+
+
+def test_reserved_claims():
+    with pytest.raises(ImproperlyConfigured):
+        ClaimsProjection({"sub": "id"})
+
+
+def test_size_limit():
+    projection = ClaimsProjection({"bio": "bio"}, max_size=32)
+
+    assert projection.project(make_user(bio="short"))
+    with pytest.raises(ImproperlyConfigured):
+        projection.project(make_user(bio="x" * 64))
+
+
+def test_carry_and_load_verified_claims():
+    projection = ClaimsProjection({"rol": "role", "tid": "tenant.id"})
+    token = TokenEncoder(SIGNING_KEY, "HS256").encode(
+        {"sub": "1", "exp": 2**31, **projection.project(make_user())}
+    )
+
+    claims = TokenDecoder(KeyRing(load_key_material("HS256", SIGNING_KEY))).decode(token)
+
+    assert projection.carry(claims) == {"rol": "admin", "tid": 7}
+    assert projection.load(claims) == {"role": "admin", "id": 7}
+    assert projection.load(claims, Principal) == Principal(role="admin", id=7)
+
+    @dataclass
+    class Partial:
+        role: str
+
+    assert ClaimsProjection({"rol": "role"}).load(claims, Partial) == Partial(role="admin")
@@ -0,0 +1,124 @@
+import time
+
+import pytest
+from esmerald.exceptions import ImproperlyConfigured
+
+from esmerald_simple_jwt.revocation import (
+    BloomFilterRevocationStore,
+    CountingBloomFilter,
+    InMemoryRevocationStore,
+    RevocationStore,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+class CountingStore(InMemoryRevocationStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups = 0
+
+    async def is_revoked(self, jti: str) -> bool:
+        self.lookups += 1
+        return await super().is_revoked(jti)
+
+
+class UnlistedStore(RevocationStore):
+    """
+    A store without `entries()`, like the `RedisRevocationStore`.
+    """
+
+    def __init__(self) -> None:
+        self.revoked: set = set()
+
+    async def revoke(self, jti, expires_at) -> None:
+        self.revoked.add(jti)
+
+    async def is_revoked(self, jti: str) -> bool:
+        return jti in self.revoked
+
+
+def test_counting_bloom_filter():
+    bloom = CountingBloomFilter(capacity=1000, fp_rate=0.01)
+
+    bloom.add("first")
+    bloom.add("second")
+    bloom.remove("first")
+
+    assert "first" not in bloom
+    assert "second" in bloom
+    assert len(bloom) == 1
+    assert bloom.memory == bloom.size
+
+
+def test_counting_bloom_filter_false_positive_rate():
+    bloom = CountingBloomFilter(capacity=1000, fp_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"revoked-{i}")
+
+    false_positives = sum(1 for i in range(10_000) if f"valid-{i}" in bloom)
+
+    assert false_positives < 300
+
+
+async def test_filter_skips_the_store():
+    store = CountingStore()
+    filtered = BloomFilterRevocationStore(store, capacity=100)
+
+    await filtered.revoke("revoked", time.time() + 60)
+
+    assert await filtered.is_revoked("revoked")
+    assert not await filtered.is_revoked("valid")
+    assert store.lookups == 1
+    assert filtered.stats()["hits"] == 1
+    assert filtered.stats()["misses"] == 1
+
+
+async def test_filter_syncs_the_entries_of_the_store():
+    store = CountingStore()
+    filtered = BloomFilterRevocationStore(store, capacity=100, sync_interval=0)
+
+    # Revoked by another process, directly in the store.
+    await store.revoke("revoked", time.time() + 60)
+
+    assert await filtered.is_revoked("revoked")
+    assert filtered.stats()["entries"] == 1
+
+
+async def test_filter_removes_expired_entries():
+    filtered = BloomFilterRevocationStore(InMemoryRevocationStore(), capacity=100)
+    await filtered.revoke("revoked", time.time() + 60)
+
+    filtered.evict(now=time.time() + 120)
+
+    assert "revoked" not in filtered.filter
+    assert filtered.stats()["entries"] == 0
+
+
+async def test_filter_grows_over_capacity():
+    filtered = BloomFilterRevocationStore(InMemoryRevocationStore(), capacity=10)
+
+    for i in range(25):
+        await filtered.revoke(f"revoked-{i}", time.time() + 60)
+
+    assert filtered.filter.capacity == 40
+    assert all(f"revoked-{i}" in filtered.filter for i in range(25))
+
+
+async def test_filter_is_bypassed_without_entries():
+    store = UnlistedStore()
+    filtered = BloomFilterRevocationStore(store, capacity=100)
+
+    # Revoked by another process, the filter cannot know about it.
+    await store.revoke("revoked", time.time() + 60)
+
+    assert await filtered.is_revoked("revoked")
+    assert not await filtered.is_revoked("valid")
+    assert filtered.stats()["bypassed"] is True
+    assert filtered.stats()["hits"] == 0
+
+
+@pytest.mark.parametrize("sync_interval", [-1, 61])
+def test_filter_bounds_the_sync_interval(sync_interval):
+    with pytest.raises(ImproperlyConfigured):
+        BloomFilterRevocationStore(InMemoryRevocationStore(), sync_interval=sync_interval)
@@ -0,0 +1,141 @@
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from esmerald.conf import monkay
+from esmerald.exceptions import NotAuthorized
+from tests.fakes import FakeRedis
+from tests.settings import SIGNING_KEY, TestSettings, simple_jwt_settings
+
+from esmerald_simple_jwt.backends import RefreshAuthentication
+from esmerald_simple_jwt.revocation import (
+    CachedRevocationStore,
+    InMemoryRevocationStore,
+    InMemoryTokenFamilyStore,
+    RedisRevocationStore,
+    SQLiteRevocationStore,
+    SQLiteTokenFamilyStore,
+)
+from esmerald_simple_jwt.schemas import RefreshToken
+from esmerald_simple_jwt.token import Token
+
+pytestmark = pytest.mark.anyio
+
+
+class CountingStore(InMemoryRevocationStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups = 0
+
+    async def is_revoked(self, jti: str) -> bool:
+        self.lookups += 1
+        return await super().is_revoked(jti)
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryRevocationStore()
+    if request.param == "sqlite":
+        return SQLiteRevocationStore(str(tmp_path / "revoked.sqlite"))
+    return RedisRevocationStore(FakeRedis())
+
+
+async def test_stores(store):
+    await store.revoke("revoked", datetime.now() + timedelta(minutes=5))
+    await store.revoke("expired", time.time() - 1)
+
+    assert await store.is_revoked("revoked")
+    assert not await store.is_revoked("expired")
+    assert not await store.is_revoked("unknown")
+
+
+async def test_in_memory_store_evicts_expired_entries():
+    store = InMemoryRevocationStore()
+    await store.revoke("first", time.time() + 60)
+    await store.revoke("second", time.time() + 120)
+
+    store.evict(now=time.time() + 90)
+
+    assert len(store) == 1
+    assert await store.is_revoked("second")
+
+
+async def test_cache_results():
+    counting = CountingStore()
+    store = CachedRevocationStore(counting, ttl=60)
+
+    assert not await store.is_revoked("jti")
+    assert not await store.is_revoked("jti")
+    assert counting.lookups == 1
+
+    await store.revoke("jti", time.time() + 60)
+
+    assert await store.is_revoked("jti")
+    assert counting.lookups == 1
+
+
+def create_settings(store) -> TestSettings:
+    return simple_jwt_settings(revocation_store=store)()
+
+
+def create_refresh_token(**kwargs) -> RefreshToken:
+    token = Token(sub="1", exp=datetime.now() + timedelta(days=1), **kwargs)
+    refresh_token = token.encode(
+        key=SIGNING_KEY, algorithm="HS256", claims_extra={"token_type": "refresh_token"}
+    )
+    return RefreshToken(refresh_token=refresh_token)
+
+
+async def test_refresh_rejects_revoked_tokens():
+    app_settings = create_settings(InMemoryRevocationStore())
+    token = create_refresh_token(jti=uuid4().hex)
+
+    with monkay.with_settings(app_settings):
+        assert await RefreshAuthentication(token=token).refresh()
+
+        await RefreshAuthentication(token=token).revoke()
+
+        with pytest.raises(NotAuthorized):
+            await RefreshAuthentication(token=token).refresh()
+
+
+async def test_tokens_without_jti_cannot_be_revoked():
+    app_settings = create_settings(InMemoryRevocationStore())
+    token = create_refresh_token()
+
+    with monkay.with_settings(app_settings):
+        assert await RefreshAuthentication(token=token).refresh()
+
+        with pytest.raises(NotAuthorized):
+            await RefreshAuthentication(token=token).revoke()
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def family_store(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryTokenFamilyStore()
+    return SQLiteTokenFamilyStore(str(tmp_path / "families.sqlite"))
+
+
+async def test_token_family_stores(family_store):
+    expires_at = time.time() + 60
+
+    assert await family_store.advance("family", 0, expires_at)
+    assert await family_store.advance("family", 1, expires_at)
+
+    # Reusing the generation 1 revokes the family.
+    assert not await family_store.advance("family", 1, expires_at)
+    assert not await family_store.advance("family", 2, expires_at)
+
+    await family_store.revoke("another", expires_at)
+    assert not await family_store.advance("another", 0, expires_at)
+
+
+async def test_revoked_families_keep_their_latest_expiry(family_store):
+    assert await family_store.advance("family", 0, time.time() + 60)
+
+    # Revoked with a token that already expired, the later generations are still valid.
+    await family_store.revoke("family", time.time() - 1)
+    assert not await family_store.advance("family", 1, time.time() + 60)
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+
+import jwt
+import pytest
+from esmerald.conf import monkay
+from esmerald.exceptions import ImproperlyConfigured, NotAuthorized
+from tests.fakes import FakeRedis
+from tests.settings import SIGNING_KEY, TestSettings, simple_jwt_settings
+
+from esmerald_simple_jwt.backends import BackendEmailAuthentication, RefreshAuthentication
+from esmerald_simple_jwt.revocation import (
+    CachedTokenVersionStore,
+    InMemoryTokenVersionStore,
+    RedisTokenVersionStore,
+    SQLiteTokenVersionStore,
+)
+from esmerald_simple_jwt.schemas import RefreshToken
+from esmerald_simple_jwt.token import Token
+
+pytestmark = pytest.mark.anyio
+
+
+class CountingStore(InMemoryTokenVersionStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups = 0
+
+    async def get(self, sub: str) -> int:
+        self.lookups += 1
+        return await super().get(sub)
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryTokenVersionStore()
+    if request.param == "sqlite":
+        return SQLiteTokenVersionStore(str(tmp_path / "versions.sqlite"))
+    return RedisTokenVersionStore(FakeRedis())
+
+
+async def test_stores(store):
+    assert await store.get("1") == 0
+
+    assert await store.bump("1") == 1
+    assert await store.bump("1") == 2
+
+    assert await store.get("1") == 2
+    assert await store.get("2") == 0
+
+
+async def test_cache_versions():
+    counting = CountingStore()
+    store = CachedTokenVersionStore(counting, ttl=60)
+
+    assert await store.get("1") == 0
+    assert await store.get("1") == 0
+    assert counting.lookups == 1
+
+    await store.bump("1")
+
+    assert await store.get("1") == 1
+    assert counting.lookups == 1
+
+
+def create_settings(store) -> TestSettings:
+    return simple_jwt_settings(token_version_store=store)()
+
+
+def create_refresh_token(**kwargs) -> RefreshToken:
+    token = Token(sub="1", exp=datetime.now() + timedelta(days=1), **kwargs)
+    refresh_token = token.encode(
+        key=SIGNING_KEY, algorithm="HS256", claims_extra={"token_type": "refresh_token"}
+    )
+    return RefreshToken(refresh_token=refresh_token)
+
+
+async def test_bumping_the_version_revokes_all_the_tokens():
+    app_settings = create_settings(InMemoryTokenVersionStore())
+    legacy, current = create_refresh_token(), create_refresh_token(ver=0)
+    backend = BackendEmailAuthentication(email="foo@bar.com", password="p4ssw0rd")
+
+    with monkay.with_settings(app_settings):
+        assert await backend.get_token_version("1") == 0
+        access = await RefreshAuthentication(token=current).refresh()
+        claims = jwt.decode(access.access_token, SIGNING_KEY, algorithms=["HS256"])
+        assert claims["ver"] == 0
+
+        assert await backend.revoke_user_tokens("1") == 1
+
+        for token in (legacy, current):
+            with pytest.raises(NotAuthorized):
+                await RefreshAuthentication(token=token).refresh()
+        assert await RefreshAuthentication(token=create_refresh_token(ver=1)).refresh()
+
+
+async def test_revoking_the_tokens_of_a_user_needs_a_store():
+    app_settings = create_settings(None)
+    backend = BackendEmailAuthentication(email="foo@bar.com", password="p4ssw0rd")
+
+    with monkay.with_settings(app_settings):
+        assert await backend.get_token_version("1") is None
+        with pytest.raises(ImproperlyConfigured):
+            await backend.revoke_user_tokens("1")
@@ -0,0 +1,154 @@
+from datetime import timedelta
+
+import pytest
+from esmerald import Esmerald, Pluggable
+from esmerald.conf import settings
+from esmerald.exceptions import ImproperlyConfigured
+from esmerald.testclient import EsmeraldTestClient
+from tests.settings import TestSettings
+
+from esmerald_simple_jwt.backends import BackendEmailAuthentication, RefreshAuthentication
+from esmerald_simple_jwt.config import SimpleJWT
+from esmerald_simple_jwt.extension import SimpleJWTExtension
+from esmerald_simple_jwt.runtime import (
+    RuntimeConfig,
+    build_runtime_config,
+    clear_runtime_configs,
+    get_runtime_config,
+)
+
+
+def create_settings(**kwargs):
+    app_settings = TestSettings()
+    app_settings.simple_jwt = SimpleJWT(
+        signing_key=settings.secret_key,
+        backend_authentication=BackendEmailAuthentication,
+        backend_refresh=RefreshAuthentication,
+        **kwargs,
+    )
+    return app_settings
+
+
+def test_runtime_config_is_resolved_once():
+    app_settings = create_settings()
+
+    runtime = get_runtime_config(app_settings)
+
+    assert get_runtime_config(app_settings) is runtime
+    assert runtime.signing_key == settings.secret_key.encode()
+    assert runtime.verifying_key == settings.secret_key.encode()
+    assert runtime.algorithms == ["HS256"]
+    assert runtime.backend_refresh is RefreshAuthentication
+
+
+def test_runtime_config_is_immutable():
+    runtime = get_runtime_config(create_settings())
+
+    with pytest.raises(AttributeError):
+        runtime.signing_key = "another"
+
+
+def test_runtime_config_rebuild_on_purpose():
+    app_settings = create_settings()
+    runtime = get_runtime_config(app_settings)
+
+    app_settings.simple_jwt = app_settings.simple_jwt.model_copy(
+        update={"access_token_lifetime": timedelta(minutes=10)}
+    )
+    assert get_runtime_config(app_settings) is runtime
+
+    rebuilt = build_runtime_config(app_settings)
+
+    assert rebuilt is not runtime
+    assert get_runtime_config(app_settings) is rebuilt
+    assert rebuilt.access_token_lifetime == timedelta(minutes=10)
+
+    clear_runtime_configs()
+    assert get_runtime_config(app_settings) is not rebuilt
+
+
+def test_runtime_config_lifetimes_as_seconds():
+    runtime = RuntimeConfig.from_config(create_settings(refresh_token_lifetime=60).simple_jwt)
+
+    assert runtime.refresh_token_lifetime == timedelta(seconds=60)
+
+
+def test_runtime_config_invalid_lifetime():
+    with pytest.raises(ImproperlyConfigured):
+        RuntimeConfig.from_config(create_settings(access_token_lifetime="five").simple_jwt)
+
+
+def test_runtime_services_are_carried_over():
+    app_settings = create_settings(rotate_refresh_tokens=True, coalesce_refreshes=True)
+    runtime = get_runtime_config(app_settings)
+
+    app_settings.simple_jwt = app_settings.simple_jwt.model_copy(
+        update={"access_token_lifetime": timedelta(minutes=10)}
+    )
+    rebuilt = build_runtime_config(app_settings)
+
+    assert rebuilt.services is not runtime.services
+    assert rebuilt.services.token_families is runtime.services.token_families
+    assert rebuilt.services.refresh_flight is runtime.services.refresh_flight
+    assert rebuilt.services.hashing is runtime.services.hashing
+
+    app_settings.simple_jwt = app_settings.simple_jwt.model_copy(
+        update={"coalesce_refreshes_ttl": 5.0}
+    )
+    rebuilt = build_runtime_config(app_settings)
+
+    assert rebuilt.services.token_families is runtime.services.token_families
+    assert rebuilt.services.refresh_flight is not runtime.services.refresh_flight
+
+
+def test_replaced_crypto_executor_is_shut_down():
+    app_settings = create_settings(crypto_executor="process", crypto_workers=1)
+    crypto = get_runtime_config(app_settings).services.crypto
+    assert crypto.pool is not None
+
+    app_settings.simple_jwt = app_settings.simple_jwt.model_copy(
+        update={"access_token_lifetime": timedelta(minutes=10)}
+    )
+    assert build_runtime_config(app_settings).services.crypto is crypto
+    assert crypto._pool is not None
+
+    app_settings.simple_jwt = app_settings.simple_jwt.model_copy(
+        update={"signing_key": settings.secret_key + "-rotated"}
+    )
+    rebuilt = build_runtime_config(app_settings).services.crypto
+    assert rebuilt.pool is not None
+
+    assert rebuilt is not crypto
+    assert crypto._pool is None
+
+    clear_runtime_configs()
+    assert rebuilt._pool is None
+
+
+def test_services_are_shut_down_with_the_application():
+    app_settings = create_settings(crypto_executor="process", crypto_workers=1)
+    app = Esmerald(
+        routes=[],
+        pluggables={
+            "simple-jwt": Pluggable(SimpleJWTExtension, settings_module=app_settings),
+        },
+    )
+
+    with EsmeraldTestClient(app):
+        crypto = get_runtime_config(app_settings).services.crypto
+        assert crypto.pool is not None
+
+    assert crypto._pool is None
+
+
+def test_dummy_hash_is_made_when_the_application_starts():
+    app_settings = create_settings()
+    app = Esmerald(
+        routes=[],
+        pluggables={"simple-jwt": Pluggable(SimpleJWTExtension, settings_module=app_settings)},
+    )
+    hashing = get_runtime_config(app_settings).services.hashing
+
+    assert hashing._dummy_hash is None
+    with EsmeraldTestClient(app):
+        assert hashing._dummy_hash is not None
@@ -0,0 +1,68 @@
+import anyio
+import pytest
+
+from esmerald_simple_jwt.singleflight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_calls_run_once():
+    flight = SingleFlight(ttl=0)
+    calls = []
+    results = []
+
+    async def work():
+        calls.append(1)
+        await anyio.sleep(0.05)
+        return "result"
+
+    async def call():
+        results.append(await flight.run("token", work))
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(5):
+            tg.start_soon(call)
+
+    assert len(calls) == 1
+    assert results == ["result"] * 5
+
+
+async def test_results_are_kept_for_the_ttl():
+    flight = SingleFlight(ttl=60)
+    calls = []
+
+    async def work():
+        calls.append(1)
+        return len(calls)
+
+    assert await flight.run("token", work) == 1
+    assert await flight.run("token", work) == 1
+    assert await flight.run("another", work) == 2
+
+    flight.forget("token")
+
+    assert await flight.run("token", work) == 3
+
+
+async def test_errors_are_shared_but_not_kept():
+    flight = SingleFlight(ttl=60)
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await anyio.sleep(0.05)
+        raise ValueError("invalid")
+
+    async def call():
+        with pytest.raises(ValueError):
+            await flight.run("token", work)
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(3):
+            tg.start_soon(call)
+
+    assert len(calls) == 1
+
+    with pytest.raises(ValueError):
+        await flight.run("token", work)
+    assert len(calls) == 2
@@ -0,0 +1,87 @@
+import pytest
+from esmerald.exceptions import ImproperlyConfigured
+from tests.fakes import FakeRedis
+
+from esmerald_simple_jwt.throttling import (
+    TOKEN_BUCKET_SCRIPT,
+    InMemoryThrottleStore,
+    LoginThrottle,
+    RedisThrottleStore,
+    Throttled,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_bucket_allows_the_burst():
+    store = InMemoryThrottleStore()
+
+    waits = [await store.consume("key", rate=1.0, burst=3) for _ in range(4)]
+
+    assert waits[:3] == [0.0] * 3
+    assert 0 < waits[3] <= 1.0
+
+
+async def test_buckets_are_independent():
+    store = InMemoryThrottleStore()
+
+    assert await store.consume("first", rate=0.1, burst=1) == 0
+    assert await store.consume("first", rate=0.1, burst=1) > 0
+    assert await store.consume("second", rate=0.1, burst=1) == 0
+
+
+async def test_shards_are_bounded():
+    store = InMemoryThrottleStore(shards=4, maxsize=40)
+
+    for i in range(500):
+        await store.consume(f"key-{i}", rate=0.001, burst=5)
+
+    assert len(store) <= 40
+
+
+async def test_throttle_per_identifier():
+    throttle = LoginThrottle(InMemoryThrottleStore(), identifier_limit=2, ip_limit=100)
+
+    await throttle.check("foo@bar.com", "10.0.0.1")
+    await throttle.check(" FOO@bar.com", "10.0.0.2")
+
+    with pytest.raises(Throttled) as raised:
+        await throttle.check("foo@bar.com", "10.0.0.3")
+
+    assert raised.value.status_code == 429
+    assert int(raised.value.headers["Retry-After"]) >= 1
+
+    await throttle.check("another@bar.com", "10.0.0.1")
+
+
+async def test_throttle_per_ip():
+    throttle = LoginThrottle(InMemoryThrottleStore(), identifier_limit=100, ip_limit=2)
+
+    await throttle.check("a@bar.com", "10.0.0.1")
+    await throttle.check("b@bar.com", "10.0.0.1")
+
+    with pytest.raises(Throttled):
+        await throttle.check("c@bar.com", "10.0.0.1")
+
+    await throttle.check("c@bar.com", "10.0.0.2")
+
+
+def test_invalid_limits():
+    with pytest.raises(ImproperlyConfigured):
+        LoginThrottle(InMemoryThrottleStore(), identifier_limit=0)
+
+    with pytest.raises(ImproperlyConfigured):
+        LoginThrottle(InMemoryThrottleStore(), ip_period=0)
+
+
+async def test_redis_store():
+    client = FakeRedis(b"1.5")
+    store = RedisThrottleStore(client)
+
+    assert await store.consume("ip:10.0.0.1", rate=0.5, burst=10) == 1.5
+
+    _, script, numkeys, key, rate, burst, _ = client.calls[0]
+    assert script == TOKEN_BUCKET_SCRIPT
+    assert numkeys == 1
+    assert key == "simple-jwt:throttle:ip:10.0.0.1"
+    assert (rate, burst) == (0.5, 10)
@@ -0,0 +1,104 @@
+import time
+
+import jwt
+import pytest
+from esmerald.exceptions import ImproperlyConfigured
+from tests.settings import SIGNING_KEY
+
+from esmerald_simple_jwt.keys import KeyRing, load_key_material
+from esmerald_simple_jwt.token import TokenDecoder, TokenRejectedError, VerifiedTokenCache
+
+
+def encode(exp=300, **claims):
+    return jwt.encode({"sub": "1", "exp": int(time.time()) + exp, **claims}, SIGNING_KEY, "HS256")
+
+
+@pytest.fixture
+def keyring():
+    return KeyRing(load_key_material("HS256", SIGNING_KEY))
+
+
+def test_verified_tokens_are_cached(keyring):
+    cache = VerifiedTokenCache()
+    decoder = TokenDecoder(keyring, cache=cache)
+    token = encode()
+
+    assert decoder.decode(token).sub == "1"
+    assert decoder.decode(token).sub == "1"
+
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_invalid_tokens_are_not_cached(keyring):
+    cache = VerifiedTokenCache()
+    decoder = TokenDecoder(keyring, cache=cache)
+    token = encode()[:-2] + "AA"
+
+    for _ in range(2):
+        with pytest.raises(jwt.PyJWTError):
+            decoder.decode(token)
+
+    assert len(cache) == 0
+
+
+def test_malformed_tokens_are_not_looked_up(keyring):
+    cache = VerifiedTokenCache()
+    decoder = TokenDecoder(keyring, cache=cache, max_length=64)
+
+    for token in ("a" * 65, "not-a-token", "a.b.c!"):
+        with pytest.raises(TokenRejectedError):
+            decoder.decode(token)
+
+    assert cache.stats()["misses"] == 0
+
+
+def test_entries_never_outlive_the_token():
+    cache = VerifiedTokenCache(ttl=300)
+
+    cache.put("token", {"exp": time.time() - 1})
+
+    assert cache.get("token") is None
+
+
+def test_entries_expire_with_the_ttl():
+    cache = VerifiedTokenCache(ttl=0)
+
+    cache.put("token", {"exp": time.time() + 300})
+
+    assert cache.get("token") is None
+
+
+def test_lru_eviction():
+    cache = VerifiedTokenCache(maxsize=2)
+    claims = {"exp": time.time() + 300}
+
+    cache.put("first", claims)
+    cache.put("second", claims)
+    cache.get("first")
+    cache.put("third", claims)
+
+    assert cache.get("second") is None
+    assert cache.get("first") is claims
+    assert cache.get("third") is claims
+    assert cache.evictions == 1
+
+
+def test_new_keys_invalidate(keyring):
+    cache = VerifiedTokenCache()
+    decoder = TokenDecoder(keyring, cache=cache)
+    token = encode()
+    decoder.decode(token)
+
+    # Binding the same keys again, even in another keyring, keeps the entries.
+    TokenDecoder(keyring, cache=cache)
+    TokenDecoder(KeyRing(load_key_material("HS256", SIGNING_KEY)), cache=cache)
+    assert cache.get(token) is not None
+
+    TokenDecoder(KeyRing(load_key_material("HS256", SIGNING_KEY + "-rotated")), cache=cache)
+    assert cache.get(token) is None
+    assert cache.epoch == 2
+
+
+def test_invalid_size():
+    with pytest.raises(ImproperlyConfigured):
+        VerifiedTokenCache(maxsize=0)
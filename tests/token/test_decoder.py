@@ -0,0 +1,155 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import pytest
+from jwt.exceptions import (
+    DecodeError,
+    ExpiredSignatureError,
+    ImmatureSignatureError,
+    InvalidSignatureError,
+    MissingRequiredClaimError,
+)
+from tests.settings import SIGNING_KEY
+
+from esmerald_simple_jwt.keys import KeyRing, load_key_material
+from esmerald_simple_jwt.token import Claims, Token, TokenDecoder, TokenRejectedError
+
+PREVIOUS = "a-previous-key-long-enough-for-hs256"
+
+
+@pytest.fixture
+def decoder():
+    return TokenDecoder(
+        KeyRing(
+            load_key_material("HS256", SIGNING_KEY, kid="current"),
+            [load_key_material("HS256", PREVIOUS, kid="previous")],
+        )
+    )
+
+
+def encode(key=SIGNING_KEY, exp=300, **claims):
+    claims = {"sub": "1", "exp": int(time.time()) + exp, **claims}
+    return jwt.encode(
+        claims, key, algorithm=claims.pop("alg", "HS256"), headers=claims.pop("headers", None)
+    )
+
+
+def test_decode(decoder):
+    claims = decoder.decode(encode(token_type="refresh_token", jti="abc"))
+
+    assert isinstance(claims, Claims)
+    assert claims.sub == "1"
+    assert claims.token_type == "refresh_token"
+    assert claims.jti == "abc"
+    assert claims["jti"] == "abc"
+    assert claims.fam is None
+    assert isinstance(claims.exp, int)
+
+
+def test_keys_are_picked_by_kid(decoder):
+    assert decoder.decode(encode(headers={"kid": "current"})).sub == "1"
+    assert decoder.decode(encode(key=PREVIOUS, headers={"kid": "previous"})).sub == "1"
+
+    with pytest.raises(InvalidSignatureError):
+        decoder.decode(encode(key=PREVIOUS, headers={"kid": "current"}))
+
+    with pytest.raises(TokenRejectedError) as raised:
+        decoder.decode(encode(headers={"kid": "unknown"}))
+
+    assert raised.value.code == "unknown_kid"
+
+
+def test_invalid_signature(decoder):
+    token = encode()
+
+    with pytest.raises(InvalidSignatureError):
+        decoder.decode(token[:-2] + ("AA" if not token.endswith("AA") else "BB"))
+
+
+def test_algorithm_must_match_the_key(decoder):
+    with pytest.raises(TokenRejectedError) as raised:
+        decoder.decode(encode(alg="HS512"))
+
+    assert raised.value.code == "algorithm_not_allowed"
+
+
+def test_time_claims(decoder):
+    with pytest.raises(ExpiredSignatureError):
+        decoder.decode(encode(exp=-10))
+
+    with pytest.raises(ImmatureSignatureError):
+        decoder.decode(encode(nbf=int(time.time()) + 60))
+
+    with pytest.raises(DecodeError):
+        decoder.decode(jwt.encode({"sub": "1", "exp": "tomorrow"}, SIGNING_KEY, algorithm="HS256"))
+
+    with pytest.raises(MissingRequiredClaimError):
+        decoder.decode(jwt.encode({"sub": "1"}, SIGNING_KEY, algorithm="HS256"))
+
+
+def test_leeway():
+    decoder = TokenDecoder(KeyRing(load_key_material("HS256", SIGNING_KEY)), leeway=30)
+
+    assert decoder.decode(encode(exp=-10)).sub == "1"
+
+
+def test_malformed_tokens(decoder):
+    for token in ("", "abc", "a.b", "a.b.c", "e30.e30.", "bm90IGpzb24.e30.AA"):
+        with pytest.raises(jwt.PyJWTError):
+            decoder.decode(token)
+
+
+@pytest.mark.parametrize(
+    "token,code",
+    [
+        ("a" * 5000, "token_too_long"),
+        ("abc", "invalid_segments"),
+        ("a.b", "invalid_segments"),
+        ("a.b.c.d", "invalid_segments"),
+        ("a..c", "invalid_segments"),
+        ("a.b.", "invalid_segments"),
+        ("a.b+/.c", "invalid_characters"),
+        ("a.b.c=", "invalid_characters"),
+        ("a.b.ç", "invalid_characters"),
+        ("bm90IGpzb24.e30.AA", "invalid_header"),
+        ("WzFd.e30.AA", "invalid_header"),
+    ],
+)
+def test_structural_checks(decoder, token, code):
+    with pytest.raises(TokenRejectedError) as raised:
+        decoder.decode(token)
+
+    assert raised.value.code == code
+
+
+def test_max_length():
+    decoder = TokenDecoder(KeyRing(load_key_material("HS256", SIGNING_KEY)), max_length=20)
+
+    with pytest.raises(TokenRejectedError):
+        decoder.decode(encode())
+
+
+def test_same_as_pyjwt(decoder):
+    token = encode(token_type="access_token", roles=["admin"])
+
+    assert decoder.verify(token) == jwt.decode(token, SIGNING_KEY, algorithms=["HS256"])
+
+
+def test_claims_are_read_only(decoder):
+    claims = decoder.decode(encode())
+
+    with pytest.raises(AttributeError):
+        claims.sub = "2"
+
+
+def test_claims_to_token(decoder):
+    claims = decoder.decode(encode(token_type="access_token"))
+
+    token = claims.to_token()
+
+    assert isinstance(token, Token)
+    assert token is claims.to_token()
+    assert token.token_type == "access_token"
+    assert token.exp == claims.expires_at
+    assert claims.expires_at > datetime.now(timezone.utc) + timedelta(minutes=4)
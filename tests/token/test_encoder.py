@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import pytest
+from esmerald.exceptions import ImproperlyConfigured
+from tests.settings import SIGNING_KEY
+
+from esmerald_simple_jwt import token as token_module
+from esmerald_simple_jwt.keys import load_key_material
+from esmerald_simple_jwt.token import Token, TokenEncoder, dump_claims, header_segment
+
+
+def claims(**extra):
+    return {
+        "sub": "1",
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+        "iat": datetime.now(timezone.utc),
+        **extra,
+    }
+
+
+@pytest.mark.parametrize("algorithm", ["HS256", "HS384", "HS512"])
+def test_hmac_is_byte_compatible(algorithm):
+    payload = claims(token_type="access_token", jti="abc", roles=["admin", "user"])
+    encoder = TokenEncoder(SIGNING_KEY, algorithm)
+
+    assert encoder.encode(payload) == jwt.encode(payload, SIGNING_KEY, algorithm=algorithm)
+
+
+def test_kid_header_is_byte_compatible():
+    payload = claims()
+    encoder = TokenEncoder(SIGNING_KEY, "HS256", kid="2024-01")
+
+    assert encoder.encode(payload) == jwt.encode(
+        payload, SIGNING_KEY, algorithm="HS256", headers={"kid": "2024-01"}
+    )
+
+
+def test_non_ascii_claims_are_byte_compatible():
+    payload = claims(name="Jösé", score=1.5, big=2**70)
+    encoder = TokenEncoder(SIGNING_KEY, "HS256")
+
+    assert encoder.encode(payload) == jwt.encode(payload, SIGNING_KEY, algorithm="HS256")
+
+
+def test_control_characters_are_byte_compatible():
+    payload = claims(x="a\nb\x01\x7f/", tags=["\x7f"], extra={"\x7fkey": "\t"})
+    encoder = TokenEncoder(SIGNING_KEY, "HS256")
+
+    assert encoder.encode(payload) == jwt.encode(payload, SIGNING_KEY, algorithm="HS256")
+
+
+def test_asymmetric_key_is_verifiable():
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.hazmat.primitives.serialization import Encoding, NoEncryption, PrivateFormat
+
+    pem = (
+        ec.generate_private_key(ec.SECP256R1())
+        .private_bytes(Encoding.PEM, PrivateFormat.PKCS8, NoEncryption())
+        .decode()
+    )
+    keys = load_key_material("ES256", pem)
+    encoder = TokenEncoder(keys.signing_key, "ES256")
+
+    token = encoder.encode(claims())
+
+    assert jwt.decode(token, keys.verifying_key, algorithms=["ES256"])["sub"] == "1"
+
+
+def test_token_encode_with():
+    token = Token(sub="1", exp=datetime.now() + timedelta(minutes=5), jti="abc")
+    extra = {"token_type": "access_token"}
+
+    assert token.encode_with(
+        TokenEncoder(SIGNING_KEY, "HS256"), claims_extra=extra
+    ) == token.encode(key=SIGNING_KEY, algorithm="HS256", claims_extra=extra)
+
+
+def test_header_segment_is_cached():
+    assert header_segment("HS256", "kid") is header_segment("HS256", "kid")
+
+
+def test_encoder_without_orjson(monkeypatch):
+    monkeypatch.setattr(token_module, "orjson", None)
+    payload = claims(name="e", roles=["admin"])
+
+    assert TokenEncoder(SIGNING_KEY, "HS256").encode(payload) == jwt.encode(
+        payload, SIGNING_KEY, algorithm="HS256"
+    )
+
+
+def test_dump_claims_falls_back_to_json():
+    assert dump_claims({"name": "é"}) == b'{"name":"\\u00e9"}'
+    assert dump_claims({"name": "e"}) == b'{"name":"e"}'
+
+    with pytest.raises(TypeError):
+        dump_claims({"when": datetime.now()})
+
+
+def test_unsupported_algorithm():
+    with pytest.raises(ImproperlyConfigured):
+        TokenEncoder(SIGNING_KEY, "XX256")
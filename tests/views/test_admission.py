@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+import anyio
+import pytest
+from esmerald import Esmerald, Gateway
+from httpx import ASGITransport, AsyncClient
+from tests.settings import SIGNING_KEY, simple_jwt_settings
+
+from esmerald_simple_jwt.backends import BackendEmailAuthentication
+from esmerald_simple_jwt.token import Token
+from esmerald_simple_jwt.views import refresh_token, signin
+
+pytestmark = pytest.mark.anyio
+
+
+class SlowBackend(BackendEmailAuthentication):
+    async def authenticate(self):
+        await anyio.sleep(0.2)
+        return {"access_token": "access", "refresh_token": "refresh"}
+
+
+AdmissionSettings = simple_jwt_settings(
+    backend_authentication=SlowBackend,
+    admission_control=True,
+    admission_max_inflight=1,
+)
+
+
+async def test_signins_are_shed_and_refreshes_admitted():
+    app = Esmerald(
+        routes=[Gateway(handler=signin), Gateway(handler=refresh_token)],
+        settings_module=AdmissionSettings,
+    )
+    token = Token(sub="1", exp=datetime.now() + timedelta(days=1)).encode(
+        key=SIGNING_KEY, algorithm="HS256", claims_extra={"token_type": "refresh_token"}
+    )
+    data = {"email": "foo@bar.com", "password": "p4ssw0rd"}
+    responses = {}
+
+    async with AsyncClient(transport=ASGITransport(app), base_url="http://test") as client:
+
+        async def first_signin():
+            responses["first"] = await client.post("/signin", json=data)
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(first_signin)
+            await anyio.sleep(0.05)
+
+            responses["shed"] = await client.post("/signin", json=data)
+            responses["refresh"] = await client.post(
+                "/refresh-access", json={"refresh_token": token}
+            )
+
+    assert responses["first"].status_code == 200
+    assert responses["shed"].status_code == 503
+    assert responses["shed"].headers["retry-after"] == "1"
+    assert responses["refresh"].status_code == 200
@@ -0,0 +1,99 @@
+import json
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from esmerald import Esmerald, Gateway
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+from tests.settings import SIGNING_KEY, simple_jwt_settings
+
+from esmerald_simple_jwt.backends import BackendEmailAuthentication, RefreshAuthentication
+from esmerald_simple_jwt.config import SimpleJWT
+from esmerald_simple_jwt.responses import render_tokens
+from esmerald_simple_jwt.runtime import RuntimeConfig, build_runtime_config
+from esmerald_simple_jwt.schemas import AccessToken, TokenAccess
+from esmerald_simple_jwt.token import Token
+from esmerald_simple_jwt.views import refresh_token, signin
+
+pytestmark = pytest.mark.anyio
+
+
+class StaticAuthentication(BackendEmailAuthentication):
+    async def authenticate(self):
+        # Dumped like the backends returning `TokenAccess(...).model_dump()`.
+        return {"access_token": "aaa.bbb.ccc", "refresh_token": "ddd.eee.fff"}
+
+
+FastSettings = simple_jwt_settings(
+    backend_authentication=StaticAuthentication,
+    rotate_refresh_tokens=True,
+    fast_responses=True,
+)
+
+
+class CustomTokenAccess(TokenAccess):
+    expires_in: int = 3600
+
+
+def test_render_tokens_matches_the_models():
+    access = AccessToken(access_token="aaa.bbb.ccc")
+    pair = TokenAccess(access_token="aaa.bbb.ccc", refresh_token="ddd.eee.f-_")
+
+    assert render_tokens(access) == access.model_dump_json().encode()
+    assert render_tokens(pair) == pair.model_dump_json().encode()
+    assert json.loads(render_tokens(pair.model_dump())) == pair.model_dump()
+
+
+@pytest.mark.parametrize(
+    "tokens",
+    [
+        CustomTokenAccess(access_token="a.b.c", refresh_token="d.e.f"),
+        {"access_token": "a.b.c", "expires_in": 3600},
+        {"access_token": 'a"b.c'},
+        {"access_token": "a.b.c", "refresh_token": "é.b.c"},
+        {"refresh_token": "a.b.c"},
+    ],
+)
+def test_render_tokens_falls_back(tokens):
+    assert render_tokens(tokens) is None
+
+
+def test_fast_responses_need_the_default_schemas():
+    class Other(BaseModel):
+        access_token: str
+
+    assert build_runtime_config(FastSettings()).fast_responses is True
+    config = SimpleJWT(
+        signing_key=SIGNING_KEY,
+        backend_authentication=BackendEmailAuthentication,
+        backend_refresh=RefreshAuthentication,
+        fast_responses=True,
+        access_token_model=Other,
+    )
+    assert RuntimeConfig.from_config(config).fast_responses is False
+
+
+async def test_refresh_view_writes_the_template():
+    app = Esmerald(routes=[Gateway(handler=refresh_token)], settings_module=FastSettings)
+    token = Token(sub="1", exp=datetime.now() + timedelta(days=1), jti=uuid4().hex).encode(
+        key=SIGNING_KEY, algorithm="HS256", claims_extra={"token_type": "refresh_token"}
+    )
+
+    async with AsyncClient(transport=ASGITransport(app), base_url="http://test") as client:
+        response = await client.post("/refresh-access", json={"refresh_token": token})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    tokens = TokenAccess.model_validate_json(response.content)
+    assert response.content == tokens.model_dump_json().encode()
+
+
+async def test_signin_view_writes_the_template():
+    app = Esmerald(routes=[Gateway(handler=signin)], settings_module=FastSettings)
+
+    async with AsyncClient(transport=ASGITransport(app), base_url="http://test") as client:
+        response = await client.post("/signin", json={"email": "a@b.com", "password": "x"})
+
+    assert response.status_code == 200
+    assert response.content == b'{"refresh_token":"ddd.eee.fff","access_token":"aaa.bbb.ccc"}'
@@ -0,0 +1,128 @@
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import jwt
+import pytest
+from esmerald import Esmerald, Gateway
+from httpx import ASGITransport, AsyncClient
+from tests.settings import SIGNING_KEY, simple_jwt_settings
+
+from esmerald_simple_jwt.introspection import introspect
+from esmerald_simple_jwt.revocation import InMemoryRevocationStore
+from esmerald_simple_jwt.runtime import get_runtime_config
+from esmerald_simple_jwt.token import Token
+from esmerald_simple_jwt.views import introspect_token, introspect_tokens
+
+pytestmark = pytest.mark.anyio
+
+
+IntrospectionSettings = simple_jwt_settings(
+    enable_introspection=True,
+    introspection_max_batch=3,
+    introspection_cache_ttl=0,
+    revocation_store=InMemoryRevocationStore(),
+    revocation_cache_ttl=0,
+)
+
+
+def create_token(token_type="access_token", key=SIGNING_KEY, **kwargs):
+    return Token(sub="1", exp=datetime.now() + timedelta(minutes=5), **kwargs).encode(
+        key=key, algorithm="HS256", claims_extra={"token_type": token_type}
+    )
+
+
+def create_expired_token():
+    claims = {"sub": "1", "exp": int(time.time()) - 60, "token_type": "access_token"}
+    return jwt.encode(claims, SIGNING_KEY, algorithm="HS256")
+
+
+async def post(app, path="/introspect", **kwargs):
+    async with AsyncClient(transport=ASGITransport(app), base_url="http://test") as client:
+        return await client.post(path, **kwargs)
+
+
+@pytest.fixture
+def app():
+    return Esmerald(
+        routes=[Gateway(handler=introspect_token), Gateway(handler=introspect_tokens)],
+        settings_module=IntrospectionSettings,
+    )
+
+
+async def test_introspect_a_token(app):
+    response = await post(app, data={"token": create_token(), "token_type_hint": "access_token"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["active"] is True
+    assert response.json()["sub"] == "1"
+    assert response.json()["token_type"] == "access_token"
+
+
+async def test_introspect_a_batch(app):
+    jti = uuid4().hex
+    revoked = create_token("refresh_token", jti=jti)
+    await get_runtime_config(app.settings).services.revocation.revoke(
+        jti, datetime.now() + timedelta(days=1)
+    )
+
+    response = await post(
+        app,
+        "/introspect/batch",
+        json={"tokens": [create_token("refresh_token"), revoked, create_expired_token()]},
+    )
+
+    assert [result["active"] for result in response.json()["results"]] == [True, False, False]
+    assert response.json()["results"][1] == {"active": False}
+
+
+async def test_inactive_tokens(app):
+    for token in (
+        create_token("other"),
+        create_token(key="another-key-long-enough-for-hs256"),
+        "not-a-token",
+    ):
+        assert (await post(app, data={"token": token})).json() == {"active": False}
+
+
+async def test_invalid_requests(app):
+    assert (await post(app, data={})).status_code == 400
+    assert (
+        await post(app, "/introspect/batch", json={"tokens": ["a", "b", "c", "d"]})
+    ).status_code == 400
+    assert (await post(app, "/introspect/batch", json={"tokens": "a"})).status_code == 400
+    assert (await post(app, "/introspect/batch", json={})).status_code == 400
+
+
+async def test_results_are_cached_until_the_exp():
+    app_settings = IntrospectionSettings()
+    app_settings.simple_jwt.introspection_cache_ttl = 60
+    runtime = get_runtime_config(app_settings)
+    jti = uuid4().hex
+    token = create_token("refresh_token", jti=jti)
+
+    assert (await introspect(token, runtime))["active"]
+    await runtime.services.revocation.revoke(jti, datetime.now() + timedelta(days=1))
+
+    assert (await introspect(token, runtime))["active"]
+    assert runtime.services.introspection_cache.stats()["hits"] == 1
+
+    expired = create_expired_token()
+    assert not (await introspect(expired, runtime))["active"]
+    assert len(runtime.services.introspection_cache) == 2
+    runtime.services.introspection_cache.invalidate()
+    assert not (await introspect(token, runtime))["active"]
+
+
+async def test_malformed_tokens_are_not_cached():
+    app_settings = IntrospectionSettings()
+    app_settings.simple_jwt.introspection_cache_ttl = 60
+    app_settings.simple_jwt.token_max_length = 64
+    runtime = get_runtime_config(app_settings)
+
+    for token in ("a" * 65, "not-a-token", "a.b.c!"):
+        assert await introspect(token, runtime) == {"active": False}
+
+    assert len(runtime.services.introspection_cache) == 0
+    assert runtime.services.introspection_cache.stats()["misses"] == 0
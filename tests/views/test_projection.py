@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import jwt
+import pytest
+from esmerald import Esmerald, Gateway
+from esmerald.conf import monkay
+from httpx import ASGITransport, AsyncClient
+from tests.backends import EmailBackendAuth
+from tests.settings import SIGNING_KEY, simple_jwt_settings
+
+from esmerald_simple_jwt.token import Token
+from esmerald_simple_jwt.views import refresh_token
+
+pytestmark = pytest.mark.anyio
+
+
+ProjectionSettings = simple_jwt_settings(claims_projection={"rol": "role", "tid": "tenant.id"})
+
+
+async def test_refresh_carries_the_projected_claims():
+    app = Esmerald(routes=[Gateway(handler=refresh_token)], settings_module=ProjectionSettings)
+    token = Token(sub="1", exp=datetime.now() + timedelta(days=1)).encode(
+        key=SIGNING_KEY,
+        algorithm="HS256",
+        claims_extra={"token_type": "refresh_token", "rol": "admin", "tid": 7, "other": 1},
+    )
+
+    async with AsyncClient(transport=ASGITransport(app), base_url="http://test") as client:
+        response = await client.post("/refresh-access", json={"refresh_token": token})
+
+    assert response.status_code == 200
+    claims = jwt.decode(response.json()["access_token"], SIGNING_KEY, algorithms=["HS256"])
+    assert claims["rol"] == "admin"
+    assert claims["tid"] == 7
+    assert "other" not in claims
+
+
+def test_backend_embeds_the_projected_claims():
+    user = SimpleNamespace(id=1, role="admin", tenant=SimpleNamespace(id=7))
+
+    with monkay.with_settings(ProjectionSettings()):
+        backend = EmailBackendAuth(email="foo@bar.com", password="p4ssw0rd")
+        token = backend.generate_user_token(user, token_type="access_token")
+
+    claims = jwt.decode(token, SIGNING_KEY, algorithms=["HS256"])
+    assert claims["sub"] == "1"
+    assert claims["token_type"] == "access_token"
+    assert claims["rol"] == "admin"
+    assert claims["tid"] == 7
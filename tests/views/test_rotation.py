@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import anyio
+import pytest
+from esmerald import Esmerald, Gateway
+from esmerald.conf import monkay
+from esmerald.exceptions import NotAuthorized
+from httpx import ASGITransport, AsyncClient
+from tests.settings import SIGNING_KEY, simple_jwt_settings
+
+from esmerald_simple_jwt.backends import RefreshAuthentication
+from esmerald_simple_jwt.revocation import InMemoryRevocationStore
+from esmerald_simple_jwt.runtime import get_runtime_config
+from esmerald_simple_jwt.schemas import RefreshToken
+from esmerald_simple_jwt.token import Token
+from esmerald_simple_jwt.views import refresh_token
+
+pytestmark = pytest.mark.anyio
+
+
+RotationSettings = simple_jwt_settings(rotate_refresh_tokens=True)
+
+
+def create_refresh_token(**kwargs) -> RefreshToken:
+    token = Token(sub="1", exp=datetime.now() + timedelta(days=1), **kwargs)
+    refresh_token = token.encode(
+        key=SIGNING_KEY, algorithm="HS256", claims_extra={"token_type": "refresh_token"}
+    )
+    return RefreshToken(refresh_token=refresh_token)
+
+
+async def rotate(token: RefreshToken):
+    return await RefreshAuthentication(token=token).refresh()
+
+
+async def test_rotation_returns_a_new_pair():
+    with monkay.with_settings(RotationSettings()):
+        tokens = await rotate(create_refresh_token(jti=uuid4().hex))
+
+    claims = Token.decode(token=tokens.refresh_token, key=SIGNING_KEY, algorithms=["HS256"])
+
+    assert tokens.access_token
+    assert claims.gen == 1
+    assert claims.fam is not None
+    assert claims.token_type == "refresh_token"
+
+
+async def test_reuse_revokes_the_family():
+    jti = uuid4().hex
+
+    with monkay.with_settings(RotationSettings()):
+        first = create_refresh_token(jti=jti)
+        second = RefreshToken(refresh_token=(await rotate(first)).refresh_token)
+        third = RefreshToken(refresh_token=(await rotate(second)).refresh_token)
+
+        # The first token is presented again.
+        with pytest.raises(NotAuthorized):
+            await rotate(first)
+
+        # The whole family is now revoked, including the latest token.
+        with pytest.raises(NotAuthorized):
+            await rotate(third)
+
+
+async def test_revoked_family_outlives_the_newest_token():
+    app_settings = simple_jwt_settings(
+        rotate_refresh_tokens=True, revocation_store=InMemoryRevocationStore()
+    )()
+
+    with monkay.with_settings(app_settings):
+        first = create_refresh_token(jti=uuid4().hex)
+        second = RefreshToken(refresh_token=(await rotate(first)).refresh_token)
+        third = RefreshToken(refresh_token=(await rotate(second)).refresh_token)
+
+        await RefreshAuthentication(token=second).revoke()
+
+        families = get_runtime_config(app_settings).services.token_families
+        claims = Token.decode(token=third.refresh_token, key=SIGNING_KEY, algorithms=["HS256"])
+        assert families._families[claims.fam][2] >= claims.exp.timestamp()
+
+        with pytest.raises(NotAuthorized):
+            await rotate(third)
+
+
+async def test_rotation_requires_a_jti():
+    with monkay.with_settings(RotationSettings()):
+        with pytest.raises(NotAuthorized):
+            await rotate(create_refresh_token())
+
+
+async def test_refresh_view_returns_both_tokens():
+    app = Esmerald(routes=[Gateway(handler=refresh_token)], settings_module=RotationSettings)
+    async with AsyncClient(transport=ASGITransport(app), base_url="http://test") as client:
+        token = create_refresh_token(jti=uuid4().hex)
+        response = await client.post("/refresh-access", json=token.model_dump())
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"access_token", "refresh_token"}
+
+
+CoalescingSettings = simple_jwt_settings(rotate_refresh_tokens=True, coalesce_refreshes=True)
+
+
+async def test_duplicated_refreshes_are_not_a_reuse():
+    app = Esmerald(routes=[Gateway(handler=refresh_token)], settings_module=CoalescingSettings)
+    token = create_refresh_token(jti=uuid4().hex)
+    responses = []
+
+    async with AsyncClient(transport=ASGITransport(app), base_url="http://test") as client:
+
+        async def call():
+            responses.append(await client.post("/refresh-access", json=token.model_dump()))
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(3):
+                tg.start_soon(call)
+
+    assert [response.status_code for response in responses] == [200] * 3
+    assert len({response.json()["refresh_token"] for response in responses}) == 1
@@ -0,0 +1,38 @@
+import pytest
+from esmerald import Esmerald, Gateway
+from esmerald.exceptions import NotAuthorized
+from httpx import ASGITransport, AsyncClient
+from tests.settings import simple_jwt_settings
+
+from esmerald_simple_jwt.backends import BackendEmailAuthentication
+from esmerald_simple_jwt.views import signin
+
+pytestmark = pytest.mark.anyio
+
+attempts = []
+
+
+class CountingBackend(BackendEmailAuthentication):
+    async def authenticate(self):
+        attempts.append(self.email)
+        raise NotAuthorized(detail="Invalid credentials.")
+
+
+ThrottleSettings = simple_jwt_settings(
+    backend_authentication=CountingBackend,
+    throttle_signin=True,
+    throttle_identifier_limit=3,
+)
+
+
+async def test_signin_is_throttled_before_authenticating():
+    attempts.clear()
+    app = Esmerald(routes=[Gateway(handler=signin)], settings_module=ThrottleSettings)
+    data = {"email": "foo@bar.com", "password": "wrong"}
+
+    async with AsyncClient(transport=ASGITransport(app), base_url="http://test") as client:
+        responses = [await client.post("/signin", json=data) for _ in range(5)]
+
+    assert [response.status_code for response in responses] == [401] * 3 + [429] * 2
+    assert "retry-after" in responses[-1].headers
+    assert len(attempts) == 3
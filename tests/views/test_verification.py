@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta
+
+import pytest
+from esmerald import Esmerald, Gateway, Inject, Injects, Request, get
+from httpx import ASGITransport, AsyncClient
+from lilya.middleware import DefineMiddleware
+from tests.settings import SIGNING_KEY, simple_jwt_settings
+
+from esmerald_simple_jwt.middleware import AccessTokenMiddleware
+from esmerald_simple_jwt.token import Claims, Token, TokenDecoder
+from esmerald_simple_jwt.verification import IsAuthenticated, access_claims, get_claims
+
+pytestmark = pytest.mark.anyio
+
+
+VerificationSettings = simple_jwt_settings()
+
+
+def bearer(token_type="access_token", key=SIGNING_KEY):
+    token = Token(sub="1", exp=datetime.now() + timedelta(minutes=5)).encode(
+        key=key, algorithm="HS256", claims_extra={"token_type": token_type}
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+@get("/me", dependencies={"claims": Inject(access_claims)})
+async def me(claims: Claims = Injects()) -> str:
+    return claims.sub
+
+
+@get("/state")
+async def state(request: Request) -> str:
+    claims = getattr(request.state, "claims", None)
+    return claims.sub if claims is not None else "anonymous"
+
+
+@get("/public/ping")
+async def ping() -> str:
+    return "pong"
+
+
+@get("/publications")
+async def publications() -> str:
+    return "news"
+
+
+def create_app(**options):
+    return Esmerald(
+        routes=[Gateway(handler=state), Gateway(handler=ping), Gateway(handler=publications)],
+        middleware=[DefineMiddleware(AccessTokenMiddleware, exclude=["/public"], **options)],
+        settings_module=VerificationSettings,
+    )
+
+
+async def request(app, path, headers=None):
+    async with AsyncClient(transport=ASGITransport(app), base_url="http://test") as client:
+        return await client.get(path, headers=headers)
+
+
+async def test_dependency():
+    app = Esmerald(routes=[Gateway(handler=me)], settings_module=VerificationSettings)
+
+    assert (await request(app, "/me", bearer())).json() == "1"
+    assert (await request(app, "/me")).status_code == 401
+    assert (await request(app, "/me", bearer("refresh_token"))).status_code == 401
+    assert (
+        await request(app, "/me", bearer(key="another-key-long-enough-for-hs256"))
+    ).status_code == 401
+
+
+async def test_middleware_puts_the_claims_on_the_request():
+    response = await request(create_app(), "/state", bearer())
+
+    assert response.status_code == 200
+    assert response.json() == "1"
+
+
+async def test_middleware_rejects():
+    app = create_app()
+
+    assert (await request(app, "/state")).status_code == 401
+    assert (await request(app, "/state", {"Authorization": "Basic abc"})).status_code == 401
+    assert (await request(app, "/state", bearer("refresh_token"))).status_code == 401
+    assert (await request(app, "/state", {"Authorization": "Bearer garbage"})).status_code == 401
+
+
+async def test_middleware_excluded_paths():
+    app = create_app()
+
+    assert (await request(app, "/public/ping")).json() == "pong"
+    assert (await request(app, "/publications")).status_code == 401
+    assert (await request(app, "/publications", bearer())).json() == "news"
+
+
+async def test_middleware_optional():
+    app = create_app(optional=True)
+
+    assert (await request(app, "/state")).json() == "anonymous"
+    assert (await request(app, "/state", {"Authorization": "Bearer garbage"})).status_code == 401
+
+
+@get(
+    "/everything",
+    dependencies={"claims": Inject(access_claims)},
+    permissions=[IsAuthenticated],
+)
+async def everything(request: Request, claims: Claims = Injects()) -> bool:
+    return get_claims(request) is claims is request.state.claims
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    calls = []
+    decode, adecode = TokenDecoder.decode, TokenDecoder.adecode
+
+    def spy(self, token):
+        calls.append(("decode", token))
+        return decode(self, token)
+
+    async def aspy(self, token):
+        calls.append(("adecode", token))
+        return await adecode(self, token)
+
+    monkeypatch.setattr(TokenDecoder, "decode", spy)
+    monkeypatch.setattr(TokenDecoder, "adecode", aspy)
+    return calls
+
+
+async def test_token_is_decoded_once_per_request(decodes):
+    app = Esmerald(
+        routes=[Gateway(handler=everything)],
+        middleware=[DefineMiddleware(AccessTokenMiddleware)],
+        settings_module=VerificationSettings,
+    )
+
+    response = await request(app, "/everything", bearer())
+
+    assert response.json() is True
+    assert [name for name, _ in decodes] == ["adecode"]
+
+
+async def test_dependency_verifies_away_from_the_event_loop(decodes):
+    app = Esmerald(routes=[Gateway(handler=me)], settings_module=VerificationSettings)
+
+    assert (await request(app, "/me", bearer())).json() == "1"
+    assert [name for name, _ in decodes] == ["adecode"]
+
+
+async def test_permission():
+    app = Esmerald(routes=[Gateway(handler=everything)], settings_module=VerificationSettings)
+
+    assert (await request(app, "/everything", bearer())).json() is True
+    assert (await request(app, "/everything")).status_code == 403
+    assert (await request(app, "/everything", bearer("refresh_token"))).status_code == 401
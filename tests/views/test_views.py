@@ -6,9 +6,9 @@ from anyio import from_thread, sleep
 from edgy.exceptions import ObjectNotFound
 from esmerald import Esmerald, Include
 from esmerald.conf import settings
-from esmerald.contrib.auth.edgy.base_user import AbstractUser
 from esmerald.exceptions import NotAuthorized
 from httpx import ASGITransport, AsyncClient
+from tests.models import User
 from tests.settings import TestSettings
 
 from esmerald_simple_jwt.backends import BackendEmailAuthentication as SimpleBackend
@@ -23,11 +23,6 @@ pytestmark = pytest.mark.anyio
 setatt_object = object.__setattr__
 
 
-class User(AbstractUser):
-    class Meta:
-        registry = models
-
-
 class BackendAuthentication(SimpleBackend):
     async def authenticate(self) -> str:
         """Authenticates a user and returns a JWT string"""